@@ -2,12 +2,19 @@
 Extraction agent for retrieving and mapping professor data from papers.
 """
 import time
-from typing import List, Tuple
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from itertools import chain
+from typing import Deque, Iterator, List, Tuple
 from app.agents.models import AgentContext
+from app.core.config import settings
 from app.schemas.agent import GraphNode, BasicProfessor
+from app.utils.concurrency import ContextThreadPoolExecutor
 from app.utils.openalex_client import openalex_client
+from app.utils.paper_mapper import WORK_SELECT_FIELDS
 from app.utils.professor_mapper import (
-    extract_author_ids_from_papers,
+    AUTHOR_SELECT_FIELDS,
+    iter_author_ids_from_papers,
     map_author_to_graph_node,
     map_author_to_basic_professor
 )
@@ -18,12 +25,23 @@ class ExtractionAgent:
     Agent responsible for extracting professor information from papers.
 
     Process:
-    1. Extract author IDs from first max_nodes papers (first 2 authors per paper)
-    2. Fetch detailed author data for each ID
-    3. Fetch first 3 papers for each author
-    4. Map to GraphNode (full data) and BasicProfessor (display data)
+    1. Extract author IDs from papers (first 2 authors per paper), pulling works
+       lazily until max_nodes unique authors are found
+    2. Group them into batches that double in size (2, 4, 8, ...), so the
+       first professors are ready after a single round trip
+    3. For each batch, fetch author data and their first 3 recent papers in
+       bulk (both requests side by side)
+    4. Map to GraphNode (full data) and BasicProfessor (display data) and
+       yield them as soon as their batch is hydrated
+
+    The IDs of the next batch are collected in the background while earlier
+    batches are hydrated, and each batch is yielded as soon as its requests
+    complete. Up to OPENALEX_HYDRATION_BATCHES_IN_FLIGHT batches are hydrated
+    at once; the client's token bucket keeps the overall request rate polite.
     """
 
+    FIRST_BATCH_SIZE = 2
+
     def __init__(self):
         self.client = openalex_client
 
@@ -35,48 +53,167 @@ class ExtractionAgent:
         Extract professors from papers.
 
         Args:
-            context: Agent context with papers_data
+            context: Agent context with papers_data (and optionally papers_stream)
 
         Returns:
-            Tuple of (full professor nodes, basic professors for display)
+            Tuple of (full professor nodes, basic professors for display),
+            in the same order as the authors appear in the papers
+        """
+        professor_nodes = []
+        basic_professors = []
+
+        for professor_node, basic_professor in self.iter_professors(context):
+            professor_nodes.append(professor_node)
+            basic_professors.append(basic_professor)
+
+        return professor_nodes, basic_professors
+
+    def iter_professors(self, context: AgentContext) -> Iterator[Tuple[GraphNode, BasicProfessor]]:
+        """
+        Yield professors as they are hydrated, in paper order.
+
+        Args:
+            context: Agent context with papers_data (and optionally papers_stream)
+
+        Yields:
+            Tuples of (full professor node, basic professor for display)
         """
-        if not context.papers_data:
-            return [], []
+        context.author_latencies = {}
+        context.batch_latencies = []
 
-        # Step 1: Extract author IDs from first max_nodes papers
-        author_ids = extract_author_ids_from_papers(
-            papers=context.papers_data,
+        if not context.papers_data and context.papers_stream is None:
+            return
+
+        # Step 1: Author IDs from the papers already read, then from the stream,
+        # which stops being read as soon as max_nodes authors are found
+        papers = chain(context.papers_data or [], context.papers_stream or [])
+        author_ids = iter_author_ids_from_papers(
+            papers=papers,
             max_authors=context.max_nodes,
             authors_per_paper=2
         )
 
-        if not author_ids:
-            return [], []
-
-        # Step 2 & 3: Fetch author data and their papers
-        professor_nodes = []
-        basic_professors = []
+        started = time.perf_counter()
+        hydrated = 0
+        total = 0
+        batches = self._batches(author_ids)
+        in_flight: Deque[tuple] = deque()
+        max_in_flight = max(1, settings.OPENALEX_HYDRATION_BATCHES_IN_FLIGHT)
+
+        try:
+            with ContextThreadPoolExecutor(max_workers=1 + 2 * max_in_flight) as pool:
+                # Collecting a batch's IDs may pull another works page, so it runs
+                # in the background too (next() gives None once the papers are exhausted)
+                collecting = pool.submit(next, batches, None)
+                exhausted = False
+
+                try:
+                    while collecting or in_flight:
+                        # Wake up for whichever comes first: the next batch's IDs
+                        # or the hydration of the oldest batch (only pending futures,
+                        # or wait() would return at once and the loop would spin)
+                        waiting = [collecting] if collecting else []
+                        if in_flight:
+                            waiting.extend(future for future in in_flight[0][1:3] if not future.done())
+                        wait(waiting, return_when=FIRST_COMPLETED)
+
+                        # Steps 2 & 3: send each batch as soon as its IDs are known
+                        if collecting and collecting.done():
+                            batch = collecting.result()
+                            collecting = None
+                            if batch is None:
+                                exhausted = True
+                            else:
+                                total += len(batch)
+                                in_flight.append(self._submit_batch(pool, batch, context))
+
+                        # Oldest batch first, to keep paper order
+                        finished = in_flight.popleft() if in_flight and self._batch_done(in_flight[0]) else None
+
+                        if not collecting and not exhausted and len(in_flight) < max_in_flight:
+                            collecting = pool.submit(next, batches, None)
+
+                        # Step 4: yield the finished batch while the next one is on its way
+                        if finished:
+                            for professor in self._map_batch(finished, context):
+                                hydrated += 1
+                                yield professor
+                finally:
+                    # Don't pull more works for a consumer that stopped early
+                    if collecting:
+                        collecting.cancel()
+        finally:
+            self._close_papers_stream(context)
+
+        if total:
+            print(f"Hydrated {hydrated}/{total} authors in {time.perf_counter() - started:.2f}s")
+
+    def _batches(self, author_ids: Iterator[str]) -> Iterator[List[str]]:
+        """Group author IDs into batches of doubling size, capped at one bulk works query."""
+        batch_size = self.FIRST_BATCH_SIZE
+        batch: List[str] = []
 
         for author_id in author_ids:
-            # Fetch author details
-            author_data = self.client.get_author(author_id)
+            batch.append(author_id)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+                batch_size = min(batch_size * 2, self.client.AUTHORS_PER_WORKS_QUERY)
+
+        if batch:
+            yield batch
+
+    def _submit_batch(self, pool: ContextThreadPoolExecutor, author_ids: List[str], context: AgentContext) -> tuple:
+        """Start the author and works lookups for a batch."""
+        authors_future = pool.submit(
+            self.client.get_authors_bulk,
+            author_ids,
+            select=AUTHOR_SELECT_FIELDS
+        )
+        works_future = pool.submit(
+            self.client.get_authors_works_bulk,
+            author_ids,
+            per_author=3,
+            select=WORK_SELECT_FIELDS,
+            latencies=context.author_latencies
+        )
+        return author_ids, authors_future, works_future, time.perf_counter()
+
+    @staticmethod
+    def _batch_done(in_flight: tuple) -> bool:
+        """Whether both lookups of a submitted batch have finished."""
+        _, authors_future, works_future, _ = in_flight
+        return authors_future.done() and works_future.done()
+
+    def _map_batch(self, in_flight: tuple, context: AgentContext) -> Iterator[Tuple[GraphNode, BasicProfessor]]:
+        """Wait for a batch and map its authors (Step 4)."""
+        author_ids, authors_future, works_future, submitted_at = in_flight
+        authors = authors_future.result()
+        works_by_author = works_future.result()
+        # Bulk requests serve the whole batch at once, so their time is per batch;
+        # only authors that fell back to their own works call get a per-author time
+        context.batch_latencies.append({
+            "author_ids": author_ids,
+            "seconds": round(time.perf_counter() - submitted_at, 3)
+        })
 
+        for author_id in author_ids:
+            author_data = authors.get(author_id)
             if not author_data:
                 continue
 
-            # Fetch author's papers (first 3)
-            author_works_response = self.client.get_author_works(author_id, per_page=3)
-            author_papers = author_works_response.get("results", [])
-
-            # Map to GraphNode (full data for graph)
-            professor_node = map_author_to_graph_node(author_data, author_papers)
-            professor_nodes.append(professor_node)
-
-            # Map to BasicProfessor (display data for frontend)
-            basic_prof = map_author_to_basic_professor(author_data)
-            basic_professors.append(basic_prof)
-
-            # Small delay to be polite to the API
-            time.sleep(0.3)
-
-        return professor_nodes, basic_professors
+            # Missing abstracts are resolved for the whole run in one batch afterwards
+            author_papers = works_by_author.get(author_id, [])
+            yield (
+                map_author_to_graph_node(author_data, author_papers, fetch_remote=False),
+                map_author_to_basic_professor(author_data)
+            )
+
+    @staticmethod
+    def _close_papers_stream(context: AgentContext) -> None:
+        """Release the search response once no more works are needed."""
+        if context.papers_stream is not None:
+            close = getattr(context.papers_stream, "close", None)
+            if close:
+                close()
+            context.papers_stream = None
@@ -19,9 +19,16 @@ class AgentContext(BaseModel):
     cv_id: Optional[str] = None
     cv_concepts: Optional[List[str]] = None
     max_nodes: int = 10
+    user_id: Optional[int] = None
+    cancel_token: Optional[Any] = None  # CancellationToken checked at the pipeline's cancellation points
 
     # Extracted information during execution
     filters: Optional[ExtractedFilters] = None
-    papers_data: Optional[List[Dict[str, Any]]] = None  # Full OpenAlex papers JSON for later processing
+    papers_data: Optional[List[Dict[str, Any]]] = None  # OpenAlex works already read (the search preview)
+    papers_stream: Optional[Any] = None  # Iterator over the remaining OpenAlex works, read lazily by extraction
+    preview_papers: Optional[List[Dict[str, Any]]] = None  # Paper dicts shown in the search step
     professor_nodes: Optional[List[Any]] = None  # GraphNode objects for final graph (stored as dicts)
     links: Optional[List[Any]] = None  # GraphLink objects for final graph (stored as dicts)
+    author_latencies: Optional[Dict[str, float]] = None  # Seconds spent on each author's own works call (fallback authors only)
+    batch_latencies: Optional[List[Dict[str, Any]]] = None  # {"author_ids", "seconds"} for each bulk-hydrated batch
+    cached_result: Optional[Dict[str, Any]] = None  # Result of a recent run with the same filters (utils.result_cache)
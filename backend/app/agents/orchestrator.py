@@ -1,36 +1,61 @@
 """
 Agent orchestrator - coordinates the research graph generation pipeline.
 """
+import copy
 import time
 from datetime import datetime
-from typing import Optional
+from itertools import islice
+from typing import Any, Dict, List, Optional
 from app.agents.models import AgentContext, ExtractedFilters
 from app.agents.intent_agent import IntentExtractionAgent
 from app.agents.search_agent import SearchAgent
 from app.agents.extraction_agent import ExtractionAgent
+from app.agents.pipeline import PipelineError, PipelineExecutor, Stage, run_timed
+from app.core.config import settings
 from app.services.state_manager import state_manager
 from app.database.database import db
 from app.utils.paper_mapper import get_preview_papers
+from app.utils.abstract_fetcher import fill_missing_abstracts
 from app.utils.graph_builder import build_graph_links, create_user_node
+from app.utils.result_cache import result_cache
 from app.schemas.agent import GraphData, GraphNode
+from app.utils.cancellation import cancellable, cancellation_scope
+from app.utils.http_resilience import track_throttling
 
 
 class ResearchAgentOrchestrator:
     """
     Orchestrates the entire research graph generation process.
 
-    Pipeline:
+    Pipeline (stage graph, each stage starts once its inputs are ready):
     1. Intent & Filter Extraction
-    2. OpenAlex Search
-    3. Data Extraction (TODO)
-    4. Relationship Building (TODO)
-    5. Graph Construction (TODO)
+    2. OpenAlex Search (first works page)
+    3a. Preview Papers        (needs 2, runs alongside 3b)
+    3b. Data Extraction       (needs 2, reads the remaining works lazily)
+    4. Relationship Building  (needs 3b)
+    5. Graph Construction     (needs 4)
+    Then, off the critical path: deferred abstract resolution.
+
+    When a recent run extracted the same filters (with the same max_nodes),
+    steps 2-4 are restored from the result cache instead of executed.
+
+    Each stage has AGENT_STAGE_TIMEOUT seconds; the context's cancel_token
+    (cancelled by the user or by the whole-run deadline) stops the run at
+    its next cancellation point, and the run ends as "cancelled".
     """
 
     def __init__(self):
         self.intent_agent = IntentExtractionAgent()
         self.search_agent = SearchAgent()
         self.extraction_agent = ExtractionAgent()
+        self.pipeline = PipelineExecutor([
+            Stage("intent", self._execute_intent_extraction),
+            Stage("search", self._execute_search, depends_on=("intent",)),
+            Stage("preview", self._execute_preview, depends_on=("search",)),
+            Stage("extraction", self._execute_extraction, depends_on=("search",)),
+            Stage("relationships", self._execute_relationships, depends_on=("extraction",)),
+            Stage("graph", self._execute_graph_construction, depends_on=("relationships",))
+        ], stage_timeout=settings.AGENT_STAGE_TIMEOUT)
 
     def run(self, context: AgentContext) -> None:
         """
@@ -43,36 +68,77 @@ class ResearchAgentOrchestrator:
             context: Agent execution context with run_id, query, cv_id, etc.
         """
         run_id = context.run_id
-
-        try:
-            # Step 1: Intent & Filter Extraction
-            self._execute_intent_extraction(context)
-
-            # Step 2: OpenAlex Search
-            self._execute_search(context)
-
-            # Step 3: Data Extraction
-            self._execute_extraction(context)
-
-            # Step 4: Relationship Building
-            self._execute_relationships(context)
-
-            # Step 5: Graph Construction
-            self._execute_graph_construction(context)
-
-            # Mark as completed
+        cancel_token = context.cancel_token
+
+        started = time.perf_counter()
+        stage_timings = {}
+        succeeded = False
+
+        # Attribute upstream throttling (rate limits, backoff) to this run, and let
+        # outbound calls see its cancellation token
+        with track_throttling() as throttle_metrics, cancellation_scope(cancel_token):
+            try:
+                stage_timings = self.pipeline.run(context)
+                succeeded = True
+
+            except PipelineError as e:
+                # Log error (the run is marked as failed below if it produced no graph)
+                stage_timings = e.timings
+                self._log_error(run_id, str(e))
+
+            except Exception as e:
+                self._log_error(run_id, str(e))
+
+        # A run that finished in time is not cancelled by its deadline passing right after
+        cancelled = not succeeded and cancel_token is not None and cancel_token.cancelled
+
+        metrics = {**throttle_metrics.as_dict(), "stages": stage_timings}
+        if result_cache is not None and context.filters is not None:
+            metrics["result_cache"] = "hit" if context.cached_result is not None else "miss"
+        if cancelled:
+            metrics["cancelled"] = cancel_token.reason
+        state_manager.set_run_metrics(run_id, metrics)
+
+        # Abstracts OpenAlex lacks are resolved after the graph is returned
+        run_data = state_manager.get_run(run_id)
+        graph_data = run_data.get("graph_data") if run_data else None
+        pending_papers = [] if cancelled else self._collect_pending_papers(context, graph_data)
+        if pending_papers:
+            # Fill copies: the published step and graph may be the very objects
+            # readers hold, and must only change along with a new revision
+            graph_data = copy.deepcopy(graph_data)
+            context.preview_papers = copy.deepcopy(context.preview_papers)
+            pending_papers = self._collect_pending_papers(context, graph_data)
+            state_manager.set_run_abstracts_status(run_id, "pending")
+
+        # Mark as completed (cancelled, or failed if there is no graph to show)
+        if cancelled:
+            state_manager.update_run_status(run_id, "cancelled")
+        elif not graph_data:
+            state_manager.update_run_status(run_id, "failed")
+        else:
             state_manager.update_run_status(run_id, "completed")
 
-            # Save to database
-            self._save_run_to_database(context)
+        # Save to database (even if there was an error)
+        persisted = self._save_run_to_database(context)
 
-        except Exception as e:
-            # Log error and mark as failed
-            self._log_error(run_id, str(e))
-            state_manager.update_run_status(run_id, "completed")  # Still mark as completed for now
+        # Deferred stage: fill in the pending abstracts (off the graph's critical path)
+        if pending_papers:
+            with cancellation_scope(cancel_token):
+                stage_timings["abstracts"], _ = run_timed(
+                    lambda ctx: self._resolve_deferred_abstracts(ctx, pending_papers, graph_data),
+                    context,
+                    started
+                )
+            state_manager.set_run_metrics(run_id, {"stages": stage_timings})
+
+        # Once abstracts are resolved, later runs with the same filters can reuse the result
+        if succeeded and context.cached_result is None:
+            self._store_cached_result(context, graph_data)
 
-            # Still try to save to database (even if there was an error)
-            self._save_run_to_database(context)
+        # The database now holds the result: the in-memory run may be evicted
+        if persisted:
+            state_manager.mark_run_persisted(run_id)
 
     def _execute_intent_extraction(self, context: AgentContext) -> None:
         """
@@ -87,6 +153,10 @@ class ResearchAgentOrchestrator:
             # Store filters in context
             context.filters = filters
 
+            # A recent run with the same filters lets steps 2-4 be skipped
+            if result_cache is not None:
+                context.cached_result = result_cache.get(filters, context.max_nodes)
+
             # Add "filters" step with data immediately (in_progress)
             state_manager.add_run_step(
                 run_id=run_id,
@@ -101,8 +171,6 @@ class ResearchAgentOrchestrator:
                 status="in_progress"
             )
 
-            time.sleep(1)  # Brief pause for UX
-
             # Mark as done (data already visible)
             state_manager.add_run_step(
                 run_id=run_id,
@@ -134,33 +202,57 @@ class ResearchAgentOrchestrator:
         """
         run_id = context.run_id
 
-        try:
-            # Search papers using the agent (fetches 2 * max_nodes)
-            search_results = self.search_agent.search_papers(context)
-            papers_data = search_results.get("results", [])
-
-            # Store full papers data in context for later processing (extraction step)
-            context.papers_data = papers_data
+        if context.cached_result is not None:
+            self._restore_cached_result(context)
+            return
 
-            # Map first 4 papers to Paper objects for frontend display
-            preview_papers = get_preview_papers(papers_data, limit=4)
+        # Add "search" step first so it is listed before extraction, which may start right after
+        state_manager.add_run_step(
+            run_id=run_id,
+            step_id="search-1",
+            step_type="search",
+            message="Looking for relevant papers...",
+            papers=[],
+            status="in_progress"
+        )
 
-            # Convert Paper objects to dict for JSON serialization
-            preview_papers_dict = [paper.model_dump() for paper in preview_papers]
+        try:
+            # Stream papers using the agent (paged lazily); only the preview is
+            # read here, the extraction step pulls more until it has enough authors
+            papers_stream = self.search_agent.iter_papers(context)
+            context.papers_data = list(islice(papers_stream, 4))
+            context.papers_stream = papers_stream
 
-            # Add "search" step with papers immediately (in_progress)
+        except Exception as e:
+            # Mark as done with error
             state_manager.add_run_step(
                 run_id=run_id,
                 step_id="search-1",
                 step_type="search",
-                message="Looking for relevant papers...",
-                papers=preview_papers_dict,
-                status="in_progress"
+                message=f"Failed to search papers: {str(e)}",
+                status="done"
             )
+            raise
 
-            time.sleep(1.5)  # Brief pause for UX
+    def _execute_preview(self, context: AgentContext) -> None:
+        """
+        Step 3a: Map the first works to preview papers (alongside extraction).
+        """
+        run_id = context.run_id
+
+        if context.cached_result is not None:
+            return  # Restored with the search step
+
+        try:
+            # Map first 4 papers to Paper objects for frontend display
+            # (abstracts OpenAlex lacks are resolved in batch after the graph is returned)
+            preview_papers = get_preview_papers(context.papers_data, limit=4, fetch_remote=False)
+
+            # Convert Paper objects to dict for JSON serialization
+            preview_papers_dict = [paper.model_dump() for paper in preview_papers]
+            context.preview_papers = preview_papers_dict
 
-            # Mark as done (all papers visible)
+            # Show the papers and mark the search step as done
             state_manager.add_run_step(
                 run_id=run_id,
                 step_id="search-1",
@@ -183,10 +275,13 @@ class ResearchAgentOrchestrator:
 
     def _execute_extraction(self, context: AgentContext) -> None:
         """
-        Step 3: Extract professors from papers.
+        Step 3b: Extract professors from papers.
         """
         run_id = context.run_id
 
+        if context.cached_result is not None:
+            return  # Restored with the search step
+
         # Add "extraction" step immediately to show in UI (in_progress, no professors yet)
         state_manager.add_run_step(
             run_id=run_id,
@@ -198,26 +293,26 @@ class ResearchAgentOrchestrator:
         )
 
         try:
-            # Extract professors using the agent (this takes time)
-            professor_nodes, basic_professors = self.extraction_agent.extract_professors(context)
+            professor_nodes = []
+            basic_professors_dict = []
+
+            # Extract professors using the agent, showing each one as soon as it is hydrated
+            for professor_node, basic_professor in cancellable(self.extraction_agent.iter_professors(context)):
+                professor_nodes.append(professor_node.model_dump())
+                basic_professors_dict.append(basic_professor.model_dump())
+
+                # Update step with professors so far (still in_progress)
+                state_manager.add_run_step(
+                    run_id=run_id,
+                    step_id="extraction-1",
+                    step_type="extraction",
+                    message="Extracting relevant professors...",
+                    professors=list(basic_professors_dict),
+                    status="in_progress"
+                )
 
             # Store full professor nodes in context for final graph construction
-            context.professor_nodes = [node.model_dump() for node in professor_nodes]
-
-            # Convert BasicProfessor objects to dict for JSON serialization
-            basic_professors_dict = [prof.model_dump() for prof in basic_professors]
-
-            # Update step with professors (still in_progress)
-            state_manager.add_run_step(
-                run_id=run_id,
-                step_id="extraction-1",
-                step_type="extraction",
-                message="Extracting relevant professors...",
-                professors=basic_professors_dict,
-                status="in_progress"
-            )
-
-            time.sleep(1.5)  # Brief pause for UX
+            context.professor_nodes = professor_nodes
 
             # Mark as done (all professors visible)
             state_manager.add_run_step(
@@ -246,6 +341,9 @@ class ResearchAgentOrchestrator:
         """
         run_id = context.run_id
 
+        if context.cached_result is not None:
+            return  # Restored with the search step
+
         # Add "relationships" step (in_progress) with message
         state_manager.add_run_step(
             run_id=run_id,
@@ -255,8 +353,6 @@ class ResearchAgentOrchestrator:
             status="in_progress"
         )
 
-        time.sleep(1)  # Brief pause for UX
-
         try:
             # Build links from professor nodes
             if not context.professor_nodes:
@@ -302,11 +398,9 @@ class ResearchAgentOrchestrator:
             status="in_progress"
         )
 
-        time.sleep(1)  # Brief pause for UX
-
         try:
             # Get user name from database
-            user_data = db.get_user()
+            user_data = db.get_user_details(context.user_id) if context.user_id is not None else None
             user_name = user_data["name"] if user_data and user_data["name"] else "User"
 
             # Create User node with actual user name
@@ -347,10 +441,138 @@ class ResearchAgentOrchestrator:
             )
             raise
 
-    def _save_run_to_database(self, context: AgentContext) -> None:
+    def _restore_cached_result(self, context: AgentContext) -> None:
+        """
+        Steps 2-4 from the result cache: publish the cached papers,
+        professors and links at once, without searching or extracting.
+        """
+        run_id = context.run_id
+        cached = context.cached_result
+
+        context.preview_papers = cached["preview_papers"]
+        context.professor_nodes = cached["professor_nodes"]
+        context.links = cached["links"]
+
+        state_manager.add_run_step(
+            run_id=run_id,
+            step_id="search-1",
+            step_type="search",
+            message="Looking for relevant papers...",
+            papers=context.preview_papers,
+            status="done"
+        )
+        state_manager.add_run_step(
+            run_id=run_id,
+            step_id="extraction-1",
+            step_type="extraction",
+            message="Extracting relevant professors...",
+            professors=cached["professors"],
+            status="done"
+        )
+        state_manager.add_run_step(
+            run_id=run_id,
+            step_id="relationships-1",
+            step_type="relationships",
+            message="Analyzing relationships...",
+            status="done"
+        )
+
+        print(f"Run {run_id} reused a cached result ({len(context.professor_nodes)} professors)")
+
+    def _store_cached_result(self, context: AgentContext, graph_data: Optional[Dict[str, Any]]) -> None:
+        """
+        Store the run's result (everything but the user node) in the result cache.
+        """
+        if result_cache is None or context.filters is None or not graph_data:
+            return
+
+        run_data = state_manager.get_run(context.run_id)
+        extraction_step = next(
+            (step for step in run_data["steps"] if step["step_id"] == "extraction-1"),
+            None
+        ) if run_data else None
+
+        if extraction_step is None:
+            return
+
+        result_cache.set(context.filters, context.max_nodes, {
+            "preview_papers": context.preview_papers or [],
+            "professors": extraction_step.get("professors") or [],
+            "professor_nodes": [node for node in graph_data.get("nodes", []) if node.get("type") != "user"],
+            "links": graph_data.get("links", [])
+        })
+
+    def _collect_pending_papers(
+        self,
+        context: AgentContext,
+        graph_data: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Collect the papers of the run whose abstract is still pending.
+
+        Returns the Paper dicts of the search preview and of graph_data's
+        nodes, so filling them in place updates what is republished.
+        """
+        papers = list(context.preview_papers or [])
+
+        if graph_data:
+            for node in graph_data.get("nodes", []):
+                papers.extend(node.get("papers") or [])
+
+        return [paper for paper in papers if paper.get("abstract_status") == "pending"]
+
+    def _resolve_deferred_abstracts(
+        self,
+        context: AgentContext,
+        pending_papers: List[Dict[str, Any]],
+        graph_data: Optional[Dict[str, Any]]
+    ) -> None:
+        """
+        Deferred stage: fill pending abstracts from Semantic Scholar in batch,
+        then republish the search step and graph and persist the graph.
+        """
+        run_id = context.run_id
+
+        try:
+            filled = fill_missing_abstracts(pending_papers)
+            print(f"Resolved {filled}/{len(pending_papers)} deferred abstracts for run {run_id}")
+
+        except Exception as e:
+            # Abstracts are optional: the papers are published without them
+            print(f"Error resolving deferred abstracts for run {run_id}: {str(e)}")
+            for paper in pending_papers:
+                if paper.get("abstract_status") == "pending":
+                    paper["abstract_status"] = "missing"
+
+        try:
+            if context.preview_papers:
+                state_manager.add_run_step(
+                    run_id=run_id,
+                    step_id="search-1",
+                    step_type="search",
+                    message="Looking for relevant papers...",
+                    papers=context.preview_papers,
+                    status="done"
+                )
+
+            if graph_data:
+                state_manager.set_run_graph(run_id, graph_data)
+                db.update_run_graph(run_id, graph_data)
+
+        except Exception as e:
+            print(f"Error publishing deferred abstracts for run {run_id}: {str(e)}")
+
+        finally:
+            state_manager.set_run_abstracts_status(run_id, "resolved")
+
+    def _save_run_to_database(self, context: AgentContext) -> bool:
         """
         Save the completed run to the database.
-        Saves run_id, query, and graph_data.
+        The run row is created when the run starts; this stores its final
+        status and graph_data.
+
+        Returns:
+            True if the database holds the run's result (also when there is no graph)
         """
         run_id = context.run_id
 
@@ -360,22 +582,31 @@ class ResearchAgentOrchestrator:
 
             if not run_data:
                 print(f"Warning: No run data found for {run_id}")
-                return
+                return False
+
+            # The status endpoint serves it once the run is evicted from memory
+            db.update_run_status(run_id, run_data["status"])
 
             # Get graph data from the run
             graph_data = run_data.get("graph_data")
 
+            if not graph_data:
+                print(f"Warning: No graph data to save for run {run_id}")
+                return True
+
             # Use the actual query from context
             query = context.query
 
             # Save to database
-            db.create_run(run_id=run_id, query=query, graph_data=graph_data)
+            db.update_run_graph(run_id, graph_data)
 
             print(f"Successfully saved run {run_id} to database with query: {query}")
+            return True
 
         except Exception as e:
             # Log error but don't fail the entire run
             print(f"Error saving run {run_id} to database: {str(e)}")
+            return False
 
     def _log_error(self, run_id: str, error_message: str) -> None:
         """Log error to state manager."""
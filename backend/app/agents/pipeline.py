@@ -0,0 +1,193 @@
+"""
+Stage graph executor for the research pipeline.
+
+Stages declare the stages whose outputs they need; each stage starts as
+soon as its dependencies are done, so independent stages run
+concurrently. Every stage is timed and runs under a deadline; once the
+run's cancellation token is cancelled, no further stage starts.
+"""
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.agents.models import AgentContext
+from app.utils.cancellation import RunCancelled, stage_deadline
+from app.utils.concurrency import ContextThreadPoolExecutor
+
+
+@dataclass(frozen=True)
+class Stage:
+    """A pipeline stage, the stages it depends on and its time budget (seconds)."""
+    name: str
+    run: Callable[[AgentContext], None]
+    depends_on: Tuple[str, ...] = ()
+    timeout: Optional[float] = None  # Defaults to the executor's stage_timeout
+
+
+class PipelineError(Exception):
+    """Raised when a stage fails; carries the timings of the whole pipeline."""
+
+    def __init__(self, stage: str, error: Exception, timings: Dict[str, Dict[str, Any]]):
+        super().__init__(str(error))
+        self.stage = stage
+        self.error = error
+        self.timings = timings
+
+
+def run_timed(
+    fn: Callable[[AgentContext], None],
+    context: AgentContext,
+    origin: float
+) -> Tuple[Dict[str, Any], Optional[Exception]]:
+    """
+    Run a stage function and time it.
+
+    Args:
+        fn: Stage function
+        context: Agent context passed to the stage
+        origin: perf_counter() value the start offset is measured from
+
+    Returns:
+        Tuple of (timing dict, exception raised by the stage or None)
+    """
+    started = time.perf_counter()
+    error = None
+    try:
+        fn(context)
+    except Exception as e:
+        error = e
+    finished = time.perf_counter()
+
+    timing = {
+        "status": "cancelled" if isinstance(error, RunCancelled) else "failed" if error else "done",
+        "started_ms": round((started - origin) * 1000, 1),
+        "duration_ms": round((finished - started) * 1000, 1)
+    }
+    return timing, error
+
+
+class PipelineExecutor:
+    """
+    Runs a graph of stages, each as soon as its dependencies are done.
+
+    If a stage fails, the stages depending on it (directly or not) are
+    skipped, the others still run, and a PipelineError for the first
+    failure is raised at the end.
+
+    Deadlines are cooperative: a stage past its budget raises RunCancelled
+    at its next cancellation point (see app.utils.cancellation) and fails.
+    Once the context's cancel_token is cancelled, the stages not started
+    yet are cancelled.
+    """
+
+    def __init__(self, stages: List[Stage], max_workers: int = 4, stage_timeout: Optional[float] = None):
+        """
+        Args:
+            stages: Stages of the pipeline (any order)
+            max_workers: Maximum number of stages running at once
+            stage_timeout: Time budget of stages without their own (seconds, None for no limit)
+
+        Raises:
+            ValueError: On duplicate names, unknown dependencies or cycles
+        """
+        self.stages = self._topological_order(stages)
+        self.max_workers = max_workers
+        self.stage_timeout = stage_timeout
+
+    @staticmethod
+    def _topological_order(stages: List[Stage]) -> List[Stage]:
+        """Validate the graph and order stages so dependencies come first."""
+        by_name = {stage.name: stage for stage in stages}
+        if len(by_name) != len(stages):
+            raise ValueError("Duplicate stage names in pipeline")
+
+        for stage in stages:
+            unknown = [dep for dep in stage.depends_on if dep not in by_name]
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {unknown}")
+
+        ordered: List[Stage] = []
+        placed = set()
+        while len(ordered) < len(stages):
+            ready = [
+                stage for stage in stages
+                if stage.name not in placed and all(dep in placed for dep in stage.depends_on)
+            ]
+            if not ready:
+                raise ValueError("Pipeline stages contain a dependency cycle")
+            ordered.extend(ready)
+            placed.update(stage.name for stage in ready)
+
+        return ordered
+
+    def run(self, context: AgentContext) -> Dict[str, Dict[str, Any]]:
+        """
+        Execute the pipeline.
+
+        Args:
+            context: Agent context shared by all stages
+
+        Returns:
+            Timings by stage name: {"status", "started_ms", "duration_ms"}
+            ("skipped" and "cancelled" stages that never started have no timings)
+
+        Raises:
+            PipelineError: If any stage failed (after all runnable stages finished)
+        """
+        origin = time.perf_counter()
+        timings: Dict[str, Dict[str, Any]] = {}
+        pending = list(self.stages)
+        running = {}
+        done = set()
+        failed = set()
+        first_error: Optional[Tuple[str, Exception]] = None
+
+        # Worker threads inherit the caller's context (e.g. throttle metrics)
+        with ContextThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                # Stages are in dependency order, so one pass settles them
+                for stage in list(pending):
+                    if any(dep in failed for dep in stage.depends_on):
+                        pending.remove(stage)
+                        failed.add(stage.name)
+                        timings[stage.name] = {"status": "skipped"}
+                    elif all(dep in done for dep in stage.depends_on):
+                        pending.remove(stage)
+                        if context.cancel_token is not None and context.cancel_token.cancelled:
+                            failed.add(stage.name)
+                            timings[stage.name] = {"status": "cancelled"}
+                            if first_error is None:
+                                first_error = (stage.name, RunCancelled(context.cancel_token.reason))
+                            continue
+                        running[pool.submit(run_timed, self._with_deadline(stage), context, origin)] = stage
+
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage = running.pop(future)
+                    timing, error = future.result()
+                    timings[stage.name] = timing
+
+                    if error:
+                        failed.add(stage.name)
+                        if first_error is None:
+                            first_error = (stage.name, error)
+                    else:
+                        done.add(stage.name)
+
+        if first_error:
+            raise PipelineError(first_error[0], first_error[1], timings)
+
+        return timings
+
+    def _with_deadline(self, stage: Stage) -> Callable[[AgentContext], None]:
+        """The stage function, run under the stage's deadline."""
+        timeout = stage.timeout if stage.timeout is not None else self.stage_timeout
+
+        def run(context: AgentContext) -> None:
+            with stage_deadline(stage.name, timeout):
+                stage.run(context)
+
+        return run
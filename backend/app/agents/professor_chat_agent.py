@@ -4,6 +4,7 @@ Professor chat agent using pyagentspec.
 from typing import Optional, List
 from app.prompts.chat_prompts import PROFESSOR_CHAT_SYSTEM, PROFESSOR_CHAT_USER
 from app.core.llm_factory import get_llm_config
+from app.utils.abstract_store import abstract_store
 from pyagentspec import Agent
 from wayflowcore.agentspec import AgentSpecLoader
 
@@ -50,7 +51,7 @@ class ProfessorChatAgent:
                 title = paper.get("title", "Unknown")
                 topic = paper.get("topic", "")
                 year = paper.get("publication_year", "")
-                abstract = paper.get("abstract", "")
+                abstract = self._get_abstract(paper)
                 
                 paper_str = f"{i}. {title}"
                 if year:
@@ -103,6 +104,15 @@ class ProfessorChatAgent:
         except Exception as e:
             raise ValueError(f"Error during chat: {e}")
 
+    @staticmethod
+    def _get_abstract(paper: dict) -> Optional[str]:
+        """Read a paper's abstract from the abstract store, falling back to the graph's copy."""
+        if abstract_store:
+            _, abstract = abstract_store.get(paper.get("id"), paper.get("link"))
+            if abstract:
+                return abstract
+        return paper.get("abstract")
+
 
 # Global instance
 professor_chat_agent = ProfessorChatAgent()
@@ -1,9 +1,11 @@
 """
 Search agent for retrieving papers from OpenAlex.
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 from app.agents.models import AgentContext
+from app.core.config import settings
 from app.utils.openalex_client import openalex_client
+from app.utils.professor_mapper import WORK_WITH_AUTHORS_SELECT_FIELDS
 
 
 class SearchAgent:
@@ -38,13 +40,46 @@ class SearchAgent:
         per_page = context.max_nodes * 2
 
         # Use the high-level search method
+        # Only request the fields the paper/professor mappers read
         results = self.client.search_papers_by_topics(
             topics=context.filters.topics,
-            per_page=per_page
+            per_page=per_page,
+            select=WORK_WITH_AUTHORS_SELECT_FIELDS
         )
 
         return results
 
+    def iter_papers(self, context: AgentContext) -> Iterator[Dict[str, Any]]:
+        """
+        Stream papers matching the extracted filters, one work at a time.
+
+        Same query as `search_papers`, but works are parsed as they arrive
+        and further result pages (max_nodes works each) are only fetched
+        when the caller keeps reading, so it can stop once it has enough
+        distinct authors instead of over-fetching up front.
+
+        Args:
+            context: Agent context with filters and max_nodes
+
+        Yields:
+            OpenAlex work objects in result order
+        """
+        if not context.filters or not context.filters.topics:
+            return
+
+        concept_ids = self.client.get_concept_ids_from_topics(context.filters.topics)
+
+        if not concept_ids:
+            print(f"Warning: No concept IDs found for topics: {context.filters.topics}")
+            return
+
+        yield from self.client.iter_works_by_concepts(
+            concept_ids,
+            per_page=max(1, min(context.max_nodes, self.client.MAX_PER_PAGE)),
+            select=WORK_WITH_AUTHORS_SELECT_FIELDS,
+            max_pages=settings.OPENALEX_WORKS_MAX_PAGES
+        )
+
     def get_concept_ids(self, topics: List[str]) -> List[str]:
         """
         Get OpenAlex concept IDs for a list of topics.
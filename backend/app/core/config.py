@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Literal, Optional
 from functools import lru_cache
 
 
@@ -43,6 +43,118 @@ class Settings(BaseSettings):
     # Agent Configuration
     AGENT_MAX_ITERATIONS: int = Field(default=10, description="Max iterations for agent reasoning")
     AGENT_TIMEOUT: int = Field(default=300, description="Agent timeout in seconds")
+    AGENT_STAGE_TIMEOUT: int = Field(
+        default=120,
+        description="Time budget of each pipeline stage (seconds, within AGENT_TIMEOUT for the whole run)"
+    )
+    RUN_WORKERS: int = Field(default=4, description="Runs executed at once (per process)")
+    RUN_QUEUE_SIZE: int = Field(default=20, description="Runs waiting for a worker at most; beyond that new runs get 429")
+    RUN_MAX_RUNNING_PER_USER: int = Field(default=2, description="Runs of one user executed at once")
+    RUN_MAX_QUEUED_PER_USER: int = Field(default=5, description="Runs of one user waiting for a worker at most")
+    PIPELINE_PACING: Literal["fast", "presentation"] = Field(
+        default="presentation",
+        description="Default run pacing: 'fast' shows steps as they finish, 'presentation' keeps each step "
+                    "visible for a minimum time (applied in the status view, the pipeline never waits)"
+    )
+
+    # Run State (runs are only evicted once persisted to SQLite)
+    STATE_BACKEND: Literal["memory", "sqlite"] = Field(
+        default="memory",
+        description="Where run and CV state lives: 'memory' (single worker) or 'sqlite' (shared by all workers)"
+    )
+    STATE_DB_PATH: str = Field(default="state.db", description="SQLite file of the shared state backend")
+    STATE_STREAM_POLL_INTERVAL: float = Field(
+        default=0.5,
+        description="Seconds between checks for changes made by other workers when streaming a run (sqlite backend)"
+    )
+    STATE_MAX_RUNS: int = Field(default=200, description="Max runs kept in memory; oldest persisted runs are evicted beyond this")
+    STATE_RUN_TTL: int = Field(default=3600, description="Seconds a persisted run stays in memory")
+    STATE_MAX_CVS: int = Field(default=500, description="Max uploaded CVs kept in memory (least recently used evicted first)")
+    STATE_CV_TTL: int = Field(default=86400, description="Seconds an unused CV stays in memory")
+
+    # OpenAlex Configuration
+    OPENALEX_MAX_CONCURRENCY: int = Field(
+        default=5,
+        description="Maximum number of in-flight OpenAlex requests during author hydration"
+    )
+    OPENALEX_HYDRATION_BATCHES_IN_FLIGHT: int = Field(
+        default=2,
+        description="Author batches hydrated at once by the extraction step (each sends an authors and a works request)"
+    )
+    OPENALEX_RATE_LIMIT: float = Field(
+        default=8.0,
+        description="Sustained OpenAlex request rate (requests per second, OpenAlex allows 10)"
+    )
+    OPENALEX_RATE_BURST: int = Field(
+        default=8,
+        description="Maximum burst of OpenAlex requests allowed by the rate limiter"
+    )
+    OPENALEX_CACHE_ENABLED: bool = Field(default=True, description="Cache OpenAlex responses in memory and on disk")
+    OPENALEX_CACHE_PATH: str = Field(
+        default="openalex_cache.db",
+        description="SQLite file for the OpenAlex response cache (shared by all workers)"
+    )
+    OPENALEX_CACHE_MEMORY_ENTRIES: int = Field(default=512, description="Capacity of the in-process cache tier")
+    OPENALEX_CACHE_MAX_ENTRIES: int = Field(default=20000, description="Capacity of the on-disk cache tier")
+    OPENALEX_CACHE_TTL_CONCEPTS: int = Field(default=7 * 24 * 3600, description="Cache TTL for concepts (seconds)")
+    OPENALEX_CACHE_TTL_AUTHORS: int = Field(default=24 * 3600, description="Cache TTL for authors (seconds)")
+    OPENALEX_CACHE_TTL_WORKS: int = Field(default=6 * 3600, description="Cache TTL for works (seconds)")
+    OPENALEX_CACHE_MAX_STREAMED_RESULTS: int = Field(
+        default=50,
+        description="Largest streamed works page kept for the cache (bigger pages are not cached, to keep memory flat)"
+    )
+    OPENALEX_CONCEPT_MEMO_TTL: int = Field(
+        default=30 * 24 * 3600,
+        description="How long a resolved topic -> concept ID mapping is reused (seconds)"
+    )
+    OPENALEX_CONCEPT_NEGATIVE_TTL: int = Field(
+        default=24 * 3600,
+        description="How long a topic with no matching concept is remembered as such (seconds)"
+    )
+    OPENALEX_WORKS_MAX_PAGES: int = Field(
+        default=5,
+        description="Maximum cursor pages read by a lazy works search before giving up"
+    )
+    OPENALEX_POOL_MAX_CONNECTIONS: int = Field(
+        default=20,
+        description="Keep-alive connections to OpenAlex shared by all concurrent runs"
+    )
+
+    # Abstract Store (shared across runs)
+    ABSTRACT_STORE_ENABLED: bool = Field(default=True, description="Keep resolved paper abstracts in a persistent store")
+    ABSTRACT_STORE_PATH: str = Field(default="abstract_store.db", description="SQLite file for the abstract store")
+    ABSTRACT_STORE_MAX_BYTES: int = Field(
+        default=64 * 1024 * 1024,
+        description="Maximum total size of the compressed abstracts kept in the store"
+    )
+    ABSTRACT_STORE_NEGATIVE_TTL: int = Field(
+        default=7 * 24 * 3600,
+        description="How long a paper without abstract is remembered as such (seconds)"
+    )
+
+    # Run Result Cache (shared across runs)
+    RESULT_CACHE_ENABLED: bool = Field(
+        default=True,
+        description="Reuse the professors and links of a recent run with the same filters and max_nodes"
+    )
+    RESULT_CACHE_PATH: str = Field(default="result_cache.db", description="SQLite file for the run result cache")
+    RESULT_CACHE_TTL: int = Field(default=6 * 3600, description="How long a run result is reused (seconds)")
+    RESULT_CACHE_MAX_ENTRIES: int = Field(default=1000, description="Maximum number of run results kept")
+
+    # Outbound HTTP Resilience (OpenAlex, Semantic Scholar)
+    HTTP_MAX_RETRIES: int = Field(default=3, description="Retries for 429/5xx responses and connection errors")
+    HTTP_BACKOFF_BASE: float = Field(default=0.5, description="Backoff before the first retry (seconds)")
+    HTTP_BACKOFF_MAX: float = Field(default=8.0, description="Upper bound for exponential backoff (seconds)")
+    HTTP_MAX_RETRY_AFTER: float = Field(default=30.0, description="Upper bound for honoured Retry-After (seconds)")
+    HTTP_PER_HOST_CONCURRENCY: int = Field(default=6, description="Maximum concurrent requests per upstream host")
+    HTTP_CIRCUIT_FAILURE_THRESHOLD: int = Field(
+        default=5,
+        description="Consecutive failures before a host's circuit opens"
+    )
+    HTTP_CIRCUIT_RESET_SECONDS: float = Field(
+        default=30.0,
+        description="Seconds an open circuit fails fast before letting a trial request through"
+    )
 
     # CORS Configuration
     CORS_ORIGINS: list[str] = Field(
@@ -2,7 +2,7 @@ import sqlite3
 import json
 from typing import Optional, Dict, Any
 from contextlib import contextmanager
-import os
+from app.database.paths import resolve_data_path
 
 
 class Database:
@@ -10,14 +10,7 @@ class Database:
 
     def __init__(self, db_path: str = "netresearch.db"):
         """Initialize database connection."""
-        # Use persistent disk in production, local path in development
-        if os.path.exists("/data"):
-            # Production: Render persistent disk
-            self.db_path = f"/data/{db_path}"
-        else:
-            # Development: Local directory
-            backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-            self.db_path = os.path.join(backend_dir, db_path)
+        self.db_path = resolve_data_path(db_path)
         self._init_db()
 
     def _init_db(self):
@@ -80,6 +73,7 @@ class Database:
                     query TEXT NOT NULL,
                     graph_data TEXT,
                     created_at TEXT NOT NULL,
+                    status TEXT,
                     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
                 )
             """)
@@ -110,6 +104,11 @@ class Database:
             else:
                 cursor.execute("ALTER TABLE run_new RENAME TO run")
 
+            # Add the final status of runs (NULL for runs stored before it existed)
+            cursor.execute("PRAGMA table_info(run)")
+            if 'status' not in [col[1] for col in cursor.fetchall()]:
+                cursor.execute("ALTER TABLE run ADD COLUMN status TEXT")
+
             conn.commit()
 
     @contextmanager
@@ -266,7 +265,8 @@ class Database:
                     "user_id": row["user_id"],
                     "query": row["query"],
                     "graph_data": graph_data,
-                    "created_at": row["created_at"]
+                    "created_at": row["created_at"],
+                    "status": row["status"]
                 }
             return None
 
@@ -283,6 +283,16 @@ class Database:
             )
             conn.commit()
 
+    def update_run_status(self, run_id: str, status: str) -> None:
+        """Store the final status of a run (completed, failed or cancelled)."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE run SET status = ? WHERE id = ?",
+                (status, run_id)
+            )
+            conn.commit()
+
     def list_runs(self, user_id: Optional[int] = None) -> list[dict]:
         """List all runs, optionally filtering by user_id."""
         with self.get_connection() as conn:
@@ -0,0 +1,19 @@
+"""
+Filesystem locations for SQLite files.
+"""
+import os
+
+
+def resolve_data_path(filename: str) -> str:
+    """
+    Resolve where a SQLite file should live.
+
+    Uses the persistent disk in production, the backend directory in development.
+    """
+    if os.path.exists("/data"):
+        # Production: Render persistent disk
+        return f"/data/{filename}"
+
+    # Development: Local directory
+    backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    return os.path.join(backend_dir, filename)
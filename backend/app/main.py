@@ -2,6 +2,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import cv, agent, email, user, chat, audio
 from app.auth import router as auth_router
+from app.utils.openalex_client import openalex_client
 
 app = FastAPI(
     title="NetResearch Agent API",
@@ -47,5 +48,8 @@ async def root():
 
 @app.get("/health")
 async def health():
-    """Health check endpoint."""
-    return {"status": "ok"}
+    """Health check endpoint (includes OpenAlex cache counters for this worker)."""
+    return {
+        "status": "ok",
+        "openalex_cache": openalex_client.cache.stats() if openalex_client.cache else None
+    }
@@ -1,9 +1,21 @@
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from app.schemas.agent import AgentRunRequest, AgentRunResponse, AgentStatusResponse
 from app.services.state_manager import state_manager
-from app.services.simulation_service import run_research_agent
+from app.services.pacing import shape_run_view
+from app.services.run_events import stream_run_events
+from app.services.run_coalescer import RunFollowed, make_run_key, run_coalescer
+from app.services.run_scheduler import RunQueueFull, run_scheduler
+from app.services.simulation_service import (
+    cancel_run,
+    create_cancel_token,
+    release_cancel_token,
+    run_research_agent
+)
 from app.database.database import db
 from app.auth.dependencies import get_current_user_id
+from app.core.config import settings
+from typing import Optional
 import uuid
 
 router = APIRouter(prefix="/api/agent", tags=["Agent"])
@@ -12,12 +24,13 @@ router = APIRouter(prefix="/api/agent", tags=["Agent"])
 @router.post("/run", response_model=AgentRunResponse)
 async def start_agent_run(
     request: AgentRunRequest,
-    background_tasks: BackgroundTasks,
     user_id: int = Depends(get_current_user_id)
 ):
     """
     Start a new agent run.
-    Initializes the run state and starts background processing.
+    Initializes the run state and queues it on the run scheduler; answers
+    429 when the queue (or the user's share of it) is full. A run identical
+    to one in flight follows it instead of executing the pipeline again.
     Requires authentication.
     """
     # Generate unique run ID
@@ -30,46 +43,185 @@ async def start_agent_run(
         if cv_data:
             cv_concepts = cv_data.get("concepts", [])
 
-    # Create run in database with user_id
-    db.create_run(run_id=run_id, user_id=user_id, query=request.query)
+    def create_run(status: str) -> None:
+        # Create run in database with user_id
+        db.create_run(run_id=run_id, user_id=user_id, query=request.query)
 
-    # Create run in state manager
-    state_manager.create_run(
-        run_id=run_id,
-        query=request.query,
-        cv_id=request.cv_id,
-        max_nodes=request.max_nodes
-    )
+        # Create run in state manager
+        state_manager.create_run(
+            run_id=run_id,
+            query=request.query,
+            cv_id=request.cv_id,
+            max_nodes=request.max_nodes,
+            pacing=request.pacing or settings.PIPELINE_PACING,
+            status=status
+        )
+
+    # Identical run in flight: share its execution
+    run_key = make_run_key(request.query, request.max_nodes, cv_concepts)
+    leader_id = run_coalescer.follow(run_key, run_id, user_id, create_run)
+    if leader_id:
+        return AgentRunResponse(
+            run_id=run_id,
+            status=state_manager.get_run(run_id)["status"],
+            queue_position=run_scheduler.position(leader_id)
+        )
 
-    # Start background agent execution
-    background_tasks.add_task(
+    # Admission control: take a queue slot before creating anything
+    try:
+        queue_position = run_scheduler.reserve(run_id, user_id)
+    except RunQueueFull as e:
+        raise HTTPException(
+            status_code=429,
+            detail={"message": str(e), "queue_depth": e.queue_depth},
+            headers={"Retry-After": "10"}
+        )
+
+    try:
+        create_run("queued")
+    except Exception:
+        run_scheduler.cancel(run_id)
+        raise
+
+    # Execute on a run worker as soon as one is free
+    run_coalescer.lead(run_key, run_id)
+    run_scheduler.start(
+        run_id,
         run_research_agent,
         run_id=run_id,
         query=request.query,
         max_nodes=request.max_nodes,
         cv_id=request.cv_id,
-        cv_concepts=cv_concepts
+        cv_concepts=cv_concepts,
+        user_id=user_id,
+        cancel_token=create_cancel_token(run_id)
     )
 
-    return AgentRunResponse(run_id=run_id, status="started")
+    return AgentRunResponse(run_id=run_id, status="queued", queue_position=queue_position)
+
+
+@router.delete("/run/{run_id}", response_model=AgentRunResponse)
+async def cancel_agent_run(run_id: str, user_id: int = Depends(get_current_user_id)):
+    """
+    Cancel a queued or running agent run.
+    A queued run is removed from the queue and is "cancelled" at once; a
+    running one is "cancelling" until it stops at its next cancellation
+    point. A run following an identical one just stops following it.
+    Only the run's owner can cancel it.
+    """
+    if not db.get_run(run_id, user_id=user_id):
+        raise HTTPException(status_code=404, detail="Run not found")
+
+    run_data = state_manager.get_run(run_id)
+    if not run_data or run_data["status"] in ("completed", "failed", "cancelled"):
+        raise HTTPException(status_code=409, detail="Run already finished")
+
+    # Following an identical run: stop mirroring it, the other run goes on
+    if run_coalescer.detach(run_id):
+        _mark_cancelled(run_id)
+        return AgentRunResponse(run_id=run_id, status="cancelled")
+
+    try:
+        status = run_coalescer.release(run_id, lambda: _cancel(run_id))
+    except RunFollowed:
+        raise HTTPException(
+            status_code=409,
+            detail="Identical runs of other users follow this run, it cannot be cancelled"
+        )
+
+    if status is None:
+        raise HTTPException(status_code=409, detail="Run is executing in another worker process")
+
+    # Still waiting in the queue: it never executes
+    if status == "cancelled":
+        release_cancel_token(run_id)
+        _mark_cancelled(run_id)
+
+    return AgentRunResponse(run_id=run_id, status=status)
+
+
+def _cancel(run_id: str) -> Optional[str]:
+    """Cancel a queued or running run of this process; its new status, or None."""
+    if run_scheduler.cancel(run_id):
+        return "cancelled"
+    if cancel_run(run_id):
+        return "cancelling"
+    return None
+
+
+def _mark_cancelled(run_id: str) -> None:
+    """End a run that never executed (or stopped following another one)."""
+    state_manager.set_run_metrics(run_id, {"cancelled": "Cancelled by user"})
+    state_manager.update_run_status(run_id, "cancelled")
+    db.update_run_status(run_id, "cancelled")
+    state_manager.mark_run_persisted(run_id)
 
 
 @router.get("/status/{run_id}", response_model=AgentStatusResponse)
-async def get_agent_status(run_id: str):
+async def get_agent_status(run_id: str, since: Optional[int] = Query(None, ge=0)):
     """
     Poll the status of an agent run.
-    Returns current status, steps, and graph data (when completed).
+    Returns current status, steps, and graph data (when completed),
+    paced according to the run's pacing mode.
+    With `since` (the revision returned by the previous poll), only the
+    steps changed after it are returned, and graph_data only if it changed.
     """
     run_data = state_manager.get_run(run_id)
 
     if not run_data:
-        raise HTTPException(status_code=404, detail="Run not found")
+        # Finished runs are evicted from memory once persisted
+        stored_run = db.get_run(run_id)
+        if not stored_run:
+            raise HTTPException(status_code=404, detail="Run not found")
+
+        return AgentStatusResponse(
+            run_id=run_id,
+            # Runs stored before statuses were persisted all completed
+            status=stored_run["status"] or "completed",
+            steps=[],
+            graph_data=stored_run["graph_data"]
+        )
+
+    view = shape_run_view(run_data, since=since)
 
     return AgentStatusResponse(
         run_id=run_data["run_id"],
-        status=run_data["status"],
-        steps=run_data["steps"],
-        graph_data=run_data["graph_data"]
+        status=view["status"],
+        steps=view["steps"],
+        graph_data=view["graph_data"],
+        metrics=run_data.get("metrics"),
+        abstracts_status=run_data.get("abstracts_status"),
+        revision=view["revision"],
+        queue_position=(
+            run_scheduler.position(run_coalescer.leader_of(run_id) or run_id)
+            if view["status"] == "queued" else None
+        )
+    )
+
+
+@router.get("/queue")
+async def get_queue_stats():
+    """
+    Run scheduler counters for this process: workers, running runs,
+    queue depth and recent queue wait times.
+    """
+    return run_scheduler.stats()
+
+
+@router.get("/stream/{run_id}")
+async def stream_agent_run(run_id: str, request: Request):
+    """
+    Stream the progress of an agent run as Server-Sent Events.
+    Sends the current steps, then each step change as it happens; the
+    graph is sent once, right before the "completed" status.
+    """
+    if not state_manager.get_run(run_id):
+        raise HTTPException(status_code=404, detail="Run not found")
+
+    return StreamingResponse(
+        stream_run_events(run_id, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 
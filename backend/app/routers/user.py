@@ -86,9 +86,7 @@ async def clean_history():
     try:
         db.reset_all_data()
         # Also clear in-memory state
-        state_manager.cv_store.clear()
-        state_manager.run_store.clear()
-        state_manager.user_name = None
+        state_manager.clear()
 
         return {
             "message": "History cleaned successfully",
@@ -108,6 +106,6 @@ async def debug_state():
     """
     return {
         "user_name": state_manager.get_user_name(),
-        "cv_count": len(state_manager.cv_store),
-        "run_count": len(state_manager.run_store)
+        "cv_count": len(state_manager.list_cvs()),
+        "run_count": len(state_manager.list_runs())
     }
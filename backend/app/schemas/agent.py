@@ -6,11 +6,13 @@ class AgentRunRequest(BaseModel):
     query: str
     cv_id: Optional[str] = None
     max_nodes: int = 10
+    pacing: Optional[Literal["fast", "presentation"]] = None  # Defaults to the PIPELINE_PACING setting
 
 
 class AgentRunResponse(BaseModel):
     run_id: str
     status: str
+    queue_position: Optional[int] = None  # Set when the run waits for a worker (1 = next to start)
 
 class Source(BaseModel):
     title: str
@@ -19,9 +21,11 @@ class Source(BaseModel):
 
 
 class Paper(BaseModel):
+    id: Optional[str] = None  # OpenAlex work ID
     title: str
     link: Optional[str] = None
     abstract: Optional[str] = None
+    abstract_status: Optional[Literal["ready", "pending", "missing"]] = None  # "pending" until resolved in the background
     publication_year: Optional[int] = None
     topic: Optional[str] = None
 
@@ -42,6 +46,10 @@ class StepLog(BaseModel):
     message: str
     status: Literal["in_progress", "done", "pending"]
     timestamp: str
+    started_at: Optional[str] = None  # When the step started (when it becomes visible, in presentation pacing)
+    finished_at: Optional[str] = None  # When the step was done in the pipeline
+    min_visible_ms: Optional[int] = None  # Presentation pacing: minimum time the step is shown in progress
+    revision: Optional[int] = None  # Run revision of the step's last update
 
     # Step-specific fields (only populated for relevant step types)
     details: Optional[Dict[str, Any]] = None  # Deprecated, use specific fields below
@@ -91,6 +99,10 @@ class GraphData(BaseModel):
 
 class AgentStatusResponse(BaseModel):
     run_id: str
-    status: Literal["running", "completed"]
+    status: Literal["queued", "running", "completed", "failed", "cancelled"]
+    queue_position: Optional[int] = None  # While queued (1 = next to start)
     steps: List[StepLog]
     graph_data: Optional[GraphData] = None
+    metrics: Optional[Dict[str, Any]] = None  # e.g. {"throttled_seconds": 1.2, "retries": 2}
+    abstracts_status: Optional[Literal["pending", "resolved"]] = None  # Deferred abstract resolution after the graph is returned
+    revision: int = 0  # Pass as `since` on the next poll to only get what changed
@@ -0,0 +1,114 @@
+"""
+Pacing of the run view served to clients.
+
+The pipeline always runs at full speed. In "presentation" mode the status
+endpoint replays the recorded step timestamps so every step stays visible
+(in progress) for at least its minimum duration before the next one
+appears, without ever blocking the pipeline thread.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+PACING_MODES = ("fast", "presentation")
+
+# Minimum time each step type is shown as in progress in presentation mode
+MIN_VISIBLE_MS: Dict[str, int] = {
+    "filters": 1000,
+    "search": 1500,
+    "extraction": 1500,
+    "relationships": 1000,
+    "graph": 1000
+}
+
+
+def shape_run_view(
+    run_data: Dict[str, Any],
+    now: Optional[datetime] = None,
+    since: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Build the client-facing view of a run according to its pacing mode.
+
+    In "fast" mode the recorded state is returned as is. In "presentation"
+    mode each step gets a visible start (not before the previous step is
+    visibly done) and is reported as in progress until it has been visible
+    for its minimum duration; later steps, the "completed" status and the
+    graph are held back until then.
+
+    The view's revision is the cursor to poll with next. In presentation
+    mode it stays below the revision of anything still held back, so
+    held steps and the graph are returned again once they are shown.
+
+    Args:
+        run_data: Run state from the state manager
+        now: Current UTC time (default: now)
+        since: Only return steps updated after this revision, and the
+            graph only if it changed after it (default: everything)
+
+    Returns:
+        Dict with "status", "steps", "graph_data" and "revision" to serve
+    """
+    view = {
+        "status": run_data["status"],
+        "steps": run_data["steps"],
+        "graph_data": run_data["graph_data"],
+        "revision": run_data.get("revision", 0)
+    }
+
+    if run_data.get("pacing") == "presentation":
+        _hold_back(view, run_data, now or datetime.utcnow())
+
+    if since is not None:
+        view["steps"] = [step for step in view["steps"] if step.get("revision", 0) > since]
+        if (run_data.get("graph_revision") or 0) <= since:
+            view["graph_data"] = None
+
+    return view
+
+
+def _hold_back(view: Dict[str, Any], run_data: Dict[str, Any], now: datetime) -> None:
+    """Apply presentation pacing to a view (see shape_run_view)."""
+    steps = []
+    held_revisions = []
+    visible_until: Optional[datetime] = None
+    all_visible = True
+
+    for index, step in enumerate(run_data["steps"]):
+        min_visible_ms = MIN_VISIBLE_MS.get(step["step_type"], 0)
+        started_at = datetime.fromisoformat(step.get("started_at") or step["timestamp"])
+
+        visible_from = max(started_at, visible_until) if visible_until else started_at
+        if visible_from > now:
+            all_visible = False
+            held_revisions.extend(s.get("revision", 0) for s in run_data["steps"][index:])
+            break
+
+        finished_at = step.get("finished_at")
+        visible_until = None
+        if finished_at:
+            visible_until = max(
+                datetime.fromisoformat(finished_at),
+                visible_from + timedelta(milliseconds=min_visible_ms)
+            )
+
+        shaped = {**step, "started_at": visible_from.isoformat(), "min_visible_ms": min_visible_ms}
+        if visible_until is None or visible_until > now:
+            shaped["status"] = "in_progress"
+        steps.append(shaped)
+
+        if visible_until is None or visible_until > now:
+            all_visible = False
+            if shaped["status"] != step["status"]:
+                held_revisions.append(step.get("revision", 0))
+            held_revisions.extend(s.get("revision", 0) for s in run_data["steps"][index + 1:])
+            break
+
+    view["steps"] = steps
+    if view["status"] == "completed" and not all_visible:
+        view["status"] = "running"
+        view["graph_data"] = None
+        if run_data.get("graph_revision"):
+            held_revisions.append(run_data["graph_revision"])
+
+    if held_revisions:
+        view["revision"] = min(view["revision"], min(held_revisions) - 1)
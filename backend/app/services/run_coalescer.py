@@ -0,0 +1,272 @@
+"""
+Single-flight coalescing of identical agent runs.
+
+When a run is submitted while an identical one (same normalized query,
+max_nodes and CV concepts) is in flight, the new run does not execute the
+pipeline again: it follows the in-flight leader. The follower keeps its
+own run_id and state, which mirrors the leader's steps, status and graph
+(with the follower's own user node), and its graph is persisted for its
+own user when the leader finishes.
+"""
+import copy
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+from app.database.database import db
+from app.services.state_manager import state_manager
+
+RunKey = Tuple[str, int, Tuple[str, ...]]
+T = TypeVar("T")
+
+
+class RunFollowed(Exception):
+    """Raised when cancelling a leader that other runs follow."""
+
+
+def make_run_key(query: str, max_nodes: int, cv_concepts: Optional[List[str]] = None) -> RunKey:
+    """
+    Normalize run inputs into a coalescing key.
+
+    Args:
+        query: User's research query (case and whitespace are ignored)
+        max_nodes: Maximum number of nodes in graph
+        cv_concepts: Concepts extracted from the CV (order and case are ignored)
+
+    Returns:
+        Hashable key identifying equivalent runs
+    """
+    normalized_query = " ".join(query.lower().split())
+    concepts = tuple(sorted({concept.strip().lower() for concept in cv_concepts or [] if concept.strip()}))
+    return normalized_query, max_nodes, concepts
+
+
+@dataclass
+class _Follower:
+    run_id: str
+    user_name: str
+
+
+@dataclass
+class _Flight:
+    key: RunKey
+    leader_id: str
+    followers: List[_Follower] = field(default_factory=list)
+
+
+class RunCoalescer:
+    """
+    Tracks in-flight runs by key and mirrors leaders onto their followers.
+
+    Mirroring happens in a state manager listener, under the coalescer's
+    lock, so a follower that attaches mid-run gets the leader's current
+    state first and then every later change, in order.
+
+    Coalescing is per process: identical runs started on different
+    uvicorn workers still execute separately.
+    """
+
+    def __init__(self):
+        self._flights: Dict[RunKey, _Flight] = {}
+        self._by_leader: Dict[str, _Flight] = {}
+        self._lock = threading.RLock()
+
+    def lead(self, key: RunKey, run_id: str) -> None:
+        """
+        Register a run about to execute as the leader for its key.
+
+        If another leader registered the same key meanwhile, both runs
+        execute and later identical runs follow the first one.
+        """
+        with self._lock:
+            if key not in self._flights:
+                flight = _Flight(key=key, leader_id=run_id)
+                self._flights[key] = flight
+                self._by_leader[run_id] = flight
+
+    def follow(
+        self,
+        key: RunKey,
+        run_id: str,
+        user_id: Optional[int],
+        create_run: Callable[[str], None]
+    ) -> Optional[str]:
+        """
+        Attach a new run to the in-flight run with the same key, if any.
+
+        Args:
+            key: Coalescing key of the new run
+            run_id: Identifier of the new run
+            user_id: User starting the new run (for the user node of its graph)
+            create_run: Creates the new run (database row and state) with
+                the given initial status; only called when attaching
+
+        Returns:
+            The leader's run_id, or None if no identical run is in flight
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                return None
+
+            leader = state_manager.get_run(flight.leader_id)
+            if leader is None:
+                return None
+
+            user_data = db.get_user_details(user_id) if user_id is not None else None
+            follower = _Follower(
+                run_id=run_id,
+                user_name=user_data["name"] if user_data and user_data["name"] else "User"
+            )
+
+            # Catch up with the leader, then receive its changes as they happen
+            create_run(leader["status"])
+            self._copy_run(leader, follower)
+            flight.followers.append(follower)
+
+        print(f"Run {run_id} follows identical in-flight run {flight.leader_id}")
+        return flight.leader_id
+
+    def leader_of(self, run_id: str) -> Optional[str]:
+        """The run a follower is attached to, or None."""
+        with self._lock:
+            for flight in self._flights.values():
+                if any(follower.run_id == run_id for follower in flight.followers):
+                    return flight.leader_id
+            return None
+
+    def detach(self, run_id: str) -> bool:
+        """
+        Stop mirroring a leader onto a follower (the follower is being cancelled).
+
+        Returns:
+            True if the run was following another one
+        """
+        with self._lock:
+            for flight in self._flights.values():
+                for follower in flight.followers:
+                    if follower.run_id == run_id:
+                        flight.followers.remove(follower)
+                        return True
+            return False
+
+    def release(self, run_id: str, cancel: Callable[[], Optional[T]]) -> Optional[T]:
+        """
+        Cancel a leader and close its flight once the cancellation succeeded.
+
+        Runs under the coalescer's lock, so no identical run starts following
+        the leader meanwhile. A leader that could not be cancelled (e.g. it
+        executes in another worker process) keeps its flight, and identical
+        runs go on following it.
+
+        Args:
+            run_id: Run to cancel (runs that lead nothing are just cancelled)
+            cancel: Cancels the run; returns None if it could not
+
+        Returns:
+            What `cancel` returned
+
+        Raises:
+            RunFollowed: If other runs follow this one (cancelling it would
+                cancel their runs too, so it is not cancelled)
+        """
+        with self._lock:
+            flight = self._by_leader.get(run_id)
+            if flight is not None and flight.followers:
+                raise RunFollowed(f"Run {run_id} is followed by identical runs")
+
+            result = cancel()
+            if flight is not None and result is not None:
+                del self._by_leader[run_id]
+                if self._flights.get(flight.key) is flight:
+                    del self._flights[flight.key]
+            return result
+
+    def finish(self, run_id: str) -> None:
+        """
+        Close a leader's flight once its run is over (no-op for other runs).
+
+        Copies the leader's final metrics to its followers and persists each
+        follower's graph for its own user.
+        """
+        with self._lock:
+            flight = self._by_leader.pop(run_id, None)
+            if flight is None:
+                return
+            if self._flights.get(flight.key) is flight:
+                del self._flights[flight.key]
+
+            leader = state_manager.get_run(run_id)
+
+            for follower in flight.followers:
+                try:
+                    if leader and leader.get("metrics"):
+                        state_manager.set_run_metrics(
+                            follower.run_id,
+                            {**leader["metrics"], "coalesced": True}
+                        )
+
+                    run_data = state_manager.get_run(follower.run_id)
+                    if run_data:
+                        db.update_run_status(follower.run_id, run_data["status"])
+                    if run_data and run_data.get("graph_data"):
+                        db.update_run_graph(follower.run_id, run_data["graph_data"])
+                    state_manager.mark_run_persisted(follower.run_id)
+
+                except Exception as e:
+                    print(f"Error saving coalesced run {follower.run_id}: {str(e)}")
+
+    def mirror(self, run_id: str, event: str, data: Dict[str, Any]) -> None:
+        """State manager listener: replay a leader's change on its followers."""
+        with self._lock:
+            flight = self._by_leader.get(run_id)
+            if flight is None:
+                return
+
+            for follower in flight.followers:
+                if event == "step":
+                    self._copy_step(data, follower)
+                elif event == "graph":
+                    state_manager.set_run_graph(follower.run_id, self._graph_for(data, follower))
+                elif event == "status":
+                    state_manager.update_run_status(follower.run_id, data["status"])
+                elif event == "abstracts":
+                    state_manager.set_run_abstracts_status(follower.run_id, data["abstracts_status"])
+
+    def _copy_run(self, leader: Dict[str, Any], follower: _Follower) -> None:
+        """Bring a new follower up to the leader's current state."""
+        for step in list(leader["steps"]):
+            self._copy_step(step, follower)
+        if leader.get("graph_data"):
+            state_manager.set_run_graph(follower.run_id, self._graph_for(leader["graph_data"], follower))
+        if leader.get("abstracts_status"):
+            state_manager.set_run_abstracts_status(follower.run_id, leader["abstracts_status"])
+
+    @staticmethod
+    def _copy_step(step: Dict[str, Any], follower: _Follower) -> None:
+        """Add or update a leader's step on a follower."""
+        state_manager.add_run_step(
+            run_id=follower.run_id,
+            step_id=step["step_id"],
+            step_type=step["step_type"],
+            message=step["message"],
+            status=step["status"],
+            details=step.get("details"),
+            filters=step.get("filters"),
+            papers=step.get("papers"),
+            professors=step.get("professors"),
+            sources=step.get("sources")
+        )
+
+    @staticmethod
+    def _graph_for(graph_data: Dict[str, Any], follower: _Follower) -> Dict[str, Any]:
+        """The leader's graph with the follower's user node."""
+        graph = copy.deepcopy(graph_data)
+        for node in graph.get("nodes", []):
+            if node.get("type") == "user":
+                node["name"] = follower.user_name
+        return graph
+
+
+# Global coalescer instance, fed by the state manager
+run_coalescer = RunCoalescer()
+state_manager.add_run_listener(run_coalescer.mirror)
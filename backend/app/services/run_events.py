@@ -0,0 +1,198 @@
+"""
+Push stream of run progress (Server-Sent Events).
+
+The state manager notifies every run change from the pipeline threads;
+the broker forwards them to the asyncio queues of the clients streaming
+that run, which then send the steps changed since their last revision,
+so each step is serialized once per change instead of the whole run once
+per poll.
+"""
+import asyncio
+import json
+import threading
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.services.pacing import MIN_VISIBLE_MS
+from app.services.state_manager import state_manager
+
+# Idle interval after which a comment line is sent to keep proxies from closing the stream
+HEARTBEAT_SECONDS = 15
+
+Subscription = Tuple[asyncio.AbstractEventLoop, asyncio.Queue]
+
+
+class RunEventBroker:
+    """Fans run changes out to the event loops of subscribed clients."""
+
+    def __init__(self):
+        self.subscriptions: Dict[str, List[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, run_id: str) -> Subscription:
+        """
+        Subscribe the running event loop to a run's changes.
+
+        Returns:
+            Subscription whose queue receives (event, data) tuples
+        """
+        subscription = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self.subscriptions.setdefault(run_id, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, run_id: str, subscription: Subscription) -> None:
+        """Remove a subscription (no-op if already removed)."""
+        with self._lock:
+            subscriptions = self.subscriptions.get(run_id, [])
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+            if not subscriptions:
+                self.subscriptions.pop(run_id, None)
+
+    def publish(self, run_id: str, event: str, data: Dict[str, Any]) -> None:
+        """
+        Forward a run change to its subscribers (safe to call from any thread).
+
+        Args:
+            run_id: Run identifier
+            event: Event name ("step", "status", "graph", "abstracts")
+            data: Event payload
+        """
+        with self._lock:
+            subscriptions = list(self.subscriptions.get(run_id, []))
+
+        for loop, queue in subscriptions:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, (event, data))
+            except RuntimeError:
+                # The client's event loop is closed
+                self.unsubscribe(run_id, (loop, queue))
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _paper_key(paper: Dict[str, Any]) -> Optional[str]:
+    """Identify a paper across snapshots of a run."""
+    return paper.get("id") or paper.get("link") or paper.get("title")
+
+
+def _graph_papers(graph_data: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Papers of all graph nodes."""
+    papers = []
+    for node in (graph_data or {}).get("nodes", []):
+        papers.extend(node.get("papers") or [])
+    return papers
+
+
+async def stream_run_events(
+    run_id: str,
+    is_disconnected: Callable[[], Awaitable[bool]]
+) -> AsyncIterator[str]:
+    """
+    Stream a run's progress as Server-Sent Events.
+
+    The current steps are sent first, then every step change as it
+    happens. The graph is held back and sent once, right before the
+    "completed" status; abstracts resolved after that arrive as an
+    "abstracts" event with just the filled papers. The stream ends with
+    an "end" event once nothing else can change. A failed or cancelled run
+    ends with its status and "end".
+
+    Changes are found by comparing revisions of the run. Changes made in
+    this process wake the stream up at once; with a shared state backend
+    the run is also checked every STATE_STREAM_POLL_INTERVAL seconds, for
+    runs executed by another worker.
+
+    In presentation pacing, step events carry min_visible_ms so the client
+    can keep each step on screen for its minimum duration.
+
+    Args:
+        run_id: Run identifier
+        is_disconnected: Coroutine function telling whether the client left
+
+    Yields:
+        SSE-formatted event strings
+    """
+    subscription = run_events.subscribe(run_id)
+    _, queue = subscription
+    poll_interval = settings.STATE_STREAM_POLL_INTERVAL if state_manager.backend.shared else HEARTBEAT_SECONDS
+
+    cursor = -1
+    completed = False
+    pending_keys: Set[str] = set()
+    idle = 0.0
+
+    try:
+        while True:
+            # Off the event loop: with the SQLite backend this is disk I/O
+            run_data = await run_in_threadpool(state_manager.get_run, run_id)
+            if not run_data:
+                # Unknown or evicted run (its result is in the database)
+                yield format_sse("end", {"run_id": run_id})
+                return
+
+            # Read the revision before the steps: a step updated meanwhile is sent again next time
+            revision = run_data["revision"]
+            min_visible = run_data.get("pacing") == "presentation"
+
+            for step in list(run_data["steps"]):
+                if step.get("revision", 0) > cursor:
+                    if min_visible:
+                        step = {**step, "min_visible_ms": MIN_VISIBLE_MS.get(step["step_type"], 0)}
+                    yield format_sse("step", step)
+            cursor = revision
+
+            if run_data["status"] in ("failed", "cancelled"):
+                yield format_sse("status", {"status": run_data["status"]})
+                yield format_sse("end", {"run_id": run_id})
+                return
+
+            abstracts_status = run_data.get("abstracts_status")
+            if run_data["status"] == "completed" and not completed:
+                completed = True
+                graph_data = run_data["graph_data"]
+                if graph_data:
+                    yield format_sse("graph", graph_data)
+                yield format_sse("status", {"status": "completed"})
+
+                if abstracts_status == "pending":
+                    pending_keys = {
+                        _paper_key(paper) for paper in _graph_papers(graph_data)
+                        if paper.get("abstract_status") == "pending"
+                    }
+
+            if completed and abstracts_status != "pending":
+                if pending_keys:
+                    papers = [
+                        paper for paper in _graph_papers(run_data["graph_data"])
+                        if _paper_key(paper) in pending_keys
+                    ]
+                    yield format_sse("abstracts", {"abstracts_status": abstracts_status, "papers": papers})
+                yield format_sse("end", {"run_id": run_id})
+                return
+
+            # Wait for a change in this process, or poll for changes made elsewhere
+            try:
+                await asyncio.wait_for(queue.get(), timeout=poll_interval)
+                idle = 0.0
+                while not queue.empty():
+                    queue.get_nowait()
+            except asyncio.TimeoutError:
+                idle += poll_interval
+                if idle >= HEARTBEAT_SECONDS:
+                    idle = 0.0
+                    if await is_disconnected():
+                        return
+                    yield ": keep-alive\n\n"
+
+    finally:
+        run_events.unsubscribe(run_id, subscription)
+
+
+# Global broker instance, fed by the state manager
+run_events = RunEventBroker()
+state_manager.add_run_listener(run_events.publish)
@@ -0,0 +1,225 @@
+"""
+Dedicated scheduler for agent runs.
+
+Runs used to be started with FastAPI BackgroundTasks, sharing the request
+threadpool with every synchronous endpoint, without limit or queue. The
+scheduler executes them on its own fixed set of worker threads, with a
+bounded FIFO queue and a per-user limit on runs executing at once.
+"""
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+from app.core.config import settings
+
+
+class RunQueueFull(Exception):
+    """Raised when a run cannot be admitted (queue full or user limit reached)."""
+
+    def __init__(self, message: str, queue_depth: int):
+        super().__init__(message)
+        self.queue_depth = queue_depth
+
+
+@dataclass
+class RunJob:
+    """A run waiting in the queue (runnable once its function is set)."""
+    run_id: str
+    user_id: Optional[int]
+    enqueued_at: float = field(default_factory=time.monotonic)
+    fn: Optional[Callable[..., None]] = None
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+class RunScheduler:
+    """
+    Fixed pool of run workers fed by a bounded queue.
+
+    Admission is two-phase: reserve() takes a queue slot (or raises
+    RunQueueFull) before the run is created, start() hands over the
+    function once the run exists, and cancel() gives the slot back if
+    creating the run failed. Workers take the oldest runnable job whose
+    user is below the concurrency cap, so one user's burst cannot hold
+    up the others.
+
+    The scheduler is per process: with several uvicorn workers, each has
+    its own pool and queue.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, max_running_per_user: int, max_queued_per_user: int):
+        """
+        Args:
+            max_workers: Runs executed at once
+            max_queue: Runs waiting at most (beyond that, new runs are rejected)
+            max_running_per_user: Runs of one user executed at once
+            max_queued_per_user: Runs of one user waiting at most
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.max_running_per_user = max_running_per_user
+        self.max_queued_per_user = max_queued_per_user
+
+        self._queue: List[RunJob] = []
+        self._running: Dict[str, Optional[int]] = {}  # run_id -> user_id
+        self._condition = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        self._recent_waits: Deque[float] = deque(maxlen=100)
+        self._completed = 0
+        self._rejected = 0
+
+    def reserve(self, run_id: str, user_id: Optional[int]) -> int:
+        """
+        Take a queue slot for a run about to be created.
+
+        Args:
+            run_id: Run identifier
+            user_id: User starting the run
+
+        Returns:
+            Position in the queue (1 = next to start)
+
+        Raises:
+            RunQueueFull: If the queue or the user's share of it is full
+        """
+        with self._condition:
+            if len(self._queue) >= self.max_queue:
+                self._rejected += 1
+                raise RunQueueFull("Too many runs are waiting, please retry later", len(self._queue))
+
+            if user_id is not None:
+                queued = sum(1 for job in self._queue if job.user_id == user_id)
+                if queued >= self.max_queued_per_user:
+                    self._rejected += 1
+                    raise RunQueueFull(
+                        f"You already have {queued} runs waiting, please wait for them to start",
+                        len(self._queue)
+                    )
+
+            self._queue.append(RunJob(run_id=run_id, user_id=user_id))
+            return len(self._queue)
+
+    def start(self, run_id: str, fn: Callable[..., None], /, **kwargs) -> None:
+        """
+        Make a reserved run runnable.
+
+        Args:
+            run_id: Run identifier passed to reserve()
+            fn: Function executing the run, called with kwargs and
+                queue_wait_seconds (time spent waiting in the queue)
+            **kwargs: Arguments of fn
+        """
+        with self._condition:
+            job = next((job for job in self._queue if job.run_id == run_id), None)
+            if job is None:
+                raise KeyError(f"Run {run_id} has no reserved slot")
+
+            job.fn = fn
+            job.kwargs = kwargs
+            self._ensure_workers()
+            self._condition.notify_all()
+
+    def cancel(self, run_id: str) -> bool:
+        """
+        Remove a run from the queue (reserved or waiting; running runs are not affected).
+
+        Returns:
+            True if the run was waiting in the queue
+        """
+        with self._condition:
+            for job in self._queue:
+                if job.run_id == run_id:
+                    self._queue.remove(job)
+                    return True
+            return False
+
+    def position(self, run_id: str) -> Optional[int]:
+        """Position of a waiting run in the queue (1 = next), or None if not waiting."""
+        with self._condition:
+            for index, job in enumerate(self._queue):
+                if job.run_id == run_id:
+                    return index + 1
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Queue and worker counters.
+
+        Returns:
+            Dict with queue depth, running runs, the age of the oldest
+            waiting run and wait times of recently started runs
+        """
+        with self._condition:
+            now = time.monotonic()
+            waits = list(self._recent_waits)
+            return {
+                "workers": self.max_workers,
+                "running": len(self._running),
+                "queue_depth": len(self._queue),
+                "queue_capacity": self.max_queue,
+                "oldest_wait_seconds": round(now - self._queue[0].enqueued_at, 3) if self._queue else 0.0,
+                "avg_wait_seconds": round(sum(waits) / len(waits), 3) if waits else 0.0,
+                "max_wait_seconds": round(max(waits), 3) if waits else 0.0,
+                "completed": self._completed,
+                "rejected": self._rejected
+            }
+
+    def _ensure_workers(self) -> None:
+        """Start the worker threads on first use."""
+        if self._workers:
+            return
+
+        for index in range(self.max_workers):
+            worker = threading.Thread(target=self._work, name=f"run-worker-{index}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def _next_job(self) -> Optional[RunJob]:
+        """Oldest runnable job whose user is below the concurrency cap."""
+        running_by_user: Dict[Optional[int], int] = {}
+        for user_id in self._running.values():
+            running_by_user[user_id] = running_by_user.get(user_id, 0) + 1
+
+        for job in self._queue:
+            if job.fn is None:
+                continue
+            if job.user_id is not None and running_by_user.get(job.user_id, 0) >= self.max_running_per_user:
+                continue
+            return job
+        return None
+
+    def _work(self) -> None:
+        """Worker loop: execute runs as they become runnable."""
+        while True:
+            with self._condition:
+                job = self._next_job()
+                while job is None:
+                    self._condition.wait()
+                    job = self._next_job()
+
+                self._queue.remove(job)
+                self._running[job.run_id] = job.user_id
+                wait_seconds = time.monotonic() - job.enqueued_at
+                self._recent_waits.append(wait_seconds)
+
+            print(f"Starting run {job.run_id} after {wait_seconds:.2f}s in queue")
+
+            try:
+                job.fn(**job.kwargs, queue_wait_seconds=round(wait_seconds, 3))
+            except Exception as e:
+                print(f"Run {job.run_id} failed: {str(e)}")
+            finally:
+                with self._condition:
+                    self._running.pop(job.run_id, None)
+                    self._completed += 1
+                    # A user's next run may now be runnable
+                    self._condition.notify_all()
+
+
+# Global scheduler instance (workers start with the first run)
+run_scheduler = RunScheduler(
+    max_workers=settings.RUN_WORKERS,
+    max_queue=settings.RUN_QUEUE_SIZE,
+    max_running_per_user=settings.RUN_MAX_RUNNING_PER_USER,
+    max_queued_per_user=settings.RUN_MAX_QUEUED_PER_USER
+)
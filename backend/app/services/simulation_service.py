@@ -1,7 +1,53 @@
 import random
-from typing import Optional, List
+import threading
+from typing import Dict, Optional, List
 from app.agents.orchestrator import ResearchAgentOrchestrator
 from app.agents.models import AgentContext
+from app.core.config import settings
+from app.services.run_coalescer import run_coalescer
+from app.services.state_manager import state_manager
+from app.utils.cancellation import CancellationToken
+
+# Cancellation tokens of the runs created in this process, until they finish
+_cancel_tokens: Dict[str, CancellationToken] = {}
+_cancel_tokens_lock = threading.Lock()
+
+
+def create_cancel_token(run_id: str) -> CancellationToken:
+    """Create and register the cancellation token of a new run."""
+    token = CancellationToken()
+    with _cancel_tokens_lock:
+        _cancel_tokens[run_id] = token
+    return token
+
+
+def release_cancel_token(run_id: str) -> None:
+    """Forget the token of a finished (or never started) run."""
+    with _cancel_tokens_lock:
+        _cancel_tokens.pop(run_id, None)
+
+
+def cancel_run(run_id: str, reason: str = "Cancelled by user") -> bool:
+    """
+    Cancel a run executing (or about to execute) in this process.
+
+    The run stops at its next cancellation point and ends as "cancelled".
+
+    Args:
+        run_id: Run identifier
+        reason: Why the run is cancelled (recorded in its metrics)
+
+    Returns:
+        True if the run has a token in this process
+    """
+    with _cancel_tokens_lock:
+        token = _cancel_tokens.get(run_id)
+
+    if token is None:
+        return False
+
+    token.cancel(reason)
+    return True
 
 
 def run_research_agent(
@@ -9,7 +55,10 @@ def run_research_agent(
     query: str,
     max_nodes: int,
     cv_id: Optional[str] = None,
-    cv_concepts: Optional[List[str]] = None
+    cv_concepts: Optional[List[str]] = None,
+    user_id: Optional[int] = None,
+    cancel_token: Optional[CancellationToken] = None,
+    queue_wait_seconds: Optional[float] = None
 ):
     """
     Execute the research agent pipeline.
@@ -22,19 +71,38 @@ def run_research_agent(
         max_nodes: Maximum number of nodes in graph
         cv_id: Optional CV identifier
         cv_concepts: Optional list of concepts extracted from CV
+        user_id: ID of the user who started the run
+        cancel_token: Token cancelling the run (see create_cancel_token); its
+            AGENT_TIMEOUT deadline starts now, not while the run was queued
+        queue_wait_seconds: Time the run waited for a scheduler worker
     """
+    cancel_token = cancel_token or create_cancel_token(run_id)
+    cancel_token.start_deadline(settings.AGENT_TIMEOUT)
+
+    # The run leaves the scheduler queue
+    state_manager.update_run_status(run_id, "running")
+    if queue_wait_seconds is not None:
+        state_manager.set_run_metrics(run_id, {"queue_wait_seconds": queue_wait_seconds})
+
     # Create agent context
     context = AgentContext(
         run_id=run_id,
         query=query,
         cv_id=cv_id,
         cv_concepts=cv_concepts,
-        max_nodes=max_nodes
+        max_nodes=max_nodes,
+        user_id=user_id,
+        cancel_token=cancel_token
     )
 
     # Create orchestrator and run
     orchestrator = ResearchAgentOrchestrator()
-    orchestrator.run(context)
+    try:
+        orchestrator.run(context)
+    finally:
+        release_cancel_token(run_id)
+        # Runs that followed this one get their final state and are persisted
+        run_coalescer.finish(run_id)
 
 
 def generate_mock_graph(max_nodes: int):
@@ -0,0 +1,566 @@
+"""
+Storage backends for the state manager.
+
+"memory" keeps runs and CVs in process dicts (single worker). "sqlite"
+keeps them in a SQLite file in WAL mode, so every uvicorn worker sees
+the same runs: a run started on one worker can be polled or streamed
+from any other.
+"""
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+from app.core.config import settings
+from app.database.paths import resolve_data_path
+
+# Applied to the run fields other than steps and graph_data, under the backend's lock
+RunMutation = Callable[[Dict[str, Any]], None]
+
+
+class StateBackend(ABC):
+    """
+    Interface of a state backend.
+
+    Runs are dicts with top-level fields, a "steps" list and "graph_data".
+    Every change increments the run's "revision"; steps record the revision
+    of their last update and "graph_revision" that of the graph.
+
+    The stores are bounded: CVs are evicted least recently used first
+    beyond max_cvs, or once unused for cv_ttl seconds. Runs become
+    evictable once they are finished and persisted to the database, and
+    are then evicted oldest first beyond max_runs, or run_ttl seconds
+    after that. Runs still in progress (or whose graph could not be
+    saved) are kept.
+    """
+
+    # Whether other processes share the state (and may change it)
+    shared = False
+
+    def __init__(self, max_runs: int, run_ttl: int, max_cvs: int, cv_ttl: int):
+        self.max_runs = max_runs
+        self.run_ttl = run_ttl
+        self.max_cvs = max_cvs
+        self.cv_ttl = cv_ttl
+
+    @abstractmethod
+    def store_cv(self, cv_id: str, cv_data: Dict[str, Any]) -> None:
+        """Store CV data."""
+
+    @abstractmethod
+    def get_cv(self, cv_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve CV data (counts as a use)."""
+
+    @abstractmethod
+    def list_cvs(self) -> Dict[str, Dict[str, Any]]:
+        """List all CVs."""
+
+    @abstractmethod
+    def create_run(self, run: Dict[str, Any]) -> None:
+        """Store a new run (with empty steps and no graph)."""
+
+    @abstractmethod
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve a run with its steps and graph."""
+
+    @abstractmethod
+    def update_run(self, run_id: str, mutate: RunMutation) -> Optional[int]:
+        """
+        Change a run's top-level fields.
+
+        Args:
+            run_id: Run identifier
+            mutate: Function changing the run fields in place
+
+        Returns:
+            The run's new revision, or None if the run does not exist
+        """
+
+    @abstractmethod
+    def upsert_step(self, run_id: str, step_log: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Add a step, or replace the step with the same step_id.
+
+        The stored step keeps the started_at of the first version and the
+        finished_at of the first "done" version, and gets a new revision.
+
+        Returns:
+            The stored step, or None if the run does not exist
+        """
+
+    @abstractmethod
+    def set_graph(self, run_id: str, graph_data: Dict[str, Any]) -> Optional[int]:
+        """Set a run's graph; returns the new revision, or None if the run does not exist."""
+
+    @abstractmethod
+    def mark_run_persisted(self, run_id: str) -> None:
+        """Make a finished run evictable (its result is in the database)."""
+
+    @abstractmethod
+    def list_runs(self) -> Dict[str, Dict[str, Any]]:
+        """List all runs."""
+
+    @abstractmethod
+    def get_user_name(self) -> Optional[str]:
+        """Retrieve the user's name."""
+
+    @abstractmethod
+    def set_user_name(self, name: Optional[str]) -> None:
+        """Store the user's name."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop all state (CVs, runs and user name)."""
+
+    @staticmethod
+    def merge_step(step_log: Dict[str, Any], existing_step: Dict[str, Any], revision: int) -> Dict[str, Any]:
+        """Carry the first start/finish times over from the previous version of a step."""
+        step_log["started_at"] = existing_step.get("started_at", step_log["timestamp"])
+        if step_log["status"] == "done":
+            step_log["finished_at"] = existing_step.get("finished_at") or step_log["timestamp"]
+        step_log["revision"] = revision
+        return step_log
+
+
+class MemoryStateBackend(StateBackend):
+    """In-process state (one uvicorn worker)."""
+
+    def __init__(self, max_runs: int, run_ttl: int, max_cvs: int, cv_ttl: int):
+        super().__init__(max_runs, run_ttl, max_cvs, cv_ttl)
+        self.cv_store: Dict[str, Dict[str, Any]] = OrderedDict()
+        self.run_store: Dict[str, Dict[str, Any]] = {}
+        self.user_name: Optional[str] = None
+        self._cv_last_used: Dict[str, float] = {}
+        self._persisted_runs: Dict[str, float] = OrderedDict()  # run_id -> persisted at, oldest first
+        self._step_index: Dict[str, Dict[str, int]] = {}  # run_id -> step_id -> position in steps
+        self._lock = threading.RLock()
+
+    # CV Management
+    def store_cv(self, cv_id: str, cv_data: Dict[str, Any]) -> None:
+        with self._lock:
+            self.cv_store[cv_id] = cv_data
+            self.cv_store.move_to_end(cv_id)
+            self._cv_last_used[cv_id] = time.time()
+            self._evict_cvs()
+
+    def get_cv(self, cv_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            cv_data = self.cv_store.get(cv_id)
+            if cv_data is not None:
+                self.cv_store.move_to_end(cv_id)
+                self._cv_last_used[cv_id] = time.time()
+            return cv_data
+
+    def list_cvs(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return dict(self.cv_store)
+
+    def _evict_cvs(self) -> None:
+        """Drop least recently used CVs beyond capacity or unused for longer than the TTL."""
+        expired_before = time.time() - self.cv_ttl
+        while self.cv_store:
+            oldest = next(iter(self.cv_store))
+            if len(self.cv_store) <= self.max_cvs and self._cv_last_used[oldest] > expired_before:
+                break
+            del self.cv_store[oldest]
+            del self._cv_last_used[oldest]
+
+    # Run Management
+    def create_run(self, run: Dict[str, Any]) -> None:
+        with self._lock:
+            self._evict_runs()
+            self._step_index[run["run_id"]] = {}
+            self.run_store[run["run_id"]] = run
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        # A consistent snapshot: a reader never sees a revision without its
+        # step or graph. Steps are replaced rather than mutated, so copying
+        # the list is enough
+        with self._lock:
+            run = self.run_store.get(run_id)
+            if run is None:
+                return None
+            return {**run, "steps": list(run["steps"])}
+
+    def update_run(self, run_id: str, mutate: RunMutation) -> Optional[int]:
+        with self._lock:
+            run = self.run_store.get(run_id)
+            if run is None:
+                return None
+            mutate(run)
+            run["revision"] += 1
+            return run["revision"]
+
+    def upsert_step(self, run_id: str, step_log: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            run = self.run_store.get(run_id)
+            if run is None:
+                return None
+
+            # Check if step already exists
+            steps = run["steps"]
+            step_index = self._step_index.setdefault(run_id, {})
+            existing_step_index = step_index.get(step_log["step_id"])
+            existing_step = steps[existing_step_index] if existing_step_index is not None else {}
+
+            revision = run["revision"] + 1
+            self.merge_step(step_log, existing_step, revision)
+
+            if existing_step_index is not None:
+                # Update existing step
+                steps[existing_step_index] = step_log
+            else:
+                # Append new step
+                step_index[step_log["step_id"]] = len(steps)
+                steps.append(step_log)
+
+            # Bump the revision only once the step is stored
+            run["revision"] = revision
+            return step_log
+
+    def set_graph(self, run_id: str, graph_data: Dict[str, Any]) -> Optional[int]:
+        with self._lock:
+            run = self.run_store.get(run_id)
+            if run is None:
+                return None
+            revision = run["revision"] + 1
+            run["graph_data"] = graph_data
+            run["graph_revision"] = revision
+            # Bump the revision only once the graph is stored
+            run["revision"] = revision
+            return revision
+
+    def mark_run_persisted(self, run_id: str) -> None:
+        with self._lock:
+            if run_id in self.run_store:
+                self._persisted_runs[run_id] = time.time()
+            self._evict_runs()
+
+    def _evict_runs(self) -> None:
+        """Drop persisted runs, oldest first, beyond capacity or older than the TTL."""
+        expired_before = time.time() - self.run_ttl
+        while self._persisted_runs:
+            oldest, persisted_at = next(iter(self._persisted_runs.items()))
+            if len(self.run_store) <= self.max_runs and persisted_at > expired_before:
+                break
+            del self._persisted_runs[oldest]
+            self.run_store.pop(oldest, None)
+            self._step_index.pop(oldest, None)
+
+    def list_runs(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {run_id: {**run, "steps": list(run["steps"])} for run_id, run in self.run_store.items()}
+
+    # User Management
+    def get_user_name(self) -> Optional[str]:
+        return self.user_name
+
+    def set_user_name(self, name: Optional[str]) -> None:
+        self.user_name = name
+
+    def clear(self) -> None:
+        with self._lock:
+            self.cv_store.clear()
+            self._cv_last_used.clear()
+            self.run_store.clear()
+            self._persisted_runs.clear()
+            self._step_index.clear()
+            self.user_name = None
+
+
+class SQLiteStateBackend(StateBackend):
+    """
+    State shared by all workers through a SQLite file in WAL mode.
+
+    Readers never block the pipeline's writes. Every read-modify-write runs
+    in an immediate transaction, so revisions stay monotonic across
+    processes. Runs returned by get_run are copies: changes must go
+    through the backend.
+    """
+
+    shared = True
+
+    def __init__(self, db_path: str, max_runs: int, run_ttl: int, max_cvs: int, cv_ttl: int):
+        """
+        Initialize the backend and create its tables if needed.
+
+        Args:
+            db_path: Path of the SQLite file
+            max_runs, run_ttl, max_cvs, cv_ttl: Eviction bounds (see StateBackend)
+        """
+        super().__init__(max_runs, run_ttl, max_cvs, cv_ttl)
+        self.db_path = db_path
+        self._init_db()
+
+    def _init_db(self) -> None:
+        """Create the state tables."""
+        with self.get_connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS state_runs (
+                    run_id TEXT PRIMARY KEY,
+                    fields TEXT NOT NULL,
+                    graph_data TEXT,
+                    revision INTEGER NOT NULL,
+                    graph_revision INTEGER,
+                    persisted_at REAL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS state_run_steps (
+                    run_id TEXT NOT NULL,
+                    step_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    step TEXT NOT NULL,
+                    PRIMARY KEY (run_id, step_id)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS state_cvs (
+                    cv_id TEXT PRIMARY KEY,
+                    cv_data TEXT NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS state_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_state_runs_persisted ON state_runs (persisted_at)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_state_cvs_last_used ON state_cvs (last_used)"
+            )
+
+    @contextmanager
+    def get_connection(self):
+        """Context manager for state database connections (autocommit, see transaction)."""
+        conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+        try:
+            conn.execute("PRAGMA synchronous=NORMAL")
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def transaction(self):
+        """Connection inside an immediate (write-locked) transaction, committed on success."""
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    # CV Management
+    def store_cv(self, cv_id: str, cv_data: Dict[str, Any]) -> None:
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO state_cvs (cv_id, cv_data, last_used) VALUES (?, ?, ?)",
+                (cv_id, json.dumps(cv_data), time.time())
+            )
+            self._evict_cvs(conn)
+
+    def get_cv(self, cv_id: str) -> Optional[Dict[str, Any]]:
+        with self.get_connection() as conn:
+            row = conn.execute("SELECT cv_data FROM state_cvs WHERE cv_id = ?", (cv_id,)).fetchone()
+            if not row:
+                return None
+            conn.execute("UPDATE state_cvs SET last_used = ? WHERE cv_id = ?", (time.time(), cv_id))
+            return json.loads(row[0])
+
+    def list_cvs(self) -> Dict[str, Dict[str, Any]]:
+        with self.get_connection() as conn:
+            rows = conn.execute("SELECT cv_id, cv_data FROM state_cvs ORDER BY last_used").fetchall()
+            return {cv_id: json.loads(cv_data) for cv_id, cv_data in rows}
+
+    def _evict_cvs(self, conn: sqlite3.Connection) -> None:
+        """Drop least recently used CVs beyond capacity or unused for longer than the TTL."""
+        conn.execute("DELETE FROM state_cvs WHERE last_used <= ?", (time.time() - self.cv_ttl,))
+        conn.execute(
+            "DELETE FROM state_cvs WHERE cv_id IN ("
+            "SELECT cv_id FROM state_cvs ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_cvs,)
+        )
+
+    # Run Management
+    @staticmethod
+    def _split_run(run: Dict[str, Any]) -> Dict[str, Any]:
+        """Top-level fields of a run, without steps, graph and revisions (stored in columns)."""
+        excluded = ("steps", "graph_data", "revision", "graph_revision")
+        return {key: value for key, value in run.items() if key not in excluded}
+
+    def create_run(self, run: Dict[str, Any]) -> None:
+        with self.transaction() as conn:
+            self._evict_runs(conn)
+            conn.execute("DELETE FROM state_run_steps WHERE run_id = ?", (run["run_id"],))
+            conn.execute(
+                "INSERT OR REPLACE INTO state_runs (run_id, fields, graph_data, revision, graph_revision, persisted_at) "
+                "VALUES (?, ?, NULL, ?, NULL, NULL)",
+                (run["run_id"], json.dumps(self._split_run(run)), run.get("revision", 0))
+            )
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        with self.get_connection() as conn:
+            # One read transaction, so steps and graph match the revision
+            conn.execute("BEGIN")
+            row = conn.execute(
+                "SELECT fields, graph_data, revision, graph_revision FROM state_runs WHERE run_id = ?",
+                (run_id,)
+            ).fetchone()
+            if not row:
+                conn.execute("COMMIT")
+                return None
+
+            steps = conn.execute(
+                "SELECT step FROM state_run_steps WHERE run_id = ? ORDER BY position",
+                (run_id,)
+            ).fetchall()
+            conn.execute("COMMIT")
+
+        fields, graph_data, revision, graph_revision = row
+        return {
+            **json.loads(fields),
+            "steps": [json.loads(step) for (step,) in steps],
+            "graph_data": json.loads(graph_data) if graph_data else None,
+            "revision": revision,
+            "graph_revision": graph_revision
+        }
+
+    def _next_revision(self, conn: sqlite3.Connection, run_id: str) -> Optional[int]:
+        """Increment a run's revision inside the current transaction."""
+        updated = conn.execute(
+            "UPDATE state_runs SET revision = revision + 1 WHERE run_id = ?", (run_id,)
+        ).rowcount
+        if not updated:
+            return None
+        row = conn.execute("SELECT revision FROM state_runs WHERE run_id = ?", (run_id,)).fetchone()
+        return row[0] if row else None
+
+    def update_run(self, run_id: str, mutate: RunMutation) -> Optional[int]:
+        with self.transaction() as conn:
+            row = conn.execute("SELECT fields FROM state_runs WHERE run_id = ?", (run_id,)).fetchone()
+            if not row:
+                return None
+
+            fields = json.loads(row[0])
+            mutate(fields)
+            conn.execute(
+                "UPDATE state_runs SET fields = ? WHERE run_id = ?",
+                (json.dumps(self._split_run(fields)), run_id)
+            )
+            return self._next_revision(conn, run_id)
+
+    def upsert_step(self, run_id: str, step_log: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self.transaction() as conn:
+            revision = self._next_revision(conn, run_id)
+            if revision is None:
+                return None
+
+            row = conn.execute(
+                "SELECT step, position FROM state_run_steps WHERE run_id = ? AND step_id = ?",
+                (run_id, step_log["step_id"])
+            ).fetchone()
+
+            if row:
+                existing_step, position = json.loads(row[0]), row[1]
+            else:
+                existing_step = {}
+                position = conn.execute(
+                    "SELECT COALESCE(MAX(position) + 1, 0) FROM state_run_steps WHERE run_id = ?",
+                    (run_id,)
+                ).fetchone()[0]
+
+            self.merge_step(step_log, existing_step, revision)
+            conn.execute(
+                "INSERT OR REPLACE INTO state_run_steps (run_id, step_id, position, step) VALUES (?, ?, ?, ?)",
+                (run_id, step_log["step_id"], position, json.dumps(step_log))
+            )
+            return step_log
+
+    def set_graph(self, run_id: str, graph_data: Dict[str, Any]) -> Optional[int]:
+        with self.transaction() as conn:
+            revision = self._next_revision(conn, run_id)
+            if revision is None:
+                return None
+            conn.execute(
+                "UPDATE state_runs SET graph_data = ?, graph_revision = ? WHERE run_id = ?",
+                (json.dumps(graph_data), revision, run_id)
+            )
+            return revision
+
+    def mark_run_persisted(self, run_id: str) -> None:
+        with self.transaction() as conn:
+            conn.execute("UPDATE state_runs SET persisted_at = ? WHERE run_id = ?", (time.time(), run_id))
+            self._evict_runs(conn)
+
+    def _evict_runs(self, conn: sqlite3.Connection) -> None:
+        """Drop persisted runs, oldest first, beyond capacity or older than the TTL."""
+        conn.execute(
+            "DELETE FROM state_runs WHERE persisted_at IS NOT NULL AND persisted_at <= ?",
+            (time.time() - self.run_ttl,)
+        )
+
+        excess = conn.execute("SELECT COUNT(*) FROM state_runs").fetchone()[0] - self.max_runs
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM state_runs WHERE run_id IN ("
+                "SELECT run_id FROM state_runs WHERE persisted_at IS NOT NULL ORDER BY persisted_at LIMIT ?)",
+                (excess,)
+            )
+
+        conn.execute(
+            "DELETE FROM state_run_steps WHERE run_id NOT IN (SELECT run_id FROM state_runs)"
+        )
+
+    def list_runs(self) -> Dict[str, Dict[str, Any]]:
+        with self.get_connection() as conn:
+            run_ids = [run_id for (run_id,) in conn.execute("SELECT run_id FROM state_runs")]
+        runs = {run_id: self.get_run(run_id) for run_id in run_ids}
+        return {run_id: run for run_id, run in runs.items() if run}
+
+    # User Management
+    def get_user_name(self) -> Optional[str]:
+        with self.get_connection() as conn:
+            row = conn.execute("SELECT value FROM state_meta WHERE key = 'user_name'").fetchone()
+            return row[0] if row else None
+
+    def set_user_name(self, name: Optional[str]) -> None:
+        with self.get_connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO state_meta (key, value) VALUES ('user_name', ?)",
+                (name,)
+            )
+
+    def clear(self) -> None:
+        with self.transaction() as conn:
+            for table in ("state_runs", "state_run_steps", "state_cvs", "state_meta"):
+                conn.execute(f"DELETE FROM {table}")
+
+
+def create_state_backend() -> StateBackend:
+    """
+    Build the state backend selected by the STATE_BACKEND setting.
+
+    Returns:
+        MemoryStateBackend or SQLiteStateBackend
+    """
+    bounds = {
+        "max_runs": settings.STATE_MAX_RUNS,
+        "run_ttl": settings.STATE_RUN_TTL,
+        "max_cvs": settings.STATE_MAX_CVS,
+        "cv_ttl": settings.STATE_CV_TTL
+    }
+
+    if settings.STATE_BACKEND == "sqlite":
+        return SQLiteStateBackend(db_path=resolve_data_path(settings.STATE_DB_PATH), **bounds)
+
+    return MemoryStateBackend(**bounds)
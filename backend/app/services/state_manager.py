@@ -1,50 +1,105 @@
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional
 from datetime import datetime
+from app.services.state_backends import StateBackend, create_state_backend
+
+# Called with (run_id, event, data) whenever a run changes
+RunListener = Callable[[str, str, Dict[str, Any]], None]
 
 
 class StateManager:
-    """In-memory state manager for hackathon purposes."""
+    """
+    State manager for CVs and agent runs.
+
+    Storage is delegated to a backend selected by the STATE_BACKEND setting
+    (see services.state_backends): in process memory, or a SQLite file
+    shared by all uvicorn workers. Listeners are notified of the changes
+    made in this process.
+    """
 
-    def __init__(self):
-        self.cv_store: Dict[str, Dict[str, Any]] = {}
-        self.run_store: Dict[str, Dict[str, Any]] = {}
-        self.user_name: Optional[str] = None
+    def __init__(self, backend: Optional[StateBackend] = None):
+        self.backend = backend or create_state_backend()
+        self.run_listeners: List[RunListener] = []
 
     # CV Management
     def store_cv(self, cv_id: str, cv_data: Dict[str, Any]) -> None:
         """Store CV data."""
-        self.cv_store[cv_id] = cv_data
+        self.backend.store_cv(cv_id, cv_data)
 
     def get_cv(self, cv_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve CV data."""
-        return self.cv_store.get(cv_id)
+        return self.backend.get_cv(cv_id)
 
     def list_cvs(self) -> Dict[str, Dict[str, Any]]:
         """List all CVs."""
-        return self.cv_store
+        return self.backend.list_cvs()
+
+    # Run Listeners
+    def add_run_listener(self, listener: RunListener) -> None:
+        """
+        Register a callback notified of run changes.
+
+        Events are "step" (the step log), "status" ({"status"}), "graph"
+        (the graph data) and "abstracts" ({"abstracts_status"}).
+        Listeners are called synchronously from the thread making the
+        change, so they must not block.
+        """
+        self.run_listeners.append(listener)
+
+    def remove_run_listener(self, listener: RunListener) -> None:
+        """Unregister a run listener."""
+        if listener in self.run_listeners:
+            self.run_listeners.remove(listener)
+
+    def _notify(self, run_id: str, event: str, data: Dict[str, Any]) -> None:
+        """Notify run listeners of a change (a failing listener never breaks the run)."""
+        for listener in list(self.run_listeners):
+            try:
+                listener(run_id, event, data)
+            except Exception as e:
+                print(f"Run listener failed for run {run_id}: {str(e)}")
 
     # Run Management
-    def create_run(self, run_id: str, query: str, cv_id: Optional[str] = None, max_nodes: int = 10) -> None:
-        """Initialize a new agent run."""
-        self.run_store[run_id] = {
+    def create_run(
+        self,
+        run_id: str,
+        query: str,
+        cv_id: Optional[str] = None,
+        max_nodes: int = 10,
+        pacing: str = "fast",
+        status: str = "running"
+    ) -> None:
+        """
+        Initialize a new agent run (pacing: "fast" or "presentation", see services.pacing;
+        status: "queued" while it waits for a scheduler worker, then "running").
+
+        Every change to the run increments its revision; each step records
+        the revision of its last update and graph_revision that of the
+        graph, so clients can fetch only what changed since a revision.
+        """
+        self.backend.create_run({
             "run_id": run_id,
             "query": query,
             "cv_id": cv_id,
             "max_nodes": max_nodes,
-            "status": "running",
+            "pacing": pacing,
+            "status": status,
             "steps": [],
             "graph_data": None,
+            "metrics": None,
+            "abstracts_status": None,
+            "revision": 0,
+            "graph_revision": None,
             "created_at": datetime.utcnow().isoformat()
-        }
+        })
 
     def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
-        """Retrieve run state."""
-        return self.run_store.get(run_id)
+        """Retrieve a consistent snapshot of run state (change it through the setters)."""
+        return self.backend.get_run(run_id)
 
     def update_run_status(self, run_id: str, status: str) -> None:
         """Update run status."""
-        if run_id in self.run_store:
-            self.run_store[run_id]["status"] = status
+        if self.backend.update_run(run_id, lambda run: run.update(status=status)) is not None:
+            self._notify(run_id, "status", {"status": status})
 
     def add_run_step(
         self,
@@ -63,7 +118,9 @@ class StateManager:
         Add or update a step log in a run.
 
         If a step with the same step_id already exists, it will be updated.
-        Otherwise, a new step will be appended.
+        Otherwise, a new step will be appended. The step keeps the time it
+        was first added (started_at) and the time it first became done
+        (finished_at), which the pacing view relies on.
 
         Args:
             run_id: Run identifier
@@ -77,56 +134,72 @@ class StateManager:
             professors: For "extraction" step: list of BasicProfessor objects
             sources: For "extraction" step: list of Source objects
         """
-        if run_id in self.run_store:
-            step_log = {
-                "step_id": step_id,
-                "step_type": step_type,
-                "message": message,
-                "status": status,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-
-            # Add step-specific fields only if provided
-            if details is not None:
-                step_log["details"] = details
-            if filters is not None:
-                step_log["filters"] = filters
-            if papers is not None:
-                step_log["papers"] = papers
-            if professors is not None:
-                step_log["professors"] = professors
-            if sources is not None:
-                step_log["sources"] = sources
-
-            # Check if step already exists
-            steps = self.run_store[run_id]["steps"]
-            existing_step_index = next((i for i, s in enumerate(steps) if s["step_id"] == step_id), None)
-
-            if existing_step_index is not None:
-                # Update existing step
-                steps[existing_step_index] = step_log
-            else:
-                # Append new step
-                steps.append(step_log)
+        step_log = {
+            "step_id": step_id,
+            "step_type": step_type,
+            "message": message,
+            "status": status,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+        # Add step-specific fields only if provided
+        if details is not None:
+            step_log["details"] = details
+        if filters is not None:
+            step_log["filters"] = filters
+        if papers is not None:
+            step_log["papers"] = papers
+        if professors is not None:
+            step_log["professors"] = professors
+        if sources is not None:
+            step_log["sources"] = sources
+
+        stored_step = self.backend.upsert_step(run_id, step_log)
+        if stored_step is not None:
+            self._notify(run_id, "step", stored_step)
 
     def set_run_graph(self, run_id: str, graph_data: Dict[str, Any]) -> None:
         """Set the graph data for a completed run."""
-        if run_id in self.run_store:
-            self.run_store[run_id]["graph_data"] = graph_data
+        if self.backend.set_graph(run_id, graph_data) is not None:
+            self._notify(run_id, "graph", graph_data)
+
+    def set_run_metrics(self, run_id: str, metrics: Dict[str, Any]) -> None:
+        """Merge metrics (e.g. time spent throttled) into a run."""
+        def merge(run: Dict[str, Any]) -> None:
+            run["metrics"] = {**(run.get("metrics") or {}), **metrics}
+
+        self.backend.update_run(run_id, merge)
+
+    def set_run_abstracts_status(self, run_id: str, status: str) -> None:
+        """Set whether deferred abstracts are still being resolved ("pending" or "resolved")."""
+        if self.backend.update_run(run_id, lambda run: run.update(abstracts_status=status)) is not None:
+            self._notify(run_id, "abstracts", {"abstracts_status": status})
+
+    def mark_run_persisted(self, run_id: str) -> None:
+        """
+        Mark a finished run as saved to the database, making it evictable.
+
+        Args:
+            run_id: Run identifier
+        """
+        self.backend.mark_run_persisted(run_id)
 
+    def clear(self) -> None:
+        """Drop all state (CVs, runs and user name)."""
+        self.backend.clear()
 
     def list_runs(self) -> Dict[str, Dict[str, Any]]:
         """List all runs."""
-        return self.run_store
+        return self.backend.list_runs()
 
     # User Management
     def set_user_name(self, name: str) -> None:
-        """Store the user's name (in-memory only)."""
-        self.user_name = name
+        """Store the user's name."""
+        self.backend.set_user_name(name)
 
     def get_user_name(self) -> Optional[str]:
         """Retrieve the user's name."""
-        return self.user_name
+        return self.backend.get_user_name()
 
 
 # Global state manager instance
@@ -3,13 +3,26 @@ Utility functions for fetching paper abstracts from OpenAlex and Semantic Schola
 """
 import requests
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List, Tuple
+from app.utils.abstract_store import abstract_store
+from app.utils.http_resilience import resilient_request
+
+SEMANTIC_SCHOLAR_URL = "https://api.semanticscholar.org/graph/v1"
+SEMANTIC_SCHOLAR_BATCH_SIZE = 500  # Max IDs per POST /paper/batch
+
+# Reused across calls so connections are kept alive
+semantic_scholar_session = requests.Session()
 
 
 def rebuild_abstract(inverted_index: Optional[Dict[str, list]]) -> Optional[str]:
     """
     Rebuild abstract text from OpenAlex inverted index format.
 
+    Well-formed indexes (every position from 0 to N-1 used exactly once)
+    are rebuilt in a single pass into a preallocated list; anything else
+    (gaps, repeated, missing or negative positions, malformed values) goes through
+    `_rebuild_abstract_legacy`, so the output is unchanged in every case.
+
     Args:
         inverted_index: Dict mapping words to list of positions
 
@@ -19,6 +32,44 @@ def rebuild_abstract(inverted_index: Optional[Dict[str, list]]) -> Optional[str]
     if not inverted_index:
         return None
 
+    try:
+        # A word without positions makes the legacy path return None
+        if not all(inverted_index.values()):
+            return _rebuild_abstract_legacy(inverted_index)
+
+        # One slot per position: an index without gaps or repeats fills every slot
+        words = [None] * sum(map(len, inverted_index.values()))
+
+        for word, positions in inverted_index.items():
+            for idx in positions:
+                if idx < 0:
+                    # Negative positions wrap around differently in the legacy list
+                    return _rebuild_abstract_legacy(inverted_index)
+                words[idx] = word
+
+        # An empty slot means a gap or a repeated position
+        if None in words:
+            return _rebuild_abstract_legacy(inverted_index)
+
+        return " ".join(words)
+    except Exception:
+        # Out-of-range or non-integer positions, non-string words, ...
+        return _rebuild_abstract_legacy(inverted_index)
+
+
+def _rebuild_abstract_legacy(inverted_index: Dict[str, list]) -> Optional[str]:
+    """
+    Original two-pass reconstruction, kept for irregular indexes.
+
+    Gaps are rendered as empty words, and on repeated positions the word
+    seen last wins.
+
+    Args:
+        inverted_index: Dict mapping words to list of positions
+
+    Returns:
+        Reconstructed abstract text or None
+    """
     try:
         # Find the maximum index to create array of correct size
         max_idx = max(max(positions) for positions in inverted_index.values())
@@ -34,6 +85,11 @@ def rebuild_abstract(inverted_index: Optional[Dict[str, list]]) -> Optional[str]
         return None
 
 
+def clean_doi(doi: str) -> str:
+    """Strip the https://doi.org/ prefix from a DOI, if present."""
+    return doi.replace("https://doi.org/", "")
+
+
 def fetch_abstract_from_semantic_scholar(doi: str) -> Optional[str]:
     """
     Fetch abstract from Semantic Scholar API using DOI.
@@ -44,14 +100,16 @@ def fetch_abstract_from_semantic_scholar(doi: str) -> Optional[str]:
     Returns:
         Abstract text or None
     """
-    # Clean DOI (remove https://doi.org/ prefix if present)
-    doi_clean = doi.replace("https://doi.org/", "")
-
-    url = f"https://api.semanticscholar.org/graph/v1/paper/DOI:{doi_clean}?fields=abstract"
+    url = f"{SEMANTIC_SCHOLAR_URL}/paper/DOI:{clean_doi(doi)}"
 
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
+        response = resilient_request(
+            semantic_scholar_session,
+            "GET",
+            url,
+            params={"fields": "abstract"},
+            timeout=10
+        )
 
         data = response.json()
         return data.get("abstract")
@@ -60,55 +118,182 @@ def fetch_abstract_from_semantic_scholar(doi: str) -> Optional[str]:
         return None
 
 
-def get_paper_abstract(work: Dict[str, Any]) -> Optional[str]:
+def fetch_abstracts_from_semantic_scholar(
+    dois: Iterable[str],
+    delay: float = 0.0
+) -> Dict[str, Optional[str]]:
+    """
+    Fetch abstracts for many DOIs with Semantic Scholar's batch endpoint.
+
+    Sends one request per SEMANTIC_SCHOLAR_BATCH_SIZE DOIs instead of one
+    request per paper.
+
+    Args:
+        dois: DOIs (full URLs or bare IDs); duplicates are looked up once
+        delay: Pause in seconds between batch requests (to be polite)
+
+    Returns:
+        Dict mapping each DOI (as given) to its abstract, or None when
+        Semantic Scholar has none. DOIs from a failed batch are left out.
+
+    API: POST /paper/batch?fields=abstract {"ids": ["DOI:...", ...]}
     """
-    Get abstract for a paper, trying OpenAlex first, then Semantic Scholar.
+    unique_dois = list(dict.fromkeys(doi for doi in dois if doi))
+    url = f"{SEMANTIC_SCHOLAR_URL}/paper/batch"
+    abstracts: Dict[str, Optional[str]] = {}
+
+    for start in range(0, len(unique_dois), SEMANTIC_SCHOLAR_BATCH_SIZE):
+        if start and delay:
+            time.sleep(delay)
+
+        chunk = unique_dois[start:start + SEMANTIC_SCHOLAR_BATCH_SIZE]
+
+        try:
+            response = resilient_request(
+                semantic_scholar_session,
+                "POST",
+                url,
+                params={"fields": "abstract"},
+                json={"ids": [f"DOI:{clean_doi(doi)}" for doi in chunk]},
+                timeout=30
+            )
+            entries = response.json()
+
+        except (requests.RequestException, ValueError) as e:
+            print(f"Error fetching {len(chunk)} abstracts from Semantic Scholar: {e}")
+            continue
+
+        # Entries come back in request order, null for unknown papers
+        for doi, entry in zip(chunk, entries):
+            abstracts[doi] = (entry or {}).get("abstract")
+
+    return abstracts
+
+
+def resolve_paper_abstract(work: Dict[str, Any], fetch_remote: bool = True) -> Tuple[Optional[str], str]:
+    """
+    Resolve a paper's abstract: abstract store, then OpenAlex, then Semantic Scholar.
+
+    Abstracts rebuilt or fetched here are saved to the abstract store, so
+    later runs (and other users) get them with a single lookup.
 
     Args:
         work: OpenAlex work object (JSON)
+        fetch_remote: Whether to fall back to Semantic Scholar (one request);
+            pass False when missing abstracts are resolved later in batch
 
     Returns:
-        Abstract text or None
+        Tuple of (abstract or None, status): "ready", "pending" (may still be
+        found on Semantic Scholar) or "missing"
     """
+    work_id = work.get("id")
+    doi = work.get("doi")
+
+    if abstract_store:
+        hit, abstract = abstract_store.get(work_id, doi)
+        if hit:
+            return abstract, "ready" if abstract else "missing"
+
     # Try to rebuild from OpenAlex inverted index
     abstract = rebuild_abstract(work.get("abstract_inverted_index"))
 
-    if abstract:
-        return abstract
-
     # If no abstract from OpenAlex, try Semantic Scholar using DOI
-    doi = work.get("doi")
-    if doi:
+    if not abstract and doi:
+        if not fetch_remote:
+            return None, "pending"
         abstract = fetch_abstract_from_semantic_scholar(doi)
-        if abstract:
-            return abstract
+
+    if abstract:
+        if abstract_store:
+            abstract_store.put(work_id, doi, abstract)
+        return abstract, "ready"
+
+    # Without a DOI there is nowhere else to look: remember that
+    if not doi and abstract_store:
+        abstract_store.put(work_id, None, None)
 
     # No abstract available
-    return None
+    return None, "missing"
+
+
+def get_paper_abstract(work: Dict[str, Any], fetch_remote: bool = True) -> Optional[str]:
+    """
+    Get abstract for a paper, trying the abstract store and OpenAlex first, then Semantic Scholar.
+
+    Args:
+        work: OpenAlex work object (JSON)
+        fetch_remote: Whether to fall back to Semantic Scholar (one request);
+            pass False when missing abstracts are resolved later in batch
+
+    Returns:
+        Abstract text or None
+    """
+    abstract, _ = resolve_paper_abstract(work, fetch_remote=fetch_remote)
+    return abstract
+
+
+def fill_missing_abstracts(papers: List[Dict[str, Any]]) -> int:
+    """
+    Fill missing abstracts of mapped papers with batched Semantic Scholar lookups.
+
+    Papers are Paper dicts (DOI in "link"); they are updated in place, and
+    the "abstract_status" of every paper looked up becomes "ready" or "missing".
+    Semantic Scholar's answers (including "no abstract") go to the abstract store.
+
+    Args:
+        papers: Paper dicts, e.g. every preview and professor paper of a run
+
+    Returns:
+        Number of abstracts filled
+    """
+    missing = [paper for paper in papers if not paper.get("abstract") and paper.get("link")]
+    if not missing:
+        return 0
+
+    abstracts = fetch_abstracts_from_semantic_scholar(paper["link"] for paper in missing)
+
+    filled = 0
+    for paper in missing:
+        abstract = abstracts.get(paper["link"])
+        if abstract_store and paper["link"] in abstracts:
+            abstract_store.put(paper.get("id"), paper["link"], abstract)
+
+        if abstract:
+            paper["abstract"] = abstract
+            paper["abstract_status"] = "ready"
+            filled += 1
+        else:
+            paper["abstract_status"] = "missing"
+
+    return filled
 
 
 def enrich_papers_with_abstracts(papers: list[Dict[str, Any]], delay: float = 0.5) -> list[Dict[str, Any]]:
     """
     Enrich a list of OpenAlex papers with abstracts.
 
+    Abstracts are rebuilt from OpenAlex where possible; the remaining DOIs
+    are resolved with batched Semantic Scholar requests.
+
     This function modifies papers in-place and also returns them.
 
     Args:
         papers: List of OpenAlex work objects
-        delay: Delay in seconds between Semantic Scholar API calls (to be polite)
+        delay: Delay in seconds between Semantic Scholar batch requests (to be polite)
 
     Returns:
         List of papers with abstracts populated
     """
     for paper in papers:
-        abstract = get_paper_abstract(paper)
-
-        if abstract:
-            paper["abstract"] = abstract
-        else:
-            paper["abstract"] = None
+        paper["abstract"] = get_paper_abstract(paper, fetch_remote=False)
 
-        # Small delay to be polite to external APIs
-        time.sleep(delay)
+    missing_dois = [paper["doi"] for paper in papers if not paper["abstract"] and paper.get("doi")]
+    if missing_dois:
+        abstracts = fetch_abstracts_from_semantic_scholar(missing_dois, delay=delay)
+        for paper in papers:
+            if not paper["abstract"] and paper.get("doi") in abstracts:
+                paper["abstract"] = abstracts[paper["doi"]]
+                if abstract_store:
+                    abstract_store.put(paper.get("id"), paper["doi"], paper["abstract"])
 
     return papers
@@ -0,0 +1,254 @@
+"""
+Persistent, content-addressed store of paper abstracts shared across runs.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+from app.core.config import settings
+from app.database.paths import resolve_data_path
+
+
+class AbstractStore:
+    """
+    SQLite-backed abstract store.
+
+    Abstract texts are stored once, zlib-compressed and addressed by their
+    SHA-256 digest; OpenAlex work IDs and DOIs are keys pointing at a
+    digest, so the same paper reached through either ID (or shared by
+    several runs and users) costs one lookup and one copy.
+
+    Papers known to have no abstract are remembered too (negative cache,
+    with a TTL so they are eventually retried). Once the compressed texts
+    exceed `max_bytes`, the least recently read ones are evicted.
+    """
+
+    def __init__(self, db_path: str, negative_ttl: int, max_bytes: int):
+        """
+        Initialize the store and create its tables if needed.
+
+        Args:
+            db_path: Path of the SQLite file
+            negative_ttl: Seconds a "no abstract available" entry stays valid
+            max_bytes: Upper bound for the total size of compressed abstracts
+        """
+        self.db_path = db_path
+        self.negative_ttl = negative_ttl
+        self.max_bytes = max_bytes
+        self._bytes_since_eviction = 0
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _init_db(self) -> None:
+        """Create the store tables."""
+        with self.get_connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS abstract_keys (
+                    key TEXT PRIMARY KEY,
+                    digest TEXT,
+                    expires_at REAL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS abstract_blobs (
+                    digest TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_abstract_blobs_accessed ON abstract_blobs (accessed_at)"
+            )
+            conn.commit()
+
+    @contextmanager
+    def get_connection(self):
+        """Context manager for store database connections."""
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_keys(work_id: Optional[str] = None, doi: Optional[str] = None) -> List[str]:
+        """
+        Build the store keys of a paper.
+
+        Args:
+            work_id: OpenAlex work ID or URL (e.g. "https://openalex.org/W123")
+            doi: DOI, with or without the https://doi.org/ prefix
+
+        Returns:
+            Keys like ["work:W123", "doi:10.1234/abc"] (DOIs are case-insensitive)
+        """
+        keys = []
+        if work_id:
+            keys.append(f"work:{work_id.rstrip('/').split('/')[-1]}")
+        if doi:
+            keys.append(f"doi:{doi.replace('https://doi.org/', '').strip().lower()}")
+        return keys
+
+    def get(self, work_id: Optional[str] = None, doi: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+        """
+        Look up a paper's abstract by work ID and/or DOI.
+
+        Args:
+            work_id: OpenAlex work ID or URL
+            doi: DOI of the paper
+
+        Returns:
+            Tuple of (hit, abstract). A hit with abstract None means the
+            paper is known to have no abstract.
+        """
+        keys = self.make_keys(work_id, doi)
+        if not keys:
+            return False, None
+
+        now = time.time()
+
+        try:
+            with self.get_connection() as conn:
+                placeholders = ",".join("?" for _ in keys)
+                rows = conn.execute(
+                    f"SELECT digest, expires_at FROM abstract_keys WHERE key IN ({placeholders})",
+                    keys
+                ).fetchall()
+
+                known_missing = False
+                for digest, expires_at in rows:
+                    if digest is None:
+                        known_missing = known_missing or (expires_at or 0) > now
+                        continue
+
+                    row = conn.execute(
+                        "SELECT body FROM abstract_blobs WHERE digest = ?", (digest,)
+                    ).fetchone()
+                    if row:
+                        conn.execute(
+                            "UPDATE abstract_blobs SET accessed_at = ? WHERE digest = ?",
+                            (now, digest)
+                        )
+                        conn.commit()
+                        return True, zlib.decompress(row[0]).decode("utf-8")
+
+        except (sqlite3.Error, zlib.error) as e:
+            print(f"Abstract store read failed: {e}")
+            return False, None
+
+        return (True, None) if known_missing else (False, None)
+
+    def put(self, work_id: Optional[str], doi: Optional[str], abstract: Optional[str]) -> None:
+        """
+        Store a paper's abstract under its work ID and DOI.
+
+        Args:
+            work_id: OpenAlex work ID or URL
+            doi: DOI of the paper
+            abstract: Abstract text, or None if the paper has no abstract
+        """
+        keys = self.make_keys(work_id, doi)
+        if not keys:
+            return
+
+        now = time.time()
+
+        try:
+            with self.get_connection() as conn:
+                if abstract:
+                    text = abstract.encode("utf-8")
+                    digest = hashlib.sha256(text).hexdigest()
+                    body = zlib.compress(text)
+
+                    inserted = conn.execute(
+                        "INSERT OR IGNORE INTO abstract_blobs (digest, body, size, accessed_at) VALUES (?, ?, ?, ?)",
+                        (digest, body, len(body), now)
+                    ).rowcount
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO abstract_keys (key, digest, expires_at) VALUES (?, ?, NULL)",
+                        [(key, digest) for key in keys]
+                    )
+                    written = len(body) if inserted else 0
+                else:
+                    # Never downgrade a known abstract to "missing"
+                    conn.executemany(
+                        "INSERT INTO abstract_keys (key, digest, expires_at) VALUES (?, NULL, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET expires_at = excluded.expires_at "
+                        "WHERE abstract_keys.digest IS NULL",
+                        [(key, now + self.negative_ttl) for key in keys]
+                    )
+                    written = 0
+                conn.commit()
+
+        except sqlite3.Error as e:
+            print(f"Abstract store write failed: {e}")
+            return
+
+        # Amortize eviction: check the total size every ~5% of capacity written
+        with self._lock:
+            self._bytes_since_eviction += written
+            due = self._bytes_since_eviction >= max(1, self.max_bytes // 20)
+            if due:
+                self._bytes_since_eviction = 0
+
+        if due:
+            self.evict()
+
+    def evict(self) -> None:
+        """Drop least recently read abstracts beyond max_bytes, and expired negative entries."""
+        try:
+            with self.get_connection() as conn:
+                total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM abstract_blobs").fetchone()[0]
+
+                if total > self.max_bytes:
+                    # Evict down to 90% so the next few writes don't trigger eviction again
+                    excess = total - int(self.max_bytes * 0.9)
+                    victims = []
+                    for digest, size in conn.execute(
+                        "SELECT digest, size FROM abstract_blobs ORDER BY accessed_at"
+                    ):
+                        victims.append((digest,))
+                        excess -= size
+                        if excess <= 0:
+                            break
+
+                    conn.executemany("DELETE FROM abstract_blobs WHERE digest = ?", victims)
+                    conn.execute(
+                        "DELETE FROM abstract_keys WHERE digest IS NOT NULL "
+                        "AND digest NOT IN (SELECT digest FROM abstract_blobs)"
+                    )
+
+                conn.execute(
+                    "DELETE FROM abstract_keys WHERE digest IS NULL AND expires_at <= ?",
+                    (time.time(),)
+                )
+                conn.commit()
+
+        except sqlite3.Error as e:
+            print(f"Abstract store eviction failed: {e}")
+
+
+def create_abstract_store() -> Optional[AbstractStore]:
+    """
+    Build the shared abstract store from settings.
+
+    Returns:
+        AbstractStore or None if the store is disabled
+    """
+    if not settings.ABSTRACT_STORE_ENABLED:
+        return None
+
+    return AbstractStore(
+        db_path=resolve_data_path(settings.ABSTRACT_STORE_PATH),
+        negative_ttl=settings.ABSTRACT_STORE_NEGATIVE_TTL,
+        max_bytes=settings.ABSTRACT_STORE_MAX_BYTES
+    )
+
+
+# Global store instance
+abstract_store = create_abstract_store()
@@ -0,0 +1,132 @@
+"""
+Cooperative cancellation and deadlines for agent runs.
+
+A run carries a CancellationToken (AgentContext.cancel_token). Cancelling
+it does not interrupt anything by force: the pipeline and the outbound
+HTTP layer check it at cancellation points (between stages, before each
+request attempt, between extracted professors) and raise RunCancelled
+there. A token can also carry a deadline for the whole run,
+and each pipeline stage runs under its own deadline.
+
+The token and the current stage deadline are held in context variables,
+so worker threads started through app.utils.concurrency see them too.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Iterator, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class RunCancelled(Exception):
+    """Raised at a cancellation point once the run is cancelled or out of time."""
+
+
+class CancellationToken:
+    """Cancellation flag of a run, with an optional deadline."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self.reason: Optional[str] = None
+        self.deadline: Optional[float] = None  # time.monotonic() value
+        self._budget: Optional[float] = None
+
+    def cancel(self, reason: str = "Cancelled by user") -> None:
+        """Cancel the run (the first reason is kept)."""
+        with self._lock:
+            if self.reason is None:
+                self.reason = reason
+            self._event.set()
+
+    def start_deadline(self, seconds: float) -> None:
+        """Give the run `seconds` from now before it is cancelled."""
+        self.deadline = time.monotonic() + seconds
+        self._budget = seconds
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the run is cancelled (including by its deadline passing)."""
+        if not self._event.is_set() and self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel(f"Run exceeded its time budget of {self._budget:g}s")
+        return self._event.is_set()
+
+    def check(self) -> None:
+        """
+        Cancellation point.
+
+        Raises:
+            RunCancelled: If the run is cancelled
+        """
+        if self.cancelled:
+            raise RunCancelled(self.reason)
+
+
+# Token of the run executing in the current context, and deadline of its current stage
+_current_token: ContextVar[Optional[CancellationToken]] = ContextVar("cancel_token", default=None)
+_stage_deadline: ContextVar[Optional[Tuple[str, float, float]]] = ContextVar("stage_deadline", default=None)
+
+
+@contextmanager
+def cancellation_scope(token: Optional[CancellationToken]):
+    """Make `token` the current run's token for everything called inside the block."""
+    reset = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset)
+
+
+@contextmanager
+def stage_deadline(stage: str, seconds: Optional[float]):
+    """Run the block under a deadline of `seconds` (no deadline if None)."""
+    if seconds is None:
+        yield
+        return
+
+    reset = _stage_deadline.set((stage, seconds, time.monotonic() + seconds))
+    try:
+        yield
+    finally:
+        _stage_deadline.reset(reset)
+
+
+def check_cancelled() -> None:
+    """
+    Cancellation point for code that has no access to the run's context.
+
+    Raises:
+        RunCancelled: If the current run is cancelled or its stage is out of time
+    """
+    token = _current_token.get()
+    if token is not None:
+        token.check()
+
+    stage = _stage_deadline.get()
+    if stage is not None and time.monotonic() >= stage[2]:
+        raise RunCancelled(f"Stage '{stage[0]}' exceeded its time budget of {stage[1]:g}s")
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current run or stage deadline (None without deadline)."""
+    now = time.monotonic()
+    deadlines = []
+
+    token = _current_token.get()
+    if token is not None and token.deadline is not None:
+        deadlines.append(token.deadline)
+
+    stage = _stage_deadline.get()
+    if stage is not None:
+        deadlines.append(stage[2])
+
+    return max(0.0, min(deadlines) - now) if deadlines else None
+
+
+def cancellable(items: Iterable[T]) -> Iterator[T]:
+    """Iterate over `items` with a cancellation point before each item."""
+    for item in items:
+        check_cancelled()
+        yield item
@@ -0,0 +1,141 @@
+"""
+Persistent memo of topic name -> OpenAlex concept ID resolutions.
+"""
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional
+
+
+class ConceptMemo:
+    """
+    SQLite-backed memo table for concept resolution.
+
+    Topics are normalized (case-folded, whitespace collapsed) so that
+    "Machine Learning" and " machine  learning" share one entry. Topics
+    that OpenAlex could not resolve are memoized too (negative cache),
+    with a shorter TTL so new concepts are eventually picked up.
+    """
+
+    def __init__(self, db_path: str, ttl: int, negative_ttl: int):
+        """
+        Initialize the memo and create its table if needed.
+
+        Args:
+            db_path: Path of the SQLite file (can be shared with the response cache)
+            ttl: Seconds a resolved concept ID stays valid
+            negative_ttl: Seconds a "no concept found" result stays valid
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._memory: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _init_db(self) -> None:
+        """Create the memo table."""
+        with self.get_connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS concept_memo (
+                    topic TEXT PRIMARY KEY,
+                    concept_id TEXT,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.commit()
+
+    @contextmanager
+    def get_connection(self):
+        """Context manager for memo database connections."""
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def normalize(topic: str) -> str:
+        """
+        Normalize a topic name for memo lookups.
+
+        Args:
+            topic: Topic name as written by the user or the LLM
+
+        Returns:
+            Case-folded topic with collapsed whitespace
+        """
+        return re.sub(r"\s+", " ", topic).strip().casefold()
+
+    def get_many(self, topics: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Look up several topics at once.
+
+        Args:
+            topics: Normalized topic names
+
+        Returns:
+            Dict of memoized topics -> concept ID (None for negative entries).
+            Topics that are not memoized (or expired) are missing from the dict.
+        """
+        now = time.time()
+        found: Dict[str, Optional[str]] = {}
+        pending = []
+
+        with self._lock:
+            for topic in dict.fromkeys(topics):
+                entry = self._memory.get(topic)
+                if entry and entry[1] > now:
+                    found[topic] = entry[0]
+                else:
+                    pending.append(topic)
+
+        if not pending:
+            return found
+
+        try:
+            with self.get_connection() as conn:
+                placeholders = ",".join("?" for _ in pending)
+                rows = conn.execute(
+                    f"SELECT topic, concept_id, expires_at FROM concept_memo "
+                    f"WHERE topic IN ({placeholders}) AND expires_at > ?",
+                    (*pending, now)
+                ).fetchall()
+
+        except sqlite3.Error as e:
+            print(f"Concept memo read failed: {e}")
+            return found
+
+        with self._lock:
+            for topic, concept_id, expires_at in rows:
+                self._memory[topic] = (concept_id, expires_at)
+                found[topic] = concept_id
+
+        return found
+
+    def set(self, topic: str, concept_id: Optional[str]) -> None:
+        """
+        Memoize a resolution result.
+
+        Args:
+            topic: Normalized topic name
+            concept_id: Resolved concept ID, or None if OpenAlex has no match
+        """
+        expires_at = time.time() + (self.ttl if concept_id else self.negative_ttl)
+
+        with self._lock:
+            self._memory[topic] = (concept_id, expires_at)
+
+        try:
+            with self.get_connection() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO concept_memo (topic, concept_id, expires_at) VALUES (?, ?, ?)",
+                    (topic, concept_id, expires_at)
+                )
+                conn.commit()
+
+        except sqlite3.Error as e:
+            print(f"Concept memo write failed: {e}")
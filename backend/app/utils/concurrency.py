@@ -0,0 +1,65 @@
+"""
+Helpers for running blocking I/O calls with bounded concurrency.
+"""
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, NamedTuple, TypeVar, Any
+
+T = TypeVar("T")
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    ThreadPoolExecutor that runs each task in a copy of the submitter's context.
+
+    Context variables set by the caller (e.g. the current run's throttle
+    metrics) stay visible inside the worker threads.
+    """
+
+    def submit(self, fn, /, *args, **kwargs):
+        context = contextvars.copy_context()
+        return super().submit(context.run, fn, *args, **kwargs)
+
+
+class TimedResult(NamedTuple):
+    """Result of a single call made through `bounded_map`."""
+    item: Any
+    value: Any
+    latency: float  # Seconds spent in the call
+
+
+def bounded_map(
+    fn: Callable[[T], Any],
+    items: Iterable[T],
+    max_in_flight: int = 5
+) -> List[TimedResult]:
+    """
+    Call `fn` on every item with at most `max_in_flight` calls running at once.
+
+    Results are returned in input order regardless of completion order.
+    Exceptions raised by `fn` propagate to the caller.
+
+    Args:
+        fn: Blocking function to call for each item
+        items: Items to process
+        max_in_flight: Maximum number of concurrent calls
+
+    Returns:
+        List of TimedResult, one per item, in input order
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    def timed_call(item: T) -> TimedResult:
+        started = time.perf_counter()
+        value = fn(item)
+        return TimedResult(item=item, value=value, latency=time.perf_counter() - started)
+
+    # No need for a pool when there is nothing to overlap
+    if max_in_flight <= 1 or len(items) == 1:
+        return [timed_call(item) for item in items]
+
+    with ContextThreadPoolExecutor(max_workers=min(max_in_flight, len(items))) as pool:
+        return list(pool.map(timed_call, items))
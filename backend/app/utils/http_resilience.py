@@ -0,0 +1,330 @@
+"""
+Resilience layer for outbound HTTP calls (OpenAlex, Semantic Scholar).
+
+Provides:
+- exponential backoff with full jitter, honouring Retry-After
+- a per-host concurrency cap
+- a per-host circuit breaker
+- per-run throttling metrics (time spent waiting on rate limits and backoff)
+- cancellation points and timeouts bounded by the run's remaining time
+"""
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from app.core.config import settings
+from app.utils.cancellation import check_cancelled, remaining_time
+from app.utils.rate_limiter import TokenBucket
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised when a host's circuit breaker is open and the call is short-circuited."""
+
+
+class ThrottleMetrics:
+    """Accumulates how long a run spent throttled, by reason."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.seconds: Dict[str, float] = {}
+        self.retries = 0
+        self.short_circuited = 0
+
+    def add(self, reason: str, seconds: float) -> None:
+        """Record `seconds` of throttling for `reason` (e.g. "backoff", "rate_limit")."""
+        if seconds < 0.001:  # Ignore uncontended lock/semaphore acquisitions
+            return
+        with self._lock:
+            self.seconds[reason] = self.seconds.get(reason, 0.0) + seconds
+
+    def count_retry(self) -> None:
+        """Record one retried request."""
+        with self._lock:
+            self.retries += 1
+
+    def count_short_circuit(self) -> None:
+        """Record one call rejected by an open circuit."""
+        with self._lock:
+            self.short_circuited += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Summary suitable for the run state."""
+        with self._lock:
+            return {
+                "throttled_seconds": round(sum(self.seconds.values()), 3),
+                "throttled_by_reason": {reason: round(s, 3) for reason, s in self.seconds.items()},
+                "retries": self.retries,
+                "short_circuited": self.short_circuited
+            }
+
+
+# Metrics of the run executing in the current context (None outside a run)
+_current_metrics: ContextVar[Optional[ThrottleMetrics]] = ContextVar("throttle_metrics", default=None)
+
+
+@contextmanager
+def track_throttling():
+    """
+    Collect throttling metrics for everything called inside the block.
+
+    Worker threads started through app.utils.concurrency inherit the
+    context, so their waits are attributed to the same run.
+
+    Yields:
+        ThrottleMetrics for the block
+    """
+    metrics = ThrottleMetrics()
+    token = _current_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current_metrics.reset(token)
+
+
+def record_throttle(reason: str, seconds: float) -> None:
+    """Attribute throttled time to the current run, if any."""
+    metrics = _current_metrics.get()
+    if metrics:
+        metrics.add(reason, seconds)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+
+    def __init__(self, max_retries: int, base_delay: float, max_delay: float, max_retry_after: float):
+        """
+        Args:
+            max_retries: Retries after the first attempt
+            base_delay: Backoff for the first retry (seconds)
+            max_delay: Upper bound for computed backoff (seconds)
+            max_retry_after: Upper bound for server-provided Retry-After (seconds)
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Compute the wait before retry number `attempt` (0-based).
+
+        A Retry-After from the server wins over the computed backoff.
+        """
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP date).
+
+    Returns:
+        Seconds to wait, or None if missing/invalid
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    calls fail fast for `reset_timeout` seconds. Then a single trial call
+    is let through (half-open): success closes the circuit, failure
+    re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may proceed now."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold."""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+class HostGuard:
+    """Concurrency cap and circuit breaker for a single host."""
+
+    def __init__(self):
+        self.semaphore = threading.BoundedSemaphore(settings.HTTP_PER_HOST_CONCURRENCY)
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.HTTP_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.HTTP_CIRCUIT_RESET_SECONDS
+        )
+
+
+_host_guards: Dict[str, HostGuard] = {}
+_host_guards_lock = threading.Lock()
+
+
+def get_host_guard(host: str) -> HostGuard:
+    """Get (or create) the shared guard for a host."""
+    with _host_guards_lock:
+        if host not in _host_guards:
+            _host_guards[host] = HostGuard()
+        return _host_guards[host]
+
+
+default_retry_policy = RetryPolicy(
+    max_retries=settings.HTTP_MAX_RETRIES,
+    base_delay=settings.HTTP_BACKOFF_BASE,
+    max_delay=settings.HTTP_BACKOFF_MAX,
+    max_retry_after=settings.HTTP_MAX_RETRY_AFTER
+)
+
+
+def resilient_request(
+    session: requests.Session,
+    method: str,
+    url: str,
+    rate_limiter: Optional[TokenBucket] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    **kwargs
+) -> requests.Response:
+    """
+    Send a request with retries, per-host concurrency cap and circuit breaker.
+
+    Args:
+        session: Session to send the request with
+        method: HTTP method ("GET", "POST", ...)
+        url: Request URL
+        rate_limiter: Optional token bucket to acquire before every attempt
+        retry_policy: Backoff policy (default from settings)
+        **kwargs: Passed to session.request (params, json, timeout, ...)
+
+    Returns:
+        Successful response (status already checked)
+
+    Raises:
+        CircuitOpenError: If the host's circuit is open
+        requests.RequestException: When retries are exhausted or the error is not retryable
+        RunCancelled: If the current run is cancelled or out of time
+    """
+    policy = retry_policy or default_retry_policy
+    guard = get_host_guard(urlsplit(url).netloc)
+    metrics = _current_metrics.get()
+
+    attempt = 0
+    while True:
+        # Don't spend upstream quota on a run nobody is waiting for
+        check_cancelled()
+
+        if not guard.breaker.allow():
+            if metrics:
+                metrics.count_short_circuit()
+            raise CircuitOpenError(f"Circuit open for {urlsplit(url).netloc}")
+
+        if rate_limiter:
+            record_throttle("rate_limit", rate_limiter.acquire())
+
+        waited_from = time.monotonic()
+        with guard.semaphore:
+            record_throttle("host_concurrency", time.monotonic() - waited_from)
+
+            retry_after = None
+            try:
+                response = session.request(method, url, **_bounded_timeout(kwargs))
+            except (requests.ConnectionError, requests.Timeout):
+                guard.breaker.record_failure()
+                if attempt >= policy.max_retries:
+                    raise
+                response = None
+            except Exception:
+                # Not retryable, but it must still end a half-open trial call,
+                # or the circuit would never let another call through
+                guard.breaker.record_failure()
+                raise
+
+        if response is not None:
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                # Server answered normally (even a 404 means the host is healthy)
+                guard.breaker.record_success()
+                response.raise_for_status()
+                return response
+
+            if response.status_code == 429:
+                # The host is healthy, just throttling us: back off without tripping the breaker
+                guard.breaker.record_success()
+            else:
+                guard.breaker.record_failure()
+
+            if attempt >= policy.max_retries:
+                response.raise_for_status()
+
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+
+        delay = policy.delay(attempt, retry_after)
+        if metrics:
+            metrics.count_retry()
+        remaining = remaining_time()
+        if remaining is not None:
+            delay = min(delay, remaining)
+        record_throttle("backoff", delay)
+        time.sleep(delay)
+        attempt += 1
+
+
+def _bounded_timeout(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Request arguments with the timeout capped by the run's remaining time."""
+    remaining = remaining_time()
+    if remaining is None:
+        return kwargs
+
+    # requests rejects a zero timeout; the next cancellation point stops the run anyway
+    remaining = max(remaining, 1.0)
+    timeout = kwargs.get("timeout")
+    if isinstance(timeout, tuple):
+        timeout = tuple(min(part, remaining) if part is not None else remaining for part in timeout)
+    else:
+        timeout = min(timeout, remaining) if timeout is not None else remaining
+
+    return {**kwargs, "timeout": timeout}
@@ -0,0 +1,132 @@
+"""
+Incremental parsing of large JSON API responses.
+
+OpenAlex list responses look like {"meta": {...}, "results": [...], ...}.
+`iter_json_array` yields the elements of one top-level array as soon as
+each is complete, so only one element (plus a read chunk) is held in
+memory at a time and the consumer can stop reading early.
+"""
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+WHITESPACE = " \t\n\r"
+
+
+class _JsonStreamReader:
+    """Character buffer over an iterable of byte chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.exhausted = False
+
+    def _fill(self) -> bool:
+        """Read the next chunk into the buffer. Returns False at end of stream."""
+        if self.exhausted:
+            return False
+
+        # Drop consumed text so the buffer stays around one chunk long
+        if self.pos:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self.buffer += text
+                return True
+
+        self.buffer += self._decoder.decode(b"", final=True)
+        self.exhausted = True
+        return False
+
+    def peek(self) -> str:
+        """Next non-whitespace character (not consumed)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON stream")
+
+    def expect(self, *chars: str) -> str:
+        """Consume the next non-whitespace character, which must be one of `chars`."""
+        char = self.peek()
+        if char not in chars:
+            raise ValueError(f"Expected one of {chars!r} at offset {self.pos}, got {char!r}")
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self.buffer, self.pos)
+                # A value ending exactly at the buffer end may be a truncated number
+                if end < len(self.buffer) or self.exhausted:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.exhausted:
+                    raise
+
+            if not self._fill():
+                value, self.pos = self._json.raw_decode(self.buffer, self.pos)
+                return value
+
+
+def iter_json_array(
+    chunks: Iterable[bytes],
+    key: str = "results",
+    envelope: Optional[Dict[str, Any]] = None
+) -> Iterator[Any]:
+    """
+    Yield the elements of the top-level array `key` of a streamed JSON object.
+
+    Other top-level fields are decoded whole and stored in `envelope` as
+    they are encountered (OpenAlex sends "meta" before "results", so it is
+    available before the first element is yielded).
+
+    Args:
+        chunks: Raw response body chunks (e.g. response.iter_content())
+        key: Name of the array to stream
+        envelope: Optional dict receiving the other top-level fields
+
+    Yields:
+        Array elements, one at a time
+
+    Raises:
+        ValueError: If the body is not valid JSON or not an object
+    """
+    reader = _JsonStreamReader(chunks)
+
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+
+    while True:
+        field = reader.value()
+        reader.expect(":")
+
+        if field == key and reader.peek() == "[":
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.expect("]")
+            else:
+                while True:
+                    yield reader.value()
+                    if reader.expect(",", "]") == "]":
+                        break
+        else:
+            value = reader.value()
+            if envelope is not None:
+                envelope[field] = value
+
+        if reader.expect(",", "}") == "}":
+            return
@@ -4,27 +4,106 @@ OpenAlex API client for retrieving academic research data.
 Documentation: https://docs.openalex.org
 """
 import requests
-from typing import List, Dict, Any, Optional
-import time
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from datetime import datetime
+from app.core.config import settings
+from app.utils.concurrency import bounded_map
+from app.database.paths import resolve_data_path
+from app.utils.concept_memo import ConceptMemo
+from app.utils.http_resilience import resilient_request
+from app.utils.json_stream import iter_json_array
+from app.utils.rate_limiter import TokenBucket
+from app.utils.response_cache import ResponseCache
 
 
 class OpenAlexClient:
     """Client for interacting with OpenAlex API."""
 
     BASE_URL = "https://api.openalex.org"
+    MAX_IDS_PER_FILTER = 50  # OpenAlex limit for OR-ed values in a single filter
+    MAX_PER_PAGE = 200  # OpenAlex limit for per-page
+    AUTHORS_PER_WORKS_QUERY = 25  # Keeps ~8 works per author within one 200-result page
+    STREAM_CHUNK_SIZE = 16 * 1024  # Bytes read at a time from streamed responses
 
-    def __init__(self, email: Optional[str] = None):
+    def __init__(
+        self,
+        email: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+        concept_memo: Optional[ConceptMemo] = None
+    ):
         """
         Initialize OpenAlex client.
 
         Args:
             email: Optional email for polite pool (faster API access)
+            cache: Optional response cache; successful responses are served from it
+            concept_memo: Optional persistent topic -> concept ID memo
         """
+        # One keep-alive pool shared by every run and worker thread; requests'
+        # default of 10 connections would be torn down and reopened as soon
+        # as more calls than that run at once
         self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=settings.OPENALEX_POOL_MAX_CONNECTIONS
+        ))
         if email:
             # Polite pool gets faster response times
             self.session.params = {"mailto": email}
 
+        self.cache = cache
+        self.concept_memo = concept_memo
+
+        # Shared by every thread using this client, so concurrent callers
+        # stay within OpenAlex's rate limit
+        self.rate_limiter = TokenBucket(
+            rate=settings.OPENALEX_RATE_LIMIT,
+            capacity=settings.OPENALEX_RATE_BURST
+        )
+
+    def _get_json(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Cached, rate-limited GET request with retries (see http_resilience).
+
+        Cache hits skip the network (and the rate limiter) entirely.
+
+        Args:
+            url: Request URL
+            params: Optional query parameters
+            timeout: Request timeout in seconds
+
+        Returns:
+            Parsed JSON response
+
+        Raises:
+            requests.RequestException: On network or HTTP errors
+        """
+        if self.cache:
+            cached = self.cache.get(url, params)
+            if cached is not None:
+                return cached
+
+        response = resilient_request(
+            self.session,
+            "GET",
+            url,
+            rate_limiter=self.rate_limiter,
+            params=params,
+            timeout=timeout
+        )
+        data = response.json()
+
+        if self.cache:
+            self.cache.set(url, params, data)
+
+        return data
+
     def search_concepts(self, topic: str) -> Optional[str]:
         """
         Search for a concept by topic name and return its ID.
@@ -37,53 +116,101 @@ class OpenAlexClient:
 
         API: GET /concepts?search={topic}
         """
-        url = f"{self.BASE_URL}/concepts"
-        params = {"search": topic}
-
         try:
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-
-            data = response.json()
-            results = data.get("results", [])
-
-            if results:
-                # Return the ID of the first result
-                concept_id = results[0].get("id")
-                return concept_id
-
-            return None
+            return self._lookup_concept(topic)
 
         except requests.RequestException as e:
             print(f"Error searching concept '{topic}': {e}")
             return None
 
+    def _lookup_concept(self, topic: str) -> Optional[str]:
+        """
+        Search for a concept, letting request errors propagate.
+
+        Unlike search_concepts, a None result here is definitive
+        ("OpenAlex has no such concept") and safe to memoize.
+
+        Raises:
+            requests.RequestException: On network or HTTP errors
+        """
+        url = f"{self.BASE_URL}/concepts"
+        params = {"search": topic, "select": "id", "per-page": 1}
+
+        data = self._get_json(url, params=params, timeout=10)
+        results = data.get("results", [])
+
+        if results:
+            # Return the ID of the first result
+            return results[0].get("id")
+
+        return None
+
     def get_concept_ids_from_topics(self, topics: List[str]) -> List[str]:
         """
         Convert a list of topics to OpenAlex concept IDs.
 
+        Topics are looked up in the concept memo first (including negative
+        entries); all misses are resolved concurrently in a single wave.
+
         Args:
             topics: List of topic names
 
         Returns:
-            List of concept IDs (filters out None values)
+            List of concept IDs in topic order (filters out None values)
         """
-        concept_ids = []
+        normalize = ConceptMemo.normalize
+        normalized_topics = [normalize(topic) for topic in topics]
+
+        resolved = self.concept_memo.get_many(normalized_topics) if self.concept_memo else {}
+
+        # Resolve each distinct miss once, using the original spelling for the search
+        misses = {}
+        for topic, normalized in zip(topics, normalized_topics):
+            if normalized not in resolved and normalized not in misses:
+                misses[normalized] = topic
+
+        for result in bounded_map(
+            self._resolve_concept_miss,
+            list(misses.items()),
+            max_in_flight=settings.OPENALEX_MAX_CONCURRENCY
+        ):
+            normalized, concept_id, definitive = result.value
+            resolved[normalized] = concept_id
+            if definitive and self.concept_memo:
+                self.concept_memo.set(normalized, concept_id)
+
+        return [
+            resolved[normalized]
+            for normalized in normalized_topics
+            if resolved.get(normalized)
+        ]
+
+    def _resolve_concept_miss(self, item: Tuple[str, str]) -> Tuple[str, Optional[str], bool]:
+        """
+        Resolve a topic that is not in the concept memo.
 
-        for topic in topics:
-            concept_id = self.search_concepts(topic)
-            if concept_id:
-                concept_ids.append(concept_id)
-            # Small delay to be polite to the API
-            time.sleep(0.2)
+        Args:
+            item: Tuple of (normalized topic, original topic)
 
-        return concept_ids
+        Returns:
+            Tuple of (normalized topic, concept ID or None, whether the result is definitive)
+        """
+        normalized, topic = item
+
+        try:
+            return normalized, self._lookup_concept(topic), True
+
+        except requests.RequestException as e:
+            # Transient failure: don't memoize it as "no concept"
+            print(f"Error searching concept '{topic}': {e}")
+            return normalized, None, False
 
     def search_works_by_concepts(
         self,
         concept_ids: List[str],
         per_page: int = 25,
-        page: int = 1
+        page: int = 1,
+        select: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """
         Search for works (papers) by concept IDs.
@@ -92,6 +219,7 @@ class OpenAlexClient:
             concept_ids: List of OpenAlex concept IDs
             per_page: Number of results per page (max 200)
             page: Page number
+            select: Optional work fields to return (default: all fields)
 
         Returns:
             Raw JSON response from OpenAlex
@@ -99,40 +227,151 @@ class OpenAlexClient:
         API: GET /works?filter=concepts.id:{id1},concepts.id:{id2}
         """
         url = f"{self.BASE_URL}/works"
+        params = self._works_by_concepts_params(concept_ids, per_page, select)
+        params["page"] = page
+
+        try:
+            return self._get_json(url, params=params, timeout=30)
+
+        except requests.RequestException as e:
+            print(f"Error searching works: {e}")
+            return {"results": [], "meta": {}}
+
+    def iter_works_by_concepts(
+        self,
+        concept_ids: List[str],
+        per_page: int = 25,
+        select: Optional[List[str]] = None,
+        max_pages: int = 1
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream works (papers) by concept IDs, one work at a time.
+
+        Same query as `search_works_by_concepts`, but pages are fetched
+        with cursor paging only when the consumer has read the previous
+        one, and each page body is parsed incrementally (see json_stream),
+        so memory stays flat for large pages. Closing the generator early
+        stops reading and fetches no further pages.
+
+        Args:
+            concept_ids: List of OpenAlex concept IDs
+            per_page: Number of results per page (max 200)
+            select: Optional work fields to return (default: all fields)
+            max_pages: Maximum number of pages to fetch
+
+        Yields:
+            Work JSON objects in result order
+
+        API: GET /works?filter=concepts.id:{id1},concepts.id:{id2}&cursor=*
+        """
+        url = f"{self.BASE_URL}/works"
+        params = self._works_by_concepts_params(concept_ids, per_page, select)
+        params["cursor"] = "*"
+
+        for _ in range(max_pages):
+            envelope: Dict[str, Any] = {}
+            yield from self._stream_results(url, params, envelope)
+
+            # OpenAlex returns next_cursor=null after the last page
+            next_cursor = (envelope.get("meta") or {}).get("next_cursor")
+            if not next_cursor:
+                return
+            params = {**params, "cursor": next_cursor}
+
+    def _stream_results(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        envelope: Dict[str, Any]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the "results" of one list request, element by element.
+
+        Cached pages are replayed from the cache. A streamed page read to
+        the end without error is written to it, unless it holds more than
+        OPENALEX_CACHE_MAX_STREAMED_RESULTS results: keeping those for the
+        cache would grow memory with the page size again. A page the consumer
+        stopped reading early is not cached either, since only part of it was
+        received. Errors are logged and end the stream.
+
+        Args:
+            url: Request URL
+            params: Query parameters
+            envelope: Receives the other top-level fields (e.g. "meta")
+
+        Yields:
+            Result objects in response order
+        """
+        if self.cache:
+            cached = self.cache.get(url, params)
+            if cached is not None:
+                envelope.update({key: value for key, value in cached.items() if key != "results"})
+                yield from cached.get("results", [])
+                return
+
+        try:
+            response = resilient_request(
+                self.session,
+                "GET",
+                url,
+                rate_limiter=self.rate_limiter,
+                params=params,
+                timeout=30,
+                stream=True
+            )
+        except requests.RequestException as e:
+            print(f"Error searching works: {e}")
+            return
+
+        # Results are kept for the cache only, up to a bounded page size
+        items: Optional[List[Dict[str, Any]]] = [] if self.cache else None
+        complete = False
 
+        try:
+            for item in iter_json_array(
+                response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE),
+                envelope=envelope
+            ):
+                if items is not None:
+                    items.append(item)
+                    if len(items) > settings.OPENALEX_CACHE_MAX_STREAMED_RESULTS:
+                        items = None  # Too large to cache: stop holding the page
+                yield item
+            complete = True
+        except (requests.RequestException, ValueError) as e:
+            print(f"Error reading works stream: {e}")
+            # Don't follow a cursor from a page that was not read to the end
+            envelope.pop("meta", None)
+        finally:
+            response.close()
+            if complete and items is not None:
+                self.cache.set(url, params, {**envelope, "results": items})
+
+    def _works_by_concepts_params(
+        self,
+        concept_ids: List[str],
+        per_page: int,
+        select: Optional[List[str]]
+    ) -> Dict[str, Any]:
+        """Query parameters for a works search by concept IDs."""
         # Build filter string: concepts.id:ID1,concepts.id:ID2
         concept_filters = ",".join([f"concepts.id:{cid}" for cid in concept_ids])
 
-        # Calculate year range (last 2 years)
-        from datetime import datetime
-        current_year = datetime.now().year
-        start_year = current_year - 1
-        
-        # Add publication year filter
-        # filter=concepts.id:ID1|ID2,from_publication_date:2023-01-01
+        # Add publication year filter (last 2 years)
         # OpenAlex supports range queries for years: publication_year:2023-2025
-        year_filter = f"publication_year:{start_year}-{current_year}"
+        year_filter = self._recent_years_filter()
 
         params = {
             "filter": f"{concept_filters},{year_filter}",
-            "per-page": per_page,
-            "page": page
+            "per-page": per_page
         }
-
-        try:
-            response = self.session.get(url, params=params, timeout=30)
-            response.raise_for_status()
-
-            return response.json()
-
-        except requests.RequestException as e:
-            print(f"Error searching works: {e}")
-            return {"results": [], "meta": {}}
+        return self._add_select(params, select)
 
     def search_papers_by_topics(
         self,
         topics: List[str],
-        per_page: int = 25
+        per_page: int = 25,
+        select: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """
         High-level method: Search for papers by topic names.
@@ -142,6 +381,7 @@ class OpenAlexClient:
         Args:
             topics: List of topic names (e.g., ["Robotics", "AI"])
             per_page: Number of results to return
+            select: Optional work fields to return (default: all fields)
 
         Returns:
             Raw JSON response with papers
@@ -154,7 +394,7 @@ class OpenAlexClient:
             return {"results": [], "meta": {}}
 
         # Step 2: Search for works using concept IDs
-        return self.search_works_by_concepts(concept_ids, per_page=per_page)
+        return self.search_works_by_concepts(concept_ids, per_page=per_page, select=select)
 
     def extract_author_id(self, author_url: str) -> str:
         """
@@ -168,12 +408,13 @@ class OpenAlexClient:
         """
         return author_url.split("/")[-1]
 
-    def get_author(self, author_id: str) -> Optional[Dict[str, Any]]:
+    def get_author(self, author_id: str, select: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         """
         Get detailed author information by ID.
 
         Args:
             author_id: Author ID (e.g., "A5068353058")
+            select: Optional author fields to return (default: all fields)
 
         Returns:
             Author JSON data or None if error
@@ -187,18 +428,95 @@ class OpenAlexClient:
         url = f"{self.BASE_URL}/authors/{author_id}"
 
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return self._get_json(url, params=self._add_select({}, select), timeout=10)
 
         except requests.RequestException as e:
             print(f"Error fetching author {author_id}: {e}")
             return None
 
+    def get_authors_bulk(
+        self,
+        author_ids: List[str],
+        select: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get detailed author information for many authors at once.
+
+        IDs are OR-ed into `openalex_id` filters, MAX_IDS_PER_FILTER per request,
+        so 50 authors cost a single HTTP call instead of 50.
+
+        Args:
+            author_ids: Author IDs (short IDs or full OpenAlex URLs)
+            select: Optional author fields to return ("id" is always included)
+
+        Returns:
+            Dict mapping short author ID to author JSON data.
+            Authors that could not be fetched are missing from the dict.
+
+        API: GET /authors?filter=openalex_id:{id1}|{id2}|...
+        """
+        # Clean and dedupe IDs, keeping the caller's order
+        clean_ids = list(dict.fromkeys(
+            self.extract_author_id(author_id) if "/" in author_id else author_id
+            for author_id in author_ids
+        ))
+
+        chunks = [
+            clean_ids[i:i + self.MAX_IDS_PER_FILTER]
+            for i in range(0, len(clean_ids), self.MAX_IDS_PER_FILTER)
+        ]
+
+        authors: Dict[str, Dict[str, Any]] = {}
+        for result in bounded_map(
+            lambda chunk: self._get_authors_chunk(chunk, select),
+            chunks,
+            max_in_flight=settings.OPENALEX_MAX_CONCURRENCY
+        ):
+            authors.update(result.value)
+
+        return authors
+
+    def _get_authors_chunk(
+        self,
+        author_ids: List[str],
+        select: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch up to MAX_IDS_PER_FILTER authors in one request.
+
+        Args:
+            author_ids: Short author IDs
+            select: Optional author fields to return
+
+        Returns:
+            Dict mapping short author ID to author JSON data (empty on error)
+        """
+        url = f"{self.BASE_URL}/authors"
+        params = {
+            "filter": f"openalex_id:{'|'.join(author_ids)}",
+            "per-page": len(author_ids)
+        }
+        # The ID is needed to key the results
+        self._add_select(params, select, required=["id"])
+
+        try:
+            results = self._get_json(url, params=params, timeout=10).get("results", [])
+
+            return {
+                self.extract_author_id(author["id"]): author
+                for author in results
+                if author.get("id")
+            }
+
+        except requests.RequestException as e:
+            print(f"Error fetching authors {', '.join(author_ids)}: {e}")
+            return {}
+
     def get_author_works(
         self,
         author_id: str,
-        per_page: int = 3
+        per_page: int = 3,
+        select: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """
         Get works (papers) by a specific author.
@@ -206,6 +524,7 @@ class OpenAlexClient:
         Args:
             author_id: Author ID (e.g., "A5068353058")
             per_page: Number of papers to return (default: 3)
+            select: Optional work fields to return (default: all fields)
 
         Returns:
             Raw JSON response with author's papers
@@ -217,26 +536,215 @@ class OpenAlexClient:
             author_id = self.extract_author_id(author_id)
 
         url = f"{self.BASE_URL}/works"
-        # Calculate year range (last 2 years)
-        from datetime import datetime
-        current_year = datetime.now().year
-        start_year = current_year - 1
-        year_filter = f"publication_year:{start_year}-{current_year}"
+        year_filter = self._recent_years_filter()
 
         params = {
             "filter": f"author.id:{author_id},{year_filter}",
             "per-page": per_page
         }
+        self._add_select(params, select)
 
         try:
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return self._get_json(url, params=params, timeout=10)
 
         except requests.RequestException as e:
             print(f"Error fetching works for author {author_id}: {e}")
             return {"results": [], "meta": {}}
 
+    def get_authors_works_bulk(
+        self,
+        author_ids: List[str],
+        per_author: int = 3,
+        select: Optional[List[str]] = None,
+        latencies: Optional[Dict[str, float]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get recent works for many authors with as few requests as possible.
+
+        Authors are OR-ed into `author.id` filters (AUTHORS_PER_WORKS_QUERY per
+        request) and the results are split per author locally, keeping the
+        first `per_author` works for each. If a page was truncated and an
+        author ended up with fewer than `per_author` works, that author
+        falls back to a single `get_author_works` call.
+
+        Args:
+            author_ids: Author IDs (short IDs or full OpenAlex URLs)
+            per_author: Number of works to keep per author (default: 3)
+            select: Optional work fields to return ("authorships" is always included)
+            latencies: Optional dict filled with the seconds spent on each
+                fallback author's own call (by short author ID)
+
+        Returns:
+            Dict mapping short author ID to a list of work JSON objects
+            (every requested author is present, possibly with an empty list)
+
+        API: GET /works?filter=author.id:{id1}|{id2}|...,publication_year:{range}
+        """
+        clean_ids = list(dict.fromkeys(
+            self.extract_author_id(author_id) if "/" in author_id else author_id
+            for author_id in author_ids
+        ))
+
+        chunks = [
+            clean_ids[i:i + self.AUTHORS_PER_WORKS_QUERY]
+            for i in range(0, len(clean_ids), self.AUTHORS_PER_WORKS_QUERY)
+        ]
+
+        works_by_author: Dict[str, List[Dict[str, Any]]] = {author_id: [] for author_id in clean_ids}
+        truncated_ids: List[str] = []
+
+        for result in bounded_map(
+            lambda chunk: self._get_authors_works_chunk(chunk, per_author, select),
+            chunks,
+            max_in_flight=settings.OPENALEX_MAX_CONCURRENCY
+        ):
+            chunk_works, truncated = result.value
+            works_by_author.update(chunk_works)
+            if truncated:
+                truncated_ids.extend(
+                    author_id for author_id in result.item
+                    if len(chunk_works.get(author_id, [])) < per_author
+                )
+
+        # Authors crowded out of a full page by more prolific co-queried authors
+        for result in bounded_map(
+            lambda author_id: self.get_author_works(author_id, per_page=per_author, select=select),
+            truncated_ids,
+            max_in_flight=settings.OPENALEX_MAX_CONCURRENCY
+        ):
+            works_by_author[result.item] = result.value.get("results", [])[:per_author]
+            if latencies is not None:
+                latencies[result.item] = round(result.latency, 3)
+
+        return works_by_author
+
+    def _get_authors_works_chunk(
+        self,
+        author_ids: List[str],
+        per_author: int,
+        select: Optional[List[str]] = None
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], bool]:
+        """
+        Fetch recent works for a chunk of authors in one request.
+
+        Args:
+            author_ids: Short author IDs
+            per_author: Number of works to keep per author
+            select: Optional work fields to return
+
+        Returns:
+            Tuple of (works grouped by author ID, whether the page was truncated).
+            On error every author is reported as truncated so it gets retried individually.
+        """
+        url = f"{self.BASE_URL}/works"
+        params = {
+            "filter": f"author.id:{'|'.join(author_ids)},{self._recent_years_filter()}",
+            "per-page": self.MAX_PER_PAGE
+        }
+        # Authorships are needed to split the results per author
+        self._add_select(params, select, required=["authorships"])
+
+        try:
+            data = self._get_json(url, params=params, timeout=30)
+
+        except requests.RequestException as e:
+            print(f"Error fetching works for authors {', '.join(author_ids)}: {e}")
+            return {}, True
+
+        wanted = set(author_ids)
+        works_by_author: Dict[str, List[Dict[str, Any]]] = {author_id: [] for author_id in author_ids}
+
+        for work in data.get("results", []):
+            for authorship in work.get("authorships", []):
+                author_url = authorship.get("author", {}).get("id")
+                if not author_url:
+                    continue
+
+                author_id = self.extract_author_id(author_url)
+                if author_id in wanted and len(works_by_author[author_id]) < per_author:
+                    works_by_author[author_id].append(work)
+
+        results_count = len(data.get("results", []))
+        total_count = data.get("meta", {}).get("count") or results_count
+
+        return works_by_author, total_count > results_count
+
+    @staticmethod
+    def _add_select(
+        params: Dict[str, Any],
+        select: Optional[List[str]],
+        required: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Add OpenAlex field projection (`select=`) to request params.
+
+        Only root-level fields can be selected. Nothing is added when
+        `select` is None, so the full entity is returned.
+
+        Args:
+            params: Request params to update in place
+            select: Fields declared by the caller
+            required: Fields this method itself needs from the response
+
+        Returns:
+            The updated params
+        """
+        if select:
+            fields = list(dict.fromkeys([*select, *(required or [])]))
+            params["select"] = ",".join(fields)
+        return params
+
+    @staticmethod
+    def _recent_years_filter() -> str:
+        """
+        Build the publication year filter used by works queries (last 2 years).
+
+        Returns:
+            Filter like "publication_year:2024-2025"
+        """
+        current_year = datetime.now().year
+        start_year = current_year - 1
+        return f"publication_year:{start_year}-{current_year}"
+
+
+def create_response_cache() -> Optional[ResponseCache]:
+    """
+    Build the shared OpenAlex response cache from settings.
+
+    Returns:
+        ResponseCache or None if caching is disabled
+    """
+    if not settings.OPENALEX_CACHE_ENABLED:
+        return None
+
+    return ResponseCache(
+        db_path=resolve_data_path(settings.OPENALEX_CACHE_PATH),
+        ttls={
+            "concepts": settings.OPENALEX_CACHE_TTL_CONCEPTS,
+            "authors": settings.OPENALEX_CACHE_TTL_AUTHORS,
+            "works": settings.OPENALEX_CACHE_TTL_WORKS
+        },
+        memory_entries=settings.OPENALEX_CACHE_MEMORY_ENTRIES,
+        max_disk_entries=settings.OPENALEX_CACHE_MAX_ENTRIES
+    )
+
+
+def create_concept_memo() -> Optional[ConceptMemo]:
+    """
+    Build the persistent concept memo from settings (stored in the cache file).
+
+    Returns:
+        ConceptMemo or None if caching is disabled
+    """
+    if not settings.OPENALEX_CACHE_ENABLED:
+        return None
+
+    return ConceptMemo(
+        db_path=resolve_data_path(settings.OPENALEX_CACHE_PATH),
+        ttl=settings.OPENALEX_CONCEPT_MEMO_TTL,
+        negative_ttl=settings.OPENALEX_CONCEPT_NEGATIVE_TTL
+    )
+
 
 # Global client instance
-openalex_client = OpenAlexClient()
+openalex_client = OpenAlexClient(cache=create_response_cache(), concept_memo=create_concept_memo())
@@ -1,12 +1,23 @@
 """
 Utility functions for mapping OpenAlex API responses to Paper objects.
 """
-from typing import List, Dict, Any, Optional
+from itertools import islice
+from typing import Iterable, List, Dict, Any, Optional
 from app.schemas.agent import Paper
-from app.utils.abstract_fetcher import get_paper_abstract
+from app.utils.abstract_fetcher import resolve_paper_abstract
 
+# OpenAlex work fields read by the mappers below (requested via `select=`)
+WORK_SELECT_FIELDS = [
+    "id",
+    "doi",
+    "title",
+    "publication_year",
+    "primary_topic",
+    "abstract_inverted_index"
+]
 
-def map_openalex_work_to_paper(work: Dict[str, Any]) -> Paper:
+
+def map_openalex_work_to_paper(work: Dict[str, Any], fetch_remote: bool = True) -> Paper:
     """
     Map a single OpenAlex work to a Paper object.
 
@@ -23,6 +34,8 @@ def map_openalex_work_to_paper(work: Dict[str, Any]) -> Paper:
 
     Args:
         work: OpenAlex work JSON object
+        fetch_remote: Whether a missing abstract is fetched from Semantic Scholar
+            right away (False leaves it for a batched lookup, see fill_missing_abstracts)
 
     Returns:
         Paper object
@@ -32,41 +45,50 @@ def map_openalex_work_to_paper(work: Dict[str, Any]) -> Paper:
     if work.get("primary_topic"):
         topic = work["primary_topic"].get("display_name")
 
-    # Get abstract (from OpenAlex inverted index or Semantic Scholar)
-    abstract = get_paper_abstract(work)
+    # Get abstract (from the abstract store, OpenAlex inverted index or Semantic Scholar);
+    # without a remote fetch, a paper with a DOI may still get its abstract later ("pending")
+    abstract, abstract_status = resolve_paper_abstract(work, fetch_remote=fetch_remote)
 
     return Paper(
+        id=work.get("id"),
         title=work.get("title", "Untitled"),
         link=work.get("doi"),  # DOI field
         abstract=abstract,
+        abstract_status=abstract_status,
         publication_year=work.get("publication_year"),
         topic=topic
     )
 
 
-def map_openalex_works_to_papers(works: List[Dict[str, Any]]) -> List[Paper]:
+def map_openalex_works_to_papers(works: List[Dict[str, Any]], fetch_remote: bool = True) -> List[Paper]:
     """
     Map a list of OpenAlex works to Paper objects.
 
     Args:
         works: List of OpenAlex work JSON objects
+        fetch_remote: Whether missing abstracts are fetched from Semantic Scholar per paper
 
     Returns:
         List of Paper objects
     """
-    return [map_openalex_work_to_paper(work) for work in works]
+    return [map_openalex_work_to_paper(work, fetch_remote=fetch_remote) for work in works]
 
 
-def get_preview_papers(works: List[Dict[str, Any]], limit: int = 4) -> List[Paper]:
+def get_preview_papers(
+    works: Iterable[Dict[str, Any]],
+    limit: int = 4,
+    fetch_remote: bool = True
+) -> List[Paper]:
     """
     Get a preview (first N) papers from OpenAlex works for frontend display.
 
     Args:
-        works: List of OpenAlex work JSON objects
+        works: OpenAlex work JSON objects (list or stream; only `limit` are read)
         limit: Number of papers to return (default: 4)
+        fetch_remote: Whether missing abstracts are fetched from Semantic Scholar per paper
 
     Returns:
         List of up to `limit` Paper objects
     """
-    preview_works = works[:limit]
-    return map_openalex_works_to_papers(preview_works)
+    preview_works = list(islice(works, limit))
+    return map_openalex_works_to_papers(preview_works, fetch_remote=fetch_remote)
@@ -1,11 +1,26 @@
 """
 Utility functions for mapping OpenAlex author data to Professor/GraphNode objects.
 """
-from typing import List, Dict, Any, Optional
+from typing import Iterable, Iterator, List, Dict, Any, Optional
 from app.schemas.agent import GraphNode, BasicProfessor, Contact, Paper, Institution
-from app.utils.paper_mapper import map_openalex_works_to_papers
+from app.utils.paper_mapper import map_openalex_works_to_papers, WORK_SELECT_FIELDS
 from app.utils.openalex_client import openalex_client
 
+# OpenAlex author fields read by the mappers below (requested via `select=`)
+AUTHOR_SELECT_FIELDS = [
+    "id",
+    "display_name",
+    "orcid",
+    "ids",
+    "works_count",
+    "cited_by_count",
+    "summary_stats",
+    "last_known_institutions"
+]
+
+# Works whose authors are extracted (or grouped per author) also need authorships
+WORK_WITH_AUTHORS_SELECT_FIELDS = WORK_SELECT_FIELDS + ["authorships"]
+
 
 def get_education_institution(author_data: Dict[str, Any]) -> Optional[Institution]:
     """
@@ -39,7 +54,8 @@ def get_education_institution(author_data: Dict[str, Any]) -> Optional[Instituti
 
 def map_author_to_graph_node(
     author_data: Dict[str, Any],
-    author_papers: Optional[List[Dict[str, Any]]] = None
+    author_papers: Optional[List[Dict[str, Any]]] = None,
+    fetch_remote: bool = True
 ) -> GraphNode:
     """
     Map OpenAlex author data to a GraphNode (professor).
@@ -47,6 +63,7 @@ def map_author_to_graph_node(
     Args:
         author_data: OpenAlex author JSON
         author_papers: Optional list of author's papers (first 3)
+        fetch_remote: Whether missing paper abstracts are fetched from Semantic Scholar per paper
 
     Returns:
         GraphNode representing the professor
@@ -60,7 +77,7 @@ def map_author_to_graph_node(
     # Map papers
     papers = []
     if author_papers:
-        papers = map_openalex_works_to_papers(author_papers[:3])
+        papers = map_openalex_works_to_papers(author_papers[:3], fetch_remote=fetch_remote)
 
     # Create contact (mock for now)
     contact = Contact(
@@ -114,33 +131,35 @@ def map_author_to_basic_professor(author_data: Dict[str, Any]) -> BasicProfessor
     )
 
 
-def extract_author_ids_from_papers(papers: List[Dict[str, Any]], max_authors: int, authors_per_paper: int = 2) -> List[str]:
+def iter_author_ids_from_papers(
+    papers: Iterable[Dict[str, Any]],
+    max_authors: int,
+    authors_per_paper: int = 2
+) -> Iterator[str]:
     """
-    Extract author IDs from papers' authorships.
+    Yield unique author IDs from papers' authorships as they are found.
+
+    Papers are consumed one at a time and no further paper is read once
+    `max_authors` IDs are yielded, so a lazy stream is only read as far
+    as needed.
 
     Args:
-        papers: List of OpenAlex work objects
+        papers: OpenAlex work objects (list or stream)
         max_authors: Maximum number of authors to extract
         authors_per_paper: Number of authors to extract per paper (default: 2)
 
-    Returns:
-        List of unique author IDs
+    Yields:
+        Unique author IDs, in paper order
     """
-    author_ids = []
+    if max_authors <= 0:
+        return
+
     seen_ids = set()
 
     for paper in papers:
-        # Stop if we have enough authors
-        if len(author_ids) >= max_authors:
-            break
-
         authorships = paper.get("authorships", [])
 
         for authorship in authorships[:authors_per_paper]:
-            # Stop if we have enough authors
-            if len(author_ids) >= max_authors:
-                break
-
             author = authorship.get("author", {})
             author_id_url = author.get("id")
 
@@ -148,9 +167,26 @@ def extract_author_ids_from_papers(papers: List[Dict[str, Any]], max_authors: in
                 # Extract ID from URL
                 author_id = openalex_client.extract_author_id(author_id_url)
 
-                # Add if not seen before
+                # Yield if not seen before
                 if author_id not in seen_ids:
-                    author_ids.append(author_id)
                     seen_ids.add(author_id)
+                    yield author_id
+
+                    # Stop before pulling another paper once we have enough authors
+                    if len(seen_ids) >= max_authors:
+                        return
+
 
-    return author_ids
+def extract_author_ids_from_papers(papers: Iterable[Dict[str, Any]], max_authors: int, authors_per_paper: int = 2) -> List[str]:
+    """
+    Extract author IDs from papers' authorships.
+
+    Args:
+        papers: OpenAlex work objects (list or stream)
+        max_authors: Maximum number of authors to extract
+        authors_per_paper: Number of authors to extract per paper (default: 2)
+
+    Returns:
+        List of unique author IDs
+    """
+    return list(iter_author_ids_from_papers(papers, max_authors, authors_per_paper))
@@ -0,0 +1,65 @@
+"""
+Token-bucket rate limiter for outbound API calls.
+"""
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at `rate` per second, up to `capacity`.
+    Every request consumes one token; when the bucket is empty the caller
+    waits until its token has been refilled.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Initialize the bucket (starts full).
+
+        Args:
+            rate: Sustained request rate (tokens per second)
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Reserve one token.
+
+        The token is taken immediately (the balance may go negative), so
+        concurrent callers queue up fairly behind each other.
+
+        Returns:
+            Seconds the caller must wait before using the token
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated_at
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> float:
+        """
+        Block until a token is available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
@@ -0,0 +1,284 @@
+"""
+Two-tier HTTP response cache (in-process LRU + shared SQLite file).
+
+The SQLite tier runs in WAL mode, so every uvicorn worker on the host reads
+and writes the same cache file safely.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+class ResponseCache:
+    """
+    Cache for JSON API responses keyed on the normalized URL and params.
+
+    Lookups go memory -> disk -> network. Each entity type (first path
+    segment: "concepts", "authors", "works") has its own TTL. Both tiers
+    are size-bounded and evict the least recently used entries.
+
+    Bodies are kept serialized in both tiers, so every hit returns a fresh
+    object that callers are free to mutate.
+    """
+
+    # Params that identify the caller rather than the resource
+    IGNORED_PARAMS = {"mailto", "api_key"}
+
+    def __init__(
+        self,
+        db_path: str,
+        ttls: Dict[str, int],
+        default_ttl: int = 3600,
+        memory_entries: int = 512,
+        max_disk_entries: int = 20000
+    ):
+        """
+        Initialize the cache and create the SQLite table if needed.
+
+        Args:
+            db_path: Path of the SQLite cache file
+            ttls: TTL in seconds per entity type (e.g. {"works": 21600})
+            default_ttl: TTL for entity types missing from `ttls`
+            memory_entries: Capacity of the in-process LRU tier
+            max_disk_entries: Capacity of the SQLite tier
+        """
+        self.db_path = db_path
+        self.ttls = ttls
+        self.default_ttl = default_ttl
+        self.memory_entries = memory_entries
+        self.max_disk_entries = max_disk_entries
+
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_eviction = 0
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+        self._init_db()
+
+    def _init_db(self) -> None:
+        """Create the cache table and switch the file to WAL mode."""
+        with self.get_connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS http_cache (
+                    key TEXT PRIMARY KEY,
+                    entity TEXT NOT NULL,
+                    body TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_http_cache_accessed ON http_cache (accessed_at)")
+            conn.commit()
+
+    @contextmanager
+    def get_connection(self):
+        """Context manager for cache database connections."""
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @classmethod
+    def make_key(cls, url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build a stable cache key from a URL and its query params.
+
+        Scheme and host are lowercased, trailing slashes dropped and params
+        sorted, so equivalent requests share one entry.
+
+        Args:
+            url: Request URL
+            params: Optional query parameters
+
+        Returns:
+            Hex digest identifying the request
+        """
+        parts = urlsplit(url)
+        path = parts.path.rstrip("/") or "/"
+        normalized_params = sorted(
+            (str(name), str(value))
+            for name, value in (params or {}).items()
+            if name not in cls.IGNORED_PARAMS and value is not None
+        )
+        canonical = f"{parts.scheme.lower()}://{parts.netloc.lower()}{path}?{json.dumps(normalized_params)}"
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def entity_type(url: str) -> str:
+        """
+        Get the entity type of a request from its first path segment.
+
+        Args:
+            url: Request URL (e.g. "https://api.openalex.org/works")
+
+        Returns:
+            Entity type like "works"
+        """
+        segments = [segment for segment in urlsplit(url).path.split("/") if segment]
+        return segments[0] if segments else "root"
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """
+        Look up a cached response.
+
+        Args:
+            url: Request URL
+            params: Optional query parameters
+
+        Returns:
+            Cached JSON value or None on miss/expiry
+        """
+        key = self.make_key(url, params)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, body = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return json.loads(body)
+                del self._memory[key]
+
+        try:
+            with self.get_connection() as conn:
+                row = conn.execute(
+                    "SELECT body, expires_at FROM http_cache WHERE key = ?",
+                    (key,)
+                ).fetchone()
+
+                if row and row[1] > now:
+                    conn.execute("UPDATE http_cache SET accessed_at = ? WHERE key = ?", (now, key))
+                    conn.commit()
+                    self._remember(key, row[1], row[0])
+                    with self._lock:
+                        self._counters["disk_hits"] += 1
+                    return json.loads(row[0])
+
+        except sqlite3.Error as e:
+            print(f"Response cache read failed: {e}")
+
+        with self._lock:
+            self._counters["misses"] += 1
+        return None
+
+    def set(self, url: str, params: Optional[Dict[str, Any]], value: Any) -> None:
+        """
+        Store a response in both tiers.
+
+        Args:
+            url: Request URL
+            params: Optional query parameters
+            value: JSON-serializable response body
+        """
+        key = self.make_key(url, params)
+        entity = self.entity_type(url)
+        now = time.time()
+        expires_at = now + self.ttls.get(entity, self.default_ttl)
+        body = json.dumps(value)
+
+        self._remember(key, expires_at, body)
+
+        try:
+            with self.get_connection() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO http_cache (key, entity, body, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, entity, body, expires_at, now)
+                )
+                conn.commit()
+
+        except sqlite3.Error as e:
+            print(f"Response cache write failed: {e}")
+            return
+
+        with self._lock:
+            self._counters["stores"] += 1
+            self._writes_since_eviction += 1
+            # Amortize eviction: at most one cleanup per 5% of capacity written
+            should_evict = self._writes_since_eviction >= max(1, self.max_disk_entries // 20)
+            if should_evict:
+                self._writes_since_eviction = 0
+
+        if should_evict:
+            self.evict()
+
+    def _remember(self, key: str, expires_at: float, body: str) -> None:
+        """Put an entry in the memory tier, evicting the LRU entry when full."""
+        if self.memory_entries <= 0:
+            return
+
+        with self._lock:
+            self._memory[key] = (expires_at, body)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def evict(self) -> int:
+        """
+        Drop expired entries and trim the disk tier to `max_disk_entries`.
+
+        Returns:
+            Number of disk entries removed
+        """
+        try:
+            with self.get_connection() as conn:
+                removed = conn.execute("DELETE FROM http_cache WHERE expires_at <= ?", (time.time(),)).rowcount
+                removed += conn.execute("""
+                    DELETE FROM http_cache WHERE key IN (
+                        SELECT key FROM http_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                    )
+                """, (self.max_disk_entries,)).rowcount
+                conn.commit()
+
+        except sqlite3.Error as e:
+            print(f"Response cache eviction failed: {e}")
+            return 0
+
+        with self._lock:
+            self._counters["evictions"] += removed
+        return removed
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        with self.get_connection() as conn:
+            conn.execute("DELETE FROM http_cache")
+            conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss counters for this process and current tier sizes.
+
+        Returns:
+            Dict with counters, hit rate and entry counts
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            memory_size = len(self._memory)
+
+        lookups = counters["memory_hits"] + counters["disk_hits"] + counters["misses"]
+        hits = counters["memory_hits"] + counters["disk_hits"]
+
+        try:
+            with self.get_connection() as conn:
+                disk_size = conn.execute("SELECT COUNT(*) FROM http_cache").fetchone()[0]
+        except sqlite3.Error:
+            disk_size = None
+
+        return {
+            **counters,
+            "hit_rate": round(hits / lookups, 3) if lookups else None,
+            "memory_entries": memory_size,
+            "disk_entries": disk_size
+        }
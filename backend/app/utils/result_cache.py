@@ -0,0 +1,198 @@
+"""
+Whole-run result cache keyed on the extracted filters.
+
+Different queries often resolve to the same filters; their search,
+extraction and relationships produce the same professors. The cache
+keeps those results so a run whose filters were already resolved
+recently skips straight to graph construction.
+"""
+import hashlib
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+from app.agents.models import ExtractedFilters
+from app.core.config import settings
+from app.database.paths import resolve_data_path
+
+
+class ResultCache:
+    """
+    SQLite-backed cache of run results, shared by all workers.
+
+    Entries hold what the pipeline produces between the filters and the
+    graph: the preview papers, the extracted professors (as shown in the
+    extraction step and as graph nodes) and the links between them. The
+    user node is not cached, each run adds its own.
+    """
+
+    def __init__(self, db_path: str, ttl: int, max_entries: int):
+        """
+        Initialize the cache and create its table if needed.
+
+        Args:
+            db_path: Path of the SQLite file
+            ttl: Seconds a cached result stays valid
+            max_entries: Maximum number of results kept (oldest evicted first)
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._init_db()
+
+    def _init_db(self) -> None:
+        """Create the cache table."""
+        with self.get_connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS run_results (
+                    key TEXT PRIMARY KEY,
+                    body TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_run_results_created ON run_results (created_at)"
+            )
+            conn.commit()
+
+    @contextmanager
+    def get_connection(self):
+        """Context manager for cache database connections."""
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def canonical_filters(filters: ExtractedFilters) -> Dict[str, List[str]]:
+        """
+        Normalize filters so equivalent extractions share an entry.
+
+        Values are trimmed, lowercased, deduplicated and sorted.
+        """
+        def canonical(values: List[str]) -> List[str]:
+            return sorted({value.strip().lower() for value in values if value and value.strip()})
+
+        return {
+            "topics": canonical(filters.topics),
+            "geographical_areas": canonical(filters.geographical_areas),
+            "institutions": canonical(filters.institutions)
+        }
+
+    @classmethod
+    def make_key(cls, filters: ExtractedFilters, max_nodes: int) -> str:
+        """
+        Build the cache key for a set of filters and a graph size.
+
+        Args:
+            filters: Filters extracted from the query and CV
+            max_nodes: Maximum number of nodes in graph
+
+        Returns:
+            Hex digest of the canonical filters and max_nodes
+        """
+        payload = json.dumps(
+            {**cls.canonical_filters(filters), "max_nodes": max_nodes},
+            sort_keys=True,
+            separators=(",", ":")
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, filters: ExtractedFilters, max_nodes: int) -> Optional[Dict[str, Any]]:
+        """
+        Look up the result of a previous run with the same filters.
+
+        Args:
+            filters: Filters extracted from the query and CV
+            max_nodes: Maximum number of nodes in graph
+
+        Returns:
+            Dict with preview_papers, professors, professor_nodes and links,
+            or None on a miss (or if the cache is unavailable)
+        """
+        key = self.make_key(filters, max_nodes)
+
+        try:
+            with self.get_connection() as conn:
+                row = conn.execute(
+                    "SELECT body FROM run_results WHERE key = ? AND expires_at > ?",
+                    (key, time.time())
+                ).fetchone()
+
+        except sqlite3.Error as e:
+            print(f"Result cache lookup failed: {e}")
+            return None
+
+        return json.loads(row[0]) if row else None
+
+    def set(self, filters: ExtractedFilters, max_nodes: int, result: Dict[str, Any]) -> None:
+        """
+        Store the result of a run.
+
+        Args:
+            filters: Filters extracted from the query and CV
+            max_nodes: Maximum number of nodes in graph
+            result: Dict with preview_papers, professors, professor_nodes and links
+        """
+        key = self.make_key(filters, max_nodes)
+        now = time.time()
+
+        try:
+            with self.get_connection() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO run_results (key, body, created_at, expires_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(result), now, now + self.ttl)
+                )
+                conn.commit()
+
+        except sqlite3.Error as e:
+            print(f"Result cache write failed: {e}")
+            return
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Drop expired results, then the oldest ones beyond max_entries."""
+        try:
+            with self.get_connection() as conn:
+                conn.execute("DELETE FROM run_results WHERE expires_at <= ?", (time.time(),))
+                conn.execute(
+                    "DELETE FROM run_results WHERE key IN ("
+                    "SELECT key FROM run_results ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+                conn.commit()
+
+        except sqlite3.Error as e:
+            print(f"Result cache eviction failed: {e}")
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        with self.get_connection() as conn:
+            conn.execute("DELETE FROM run_results")
+            conn.commit()
+
+
+def create_result_cache() -> Optional[ResultCache]:
+    """
+    Build the shared result cache from settings.
+
+    Returns:
+        ResultCache or None if the cache is disabled
+    """
+    if not settings.RESULT_CACHE_ENABLED:
+        return None
+
+    return ResultCache(
+        db_path=resolve_data_path(settings.RESULT_CACHE_PATH),
+        ttl=settings.RESULT_CACHE_TTL,
+        max_entries=settings.RESULT_CACHE_MAX_ENTRIES
+    )
+
+
+# Global cache instance
+result_cache = create_result_cache()
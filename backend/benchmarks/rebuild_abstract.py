@@ -0,0 +1,64 @@
+"""
+Micro-benchmark for rebuild_abstract against the works in prova.json.
+
+Checks that the fast path returns exactly what the legacy implementation
+returns (for the sample works and for irregular indexes), then times both.
+
+Usage (from the backend directory):
+    python -m benchmarks.rebuild_abstract [--repeat 200]
+"""
+import argparse
+import json
+import timeit
+from pathlib import Path
+
+from app.utils.abstract_fetcher import _rebuild_abstract_legacy, rebuild_abstract
+
+SAMPLE_PATH = Path(__file__).resolve().parent.parent / "prova.json"
+
+# Irregular indexes that must behave exactly as before
+EDGE_CASES = [
+    {"a": [0], "c": [2]},             # gap
+    {"a": [0, 1], "b": [1]},          # repeated position (last word wins)
+    {"a": [0], "b": [-1]},            # negative position
+    {"a": [0], "b": []},              # empty positions
+    {"a": [], "b": []},
+    {"a": [0.0], "b": [1]},           # float position
+    {"a": ["0"]},                     # string position
+    {"a": 3},                         # not a list
+    {1: [0], "b": [1]},               # non-string word
+    {"a": [1], "b": [0]},             # well-formed, out of order
+]
+
+
+def load_indexes() -> list:
+    """Inverted indexes of the sample works that have one."""
+    works = json.loads(SAMPLE_PATH.read_text())["results"]
+    return [work["abstract_inverted_index"] for work in works if work.get("abstract_inverted_index")]
+
+
+def check(indexes: list) -> None:
+    """Assert the fast path matches the legacy implementation."""
+    for index in indexes + EDGE_CASES:
+        expected = _rebuild_abstract_legacy(index)
+        assert rebuild_abstract(index) == expected, index
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=200, help="Passes over the sample works")
+    args = parser.parse_args()
+
+    indexes = load_indexes()
+    check(indexes)
+
+    positions = sum(len(p) for index in indexes for p in index.values())
+    print(f"{len(indexes)} abstracts, {positions} words, {args.repeat} passes")
+
+    for name, fn in (("legacy", _rebuild_abstract_legacy), ("fast", rebuild_abstract)):
+        seconds = min(timeit.repeat(lambda: [fn(index) for index in indexes], number=args.repeat, repeat=5))
+        print(f"{name:>7}: {seconds / (args.repeat * len(indexes)) * 1e6:.2f} us/abstract")
+
+
+if __name__ == "__main__":
+    main()
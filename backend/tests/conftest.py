@@ -0,0 +1,209 @@
+"""
+Shared fixtures: isolated storage, a stubbed HTTP layer and an API client.
+
+No test talks to OpenAlex, Semantic Scholar or the LLM: outbound requests
+go through FakeHTTP and intent extraction returns fixed filters.
+"""
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+# Settings are read at import time: keep every persistent store off and the
+# rate limit out of the way before the app is imported
+os.environ.update({
+    "OPENALEX_CACHE_ENABLED": "false",
+    "ABSTRACT_STORE_ENABLED": "false",
+    "RESULT_CACHE_ENABLED": "false",
+    "STATE_BACKEND": "memory",
+    "OPENALEX_RATE_LIMIT": "1000",
+    "OPENALEX_RATE_BURST": "1000",
+    "PIPELINE_PACING": "fast",
+})
+
+# SQLite files are created when the app is imported: keep them out of the
+# backend directory (database.py imports resolve_data_path after this)
+from app.database import paths
+
+_data_dir = tempfile.mkdtemp(prefix="netresearch-tests-")
+paths.resolve_data_path = lambda filename: os.path.join(_data_dir, filename)
+
+import pytest
+import requests
+from fastapi import Request
+from fastapi.testclient import TestClient
+
+from app.agents.intent_agent import IntentExtractionAgent
+from app.agents.models import ExtractedFilters
+from app.auth.dependencies import get_current_user_id
+from app.database.database import db
+from app.main import app
+from app.routers import agent as agent_router
+from app.services.run_coalescer import run_coalescer
+from app.services.run_scheduler import RunScheduler
+from app.utils import http_resilience
+
+
+def wait_for(predicate, timeout: float = 5.0, interval: float = 0.01):
+    """Wait until `predicate()` is truthy; fail the test after `timeout` seconds."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        value = predicate()
+        if value:
+            return value
+        time.sleep(interval)
+    pytest.fail("Condition not met in time")
+
+
+def _response(url: str, body) -> requests.Response:
+    """Build a response that supports both .json() and streaming."""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.headers["Content-Type"] = "application/json"
+    response.raw = io.BytesIO(json.dumps(body).encode())
+    return response
+
+
+def _author(author_id: str) -> dict:
+    return {
+        "id": f"https://openalex.org/{author_id}",
+        "display_name": f"Prof {author_id}",
+        "works_count": 5,
+        "summary_stats": {"h_index": 3},
+        "last_known_institutions": [
+            {"id": f"https://openalex.org/I{int(author_id[1:]) % 3}", "display_name": "Uni", "type": "education"}
+        ]
+    }
+
+
+class FakeHTTP:
+    """
+    Stand-in for requests.Session.request serving OpenAlex and Semantic Scholar.
+
+    Works searches wait for `search_gate`, so a test can hold runs in
+    their search stage (open by default).
+    """
+
+    def __init__(self):
+        self.search_gate = threading.Event()
+        self.search_gate.set()
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def request(self, method, url, params=None, **kwargs):
+        params = dict(params or {})
+        with self._lock:
+            self.calls.append((method, url, params))
+
+        if "semanticscholar" in url:
+            return _response(url, [{"abstract": "Resolved abstract"} for _ in kwargs["json"]["ids"]])
+
+        if url.endswith("/concepts"):
+            return _response(url, {"meta": {"count": 1}, "results": [{"id": "https://openalex.org/C1"}]})
+
+        if url.endswith("/authors"):
+            ids = params["filter"].split(":", 1)[1].split("|")
+            return _response(url, {"meta": {}, "results": [_author(author_id) for author_id in ids]})
+
+        if url.endswith("/works") and "author.id" in params["filter"]:
+            ids = params["filter"].split(",")[0].split(":", 1)[1].split("|")
+            return _response(url, {"meta": {"count": len(ids)}, "results": [
+                {
+                    "id": f"https://openalex.org/W9{author_id[1:]}",
+                    "title": f"Paper of {author_id}",
+                    "doi": f"https://doi.org/10.1/{author_id}",
+                    "authorships": [{"author": {"id": f"https://openalex.org/{author_id}"}}]
+                }
+                for author_id in ids
+            ]})
+
+        if url.endswith("/works"):
+            self.search_gate.wait(timeout=10)
+            start = 0 if params.get("cursor") in (None, "*") else int(params["cursor"])
+            per_page = int(params["per-page"])
+            return _response(url, {
+                "meta": {"count": 1000, "next_cursor": str(start + per_page)},
+                "results": [
+                    {
+                        "id": f"https://openalex.org/W{k}",
+                        "title": f"Paper {k}",
+                        "doi": f"https://doi.org/10.2/{k}",
+                        "abstract_inverted_index": {"hello": [0], "world": [1]} if k % 2 else None,
+                        "authorships": [
+                            {"author": {"id": f"https://openalex.org/A{k * 2}"}},
+                            {"author": {"id": f"https://openalex.org/A{k * 2 + 1}"}}
+                        ]
+                    }
+                    for k in range(start, start + per_page)
+                ]
+            })
+
+        raise AssertionError(f"Unexpected request: {method} {url}")
+
+
+@pytest.fixture(autouse=True)
+def isolated_storage(tmp_path, monkeypatch):
+    """Point the application database at a temporary file and reset shared HTTP state."""
+    monkeypatch.setattr(db, "db_path", str(tmp_path / "netresearch.db"))
+    db._init_db()
+    http_resilience._host_guards.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def fake_http(monkeypatch):
+    """Serve every outbound request from FakeHTTP and skip the LLM."""
+    fake = FakeHTTP()
+    monkeypatch.setattr(requests.Session, "request", fake.request)
+    monkeypatch.setattr(IntentExtractionAgent, "__init__", lambda self: None)
+    monkeypatch.setattr(
+        IntentExtractionAgent,
+        "extract_with_context",
+        lambda self, context: ExtractedFilters(topics=["Machine Learning"], geographical_areas=[], institutions=[])
+    )
+    yield fake
+    # Let runs held at the search stage finish
+    fake.search_gate.set()
+
+
+@pytest.fixture
+def scheduler(monkeypatch, fake_http):
+    """A small run scheduler (1 worker, 1 queue slot) used by the API."""
+    run_scheduler = RunScheduler(max_workers=1, max_queue=1, max_running_per_user=1, max_queued_per_user=1)
+    monkeypatch.setattr(agent_router, "run_scheduler", run_scheduler)
+    yield run_scheduler
+
+    # Drain before the next test swaps the database
+    fake_http.search_gate.set()
+    wait_for(lambda: run_scheduler.stats()["running"] == 0 and run_scheduler.stats()["queue_depth"] == 0, timeout=15)
+    with run_coalescer._lock:
+        run_coalescer._flights.clear()
+        run_coalescer._by_leader.clear()
+
+
+@pytest.fixture
+def users():
+    """Three users with names (IDs keyed by name)."""
+    created = {}
+    for name in ("Alice", "Bob", "Carol"):
+        user_id = db.create_user(f"{name.lower()}-{uuid.uuid4()}@example.com", "hashed")
+        db.create_user_details(user_id, name=name)
+        created[name] = user_id
+    return created
+
+
+@pytest.fixture
+def client():
+    """API client authenticated as the user in the X-User header."""
+    def user_from_header(request: Request) -> int:
+        return int(request.headers["X-User"])
+
+    app.dependency_overrides[get_current_user_id] = user_from_header
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_current_user_id, None)
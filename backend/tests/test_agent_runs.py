@@ -0,0 +1,183 @@
+"""
+Agent run API: admission control, cancellation, coalescing and since polling.
+"""
+from app.services.run_coalescer import run_coalescer
+from app.services.simulation_service import release_cancel_token
+from app.services.state_manager import state_manager
+from app.database.database import db
+from tests.conftest import wait_for
+
+
+def start_run(client, user_id, query="graph neural networks", max_nodes=4):
+    return client.post(
+        "/api/agent/run",
+        json={"query": query, "max_nodes": max_nodes, "pacing": "fast"},
+        headers={"X-User": str(user_id)}
+    )
+
+
+def cancel(client, user_id, run_id):
+    return client.delete(f"/api/agent/run/{run_id}", headers={"X-User": str(user_id)})
+
+
+def status_of(run_id):
+    run = state_manager.get_run(run_id)
+    return run["status"] if run else None
+
+
+def hold_running_run(client, fake_http, user_id, query="graph neural networks"):
+    """Start a run and wait until it is executing, held at its search stage."""
+    fake_http.search_gate.clear()
+    run_id = start_run(client, user_id, query=query).json()["run_id"]
+    wait_for(lambda: status_of(run_id) == "running")
+    return run_id
+
+
+def test_full_queue_answers_429(client, scheduler, fake_http, users):
+    hold_running_run(client, fake_http, users["Alice"], query="first")
+
+    queued = start_run(client, users["Bob"], query="second")
+    assert queued.status_code == 200
+    assert queued.json()["status"] == "queued"
+    assert queued.json()["queue_position"] == 1
+
+    rejected = start_run(client, users["Carol"], query="third")
+    assert rejected.status_code == 429
+    assert rejected.headers["Retry-After"]
+    assert rejected.json()["detail"]["queue_depth"] == 1
+    assert scheduler.stats()["rejected"] == 1
+
+
+def test_cancel_queued_run(client, scheduler, fake_http, users):
+    running_id = hold_running_run(client, fake_http, users["Alice"], query="first")
+    queued_id = start_run(client, users["Bob"], query="second").json()["run_id"]
+
+    response = cancel(client, users["Bob"], queued_id)
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "cancelled"
+    assert scheduler.position(queued_id) is None
+    assert db.get_run(queued_id)["status"] == "cancelled"
+
+    # The cancelled run never executes, the other one completes
+    fake_http.search_gate.set()
+    wait_for(lambda: status_of(running_id) == "completed" or db.get_run(running_id)["status"] == "completed")
+    assert db.get_run(queued_id)["status"] == "cancelled"
+    assert not db.get_run(queued_id)["graph_data"]
+
+
+def test_cancel_running_run(client, scheduler, fake_http, users):
+    run_id = hold_running_run(client, fake_http, users["Alice"])
+
+    response = cancel(client, users["Alice"], run_id)
+    assert response.status_code == 200
+    assert response.json()["status"] == "cancelling"
+
+    # It stops at its next cancellation point, once the search returns
+    fake_http.search_gate.set()
+    wait_for(lambda: db.get_run(run_id)["status"] == "cancelled")
+
+    status = client.get(f"/api/agent/status/{run_id}").json()
+    assert status["status"] == "cancelled"
+    assert cancel(client, users["Alice"], run_id).status_code == 409
+
+
+def test_cancel_checks_owner(client, scheduler, fake_http, users):
+    run_id = hold_running_run(client, fake_http, users["Alice"])
+
+    assert cancel(client, users["Bob"], run_id).status_code == 404
+    assert status_of(run_id) == "running"
+
+
+def test_uncancellable_leader_keeps_its_followers(client, scheduler, fake_http, users):
+    leader_id = hold_running_run(client, fake_http, users["Alice"])
+    # As if the run executed in another worker process
+    release_cancel_token(leader_id)
+
+    assert cancel(client, users["Alice"], leader_id).status_code == 409
+
+    # Still the leader: an identical run follows it instead of executing again
+    follower = start_run(client, users["Bob"]).json()
+    assert run_coalescer.leader_of(follower["run_id"]) == leader_id
+
+
+def test_follower_mirrors_leader(client, scheduler, fake_http, users):
+    leader_id = hold_running_run(client, fake_http, users["Alice"])
+
+    follower = start_run(client, users["Bob"], query="  Graph Neural NETWORKS ").json()
+    follower_id = follower["run_id"]
+    assert follower["status"] == "running"
+    assert run_coalescer.leader_of(follower_id) == leader_id
+
+    # Catches up with the steps the leader already has
+    leader_steps = [step["step_id"] for step in state_manager.get_run(leader_id)["steps"]]
+    assert [step["step_id"] for step in state_manager.get_run(follower_id)["steps"]] == leader_steps
+
+    fake_http.search_gate.set()
+    wait_for(lambda: db.get_run(follower_id)["status"] == "completed")
+
+    # Same graph, with the follower's own user node
+    follower_graph = db.get_run(follower_id)["graph_data"]
+    leader_graph = db.get_run(leader_id)["graph_data"]
+    assert [n["name"] for n in follower_graph["nodes"] if n["type"] == "user"] == ["Bob"]
+    assert [n["name"] for n in leader_graph["nodes"] if n["type"] == "user"] == ["Alice"]
+    assert len(follower_graph["nodes"]) == len(leader_graph["nodes"])
+    # Only the leader searched
+    assert sum(1 for _, url, params in fake_http.calls if url.endswith("/works") and "cursor" in params) == 1
+
+
+def test_follower_detaches_on_cancel(client, scheduler, fake_http, users):
+    leader_id = hold_running_run(client, fake_http, users["Alice"])
+    follower_id = start_run(client, users["Bob"]).json()["run_id"]
+
+    response = cancel(client, users["Bob"], follower_id)
+    assert response.status_code == 200
+    assert response.json()["status"] == "cancelled"
+    assert run_coalescer.leader_of(follower_id) is None
+
+    # The leader goes on; the follower no longer mirrors it
+    fake_http.search_gate.set()
+    wait_for(lambda: db.get_run(leader_id)["status"] == "completed")
+    assert db.get_run(leader_id)["graph_data"]
+    assert status_of(follower_id) == "cancelled"
+    assert not db.get_run(follower_id)["graph_data"]
+
+
+def test_followed_leader_cannot_be_cancelled(client, scheduler, fake_http, users):
+    leader_id = hold_running_run(client, fake_http, users["Alice"])
+    start_run(client, users["Bob"])
+
+    assert cancel(client, users["Alice"], leader_id).status_code == 409
+    assert status_of(leader_id) == "running"
+
+
+def test_since_returns_only_newer_steps(client):
+    run_id = "since-run"
+    state_manager.create_run(run_id=run_id, query="q", max_nodes=3, pacing="fast")
+    state_manager.add_run_step(run_id, "filters-1", "filters", "Filters", status="done")
+    state_manager.add_run_step(run_id, "search-1", "search", "Searching", status="in_progress")
+
+    first = client.get(f"/api/agent/status/{run_id}").json()
+    assert [step["step_id"] for step in first["steps"]] == ["filters-1", "search-1"]
+    cursor = first["revision"]
+
+    state_manager.add_run_step(run_id, "search-1", "search", "Searching", status="done")
+    state_manager.add_run_step(run_id, "extraction-1", "extraction", "Extracting", status="in_progress")
+
+    delta = client.get(f"/api/agent/status/{run_id}", params={"since": cursor}).json()
+    assert [(step["step_id"], step["status"]) for step in delta["steps"]] == [
+        ("search-1", "done"),
+        ("extraction-1", "in_progress")
+    ]
+    assert delta["graph_data"] is None
+    assert delta["revision"] > cursor
+
+    # Nothing changed since the last poll
+    unchanged = client.get(f"/api/agent/status/{run_id}", params={"since": delta["revision"]}).json()
+    assert unchanged["steps"] == []
+
+    # The graph is only sent again once it changed
+    state_manager.set_run_graph(run_id, {"nodes": [], "links": []})
+    with_graph = client.get(f"/api/agent/status/{run_id}", params={"since": delta["revision"]}).json()
+    assert with_graph["steps"] == []
+    assert with_graph["graph_data"] == {"nodes": [], "links": []}
@@ -0,0 +1,95 @@
+"""
+Cancellation tokens, stage deadlines and deadline-bounded request timeouts.
+"""
+import time
+
+import pytest
+
+from app.utils.cancellation import (
+    CancellationToken,
+    RunCancelled,
+    cancellable,
+    cancellation_scope,
+    check_cancelled,
+    remaining_time,
+    stage_deadline
+)
+from app.utils.http_resilience import _bounded_timeout
+
+
+def test_cancel_keeps_the_first_reason():
+    token = CancellationToken()
+    token.cancel("Cancelled by user")
+    token.cancel("Something else")
+
+    with pytest.raises(RunCancelled, match="Cancelled by user"):
+        token.check()
+
+
+def test_deadline_cancels_the_run():
+    token = CancellationToken()
+    token.start_deadline(0.05)
+    assert not token.cancelled
+
+    time.sleep(0.06)
+
+    assert token.cancelled
+    assert "time budget" in token.reason
+
+
+def test_check_cancelled_uses_the_current_token():
+    token = CancellationToken()
+    check_cancelled()  # No run in this context
+
+    with cancellation_scope(token):
+        check_cancelled()
+        token.cancel()
+        with pytest.raises(RunCancelled):
+            check_cancelled()
+
+    check_cancelled()
+
+
+def test_stage_deadline():
+    with stage_deadline("search", 0.05):
+        check_cancelled()
+        time.sleep(0.06)
+        with pytest.raises(RunCancelled, match="Stage 'search'"):
+            check_cancelled()
+
+    check_cancelled()
+
+
+def test_remaining_time_is_the_nearest_deadline():
+    assert remaining_time() is None
+
+    token = CancellationToken()
+    token.start_deadline(10)
+    with cancellation_scope(token):
+        assert 9 < remaining_time() <= 10
+        with stage_deadline("graph", 2):
+            assert 1 < remaining_time() <= 2
+
+
+def test_request_timeout_is_bounded_by_the_deadline():
+    assert _bounded_timeout({"timeout": 30}) == {"timeout": 30}
+
+    with stage_deadline("search", 5):
+        assert 4 < _bounded_timeout({"timeout": 30})["timeout"] <= 5
+        assert _bounded_timeout({"timeout": 2})["timeout"] == 2
+        connect, read = _bounded_timeout({"timeout": (3, 30)})["timeout"]
+        assert connect == 3 and 4 < read <= 5
+
+
+def test_cancellable_stops_between_items():
+    token = CancellationToken()
+    seen = []
+
+    with cancellation_scope(token):
+        with pytest.raises(RunCancelled):
+            for item in cancellable(range(10)):
+                seen.append(item)
+                if item == 2:
+                    token.cancel()
+
+    assert seen == [0, 1, 2]
@@ -0,0 +1,109 @@
+"""
+ExtractionAgent batching: order, early yield, waiting and latency metrics.
+"""
+import time
+
+from app.agents.extraction_agent import ExtractionAgent
+from app.agents.models import AgentContext
+
+
+def paper(*author_numbers):
+    return {"authorships": [{"author": {"id": f"https://openalex.org/A{n}"}} for n in author_numbers]}
+
+
+class StubClient:
+    """OpenAlex client stub with configurable bulk call durations."""
+
+    AUTHORS_PER_WORKS_QUERY = 25
+
+    def __init__(self, works_seconds=0.0, fallback_seconds=None):
+        self.works_seconds = works_seconds
+        self.fallback_seconds = fallback_seconds or {}
+
+    def get_authors_bulk(self, author_ids, select=None):
+        return {author_id: {"id": f"https://openalex.org/{author_id}", "display_name": author_id} for author_id in author_ids}
+
+    def get_authors_works_bulk(self, author_ids, per_author=3, select=None, latencies=None):
+        time.sleep(self.works_seconds)
+        for author_id in author_ids:
+            if author_id in self.fallback_seconds and latencies is not None:
+                latencies[author_id] = self.fallback_seconds[author_id]
+        return {author_id: [] for author_id in author_ids}
+
+
+class SlowStream:
+    """Works stream whose next page takes `delay` seconds to arrive."""
+
+    def __init__(self, papers, delay):
+        self.closed = False
+        self._papers = self._generate(papers, delay)
+
+    @staticmethod
+    def _generate(papers, delay):
+        time.sleep(delay)
+        yield from papers
+
+    def __iter__(self):
+        return self._papers
+
+    def close(self):
+        self.closed = True
+        self._papers.close()
+
+
+def make_agent(client):
+    agent = ExtractionAgent()
+    agent.client = client
+    return agent
+
+
+def make_context(papers_data, papers_stream=None, max_nodes=8):
+    return AgentContext(
+        run_id="run",
+        query="q",
+        papers_data=papers_data,
+        papers_stream=papers_stream,
+        max_nodes=max_nodes
+    )
+
+
+def test_professors_keep_paper_order():
+    context = make_context([paper(n, n + 100) for n in range(1, 9)], max_nodes=12)
+
+    nodes, basic = make_agent(StubClient()).extract_professors(context)
+
+    expected = [f"A{n}" for pair in ((n, n + 100) for n in range(1, 7)) for n in pair]
+    assert [node.id for node in nodes] == expected
+    assert len(basic) == len(nodes)
+
+
+def test_first_batch_is_not_held_by_the_next_page():
+    stream = SlowStream([paper(n) for n in range(3, 9)], delay=0.5)
+    context = make_context([paper(1), paper(2)], papers_stream=stream)
+
+    started = time.perf_counter()
+    arrivals = [(node.id, time.perf_counter() - started) for node, _ in make_agent(StubClient()).iter_professors(context)]
+
+    assert [author_id for author_id, _ in arrivals] == [f"A{n}" for n in range(1, 9)]
+    assert arrivals[0][1] < 0.3
+    assert stream.closed
+
+
+def test_waiting_on_a_batch_does_not_spin():
+    context = make_context([paper(1), paper(2)], max_nodes=2)
+
+    cpu_started = time.process_time()
+    nodes, _ = make_agent(StubClient(works_seconds=0.5)).extract_professors(context)
+
+    assert len(nodes) == 2
+    assert time.process_time() - cpu_started < 0.25
+
+
+def test_latencies_are_per_batch_and_per_fallback_author():
+    context = make_context([paper(n) for n in range(1, 7)], max_nodes=6)
+
+    make_agent(StubClient(fallback_seconds={"A4": 0.25})).extract_professors(context)
+
+    assert [batch["author_ids"] for batch in context.batch_latencies] == [["A1", "A2"], ["A3", "A4", "A5", "A6"]]
+    assert all(batch["seconds"] >= 0 for batch in context.batch_latencies)
+    assert context.author_latencies == {"A4": 0.25}
@@ -0,0 +1,60 @@
+"""
+Incremental parsing of streamed JSON arrays.
+"""
+import json
+
+import pytest
+
+from app.utils.json_stream import iter_json_array
+
+
+def chunked(body: bytes, size: int):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+def test_yields_elements_and_fills_envelope():
+    body = {"meta": {"count": 2, "next_cursor": "abc"}, "results": [{"id": 1}, {"id": 2, "title": "Été"}], "group_by": []}
+    envelope = {}
+
+    items = list(iter_json_array(chunked(json.dumps(body, ensure_ascii=False).encode(), 1), envelope=envelope))
+
+    assert items == body["results"]
+    assert envelope == {"meta": body["meta"], "group_by": []}
+
+
+def test_meta_is_known_before_the_first_element():
+    body = json.dumps({"meta": {"count": 3}, "results": [1, 2, 3]}).encode()
+    envelope = {}
+
+    first = next(iter_json_array(chunked(body, 4), envelope=envelope))
+
+    assert first == 1
+    assert envelope["meta"] == {"count": 3}
+
+
+def test_stops_reading_when_the_consumer_stops():
+    body = json.dumps({"results": [{"id": n, "text": "x" * 100} for n in range(1000)]}).encode()
+    read = []
+
+    def chunks():
+        for chunk in chunked(body, 256):
+            read.append(chunk)
+            yield chunk
+
+    elements = iter_json_array(chunks())
+    assert [next(elements)["id"] for _ in range(3)] == [0, 1, 2]
+    elements.close()
+
+    assert sum(len(chunk) for chunk in read) < len(body) // 100
+
+
+def test_empty_array_and_object():
+    assert list(iter_json_array([b'{"results": []}'])) == []
+    assert list(iter_json_array([b"{}"])) == []
+
+
+@pytest.mark.parametrize("body", [b'{"results": [1, 2', b'[1, 2]', b'{"results": [1 2]}'])
+def test_invalid_json_raises(body):
+    with pytest.raises(ValueError):
+        list(iter_json_array([body]))
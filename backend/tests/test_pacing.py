@@ -0,0 +1,89 @@
+"""
+Presentation pacing and the since cursor of the run view.
+"""
+from datetime import datetime, timedelta
+
+from app.services.pacing import shape_run_view
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def at(ms: int) -> str:
+    return (T0 + timedelta(milliseconds=ms)).isoformat()
+
+
+def step(step_type, revision, started_ms, finished_ms=None):
+    return {
+        "step_id": step_type,
+        "step_type": step_type,
+        "message": step_type,
+        "status": "done" if finished_ms is not None else "in_progress",
+        "timestamp": at(finished_ms if finished_ms is not None else started_ms),
+        "started_at": at(started_ms),
+        "finished_at": at(finished_ms) if finished_ms is not None else None,
+        "revision": revision
+    }
+
+
+def completed_run(pacing="presentation"):
+    """A run whose pipeline finished in 300 ms."""
+    return {
+        "status": "completed",
+        "pacing": pacing,
+        "steps": [step("filters", 2, 0, 100), step("search", 4, 100, 200), step("graph", 6, 200, 300)],
+        "graph_data": {"nodes": [], "edges": []},
+        "revision": 7,
+        "graph_revision": 7
+    }
+
+
+def test_fast_mode_returns_the_recorded_state():
+    view = shape_run_view(completed_run(pacing="fast"), now=T0)
+
+    assert view["status"] == "completed"
+    assert len(view["steps"]) == 3
+    assert view["graph_data"] is not None
+    assert view["revision"] == 7
+
+
+def test_presentation_holds_back_later_steps_and_the_graph():
+    # filters is visible until 1000 ms, search until 2500 ms
+    view = shape_run_view(completed_run(), now=T0 + timedelta(milliseconds=1200))
+
+    assert [(s["step_type"], s["status"]) for s in view["steps"]] == [("filters", "done"), ("search", "in_progress")]
+    assert view["steps"][1]["started_at"] == at(1000)
+    assert view["status"] == "running"
+    assert view["graph_data"] is None
+    # Polling from here must return search (held as in progress) again
+    assert view["revision"] == 3
+
+
+def test_presentation_shows_everything_once_visible():
+    view = shape_run_view(completed_run(), now=T0 + timedelta(milliseconds=3600))
+
+    assert [s["status"] for s in view["steps"]] == ["done", "done", "done"]
+    assert view["status"] == "completed"
+    assert view["graph_data"] is not None
+    assert view["revision"] == 7
+
+
+def test_since_returns_only_newer_steps():
+    run = completed_run(pacing="fast")
+
+    view = shape_run_view(run, since=4)
+    assert [s["step_type"] for s in view["steps"]] == ["graph"]
+    assert view["graph_data"] is not None
+
+    view = shape_run_view(run, since=7)
+    assert view["steps"] == []
+    assert view["graph_data"] is None
+
+
+def test_since_with_presentation_returns_held_items_later():
+    run = completed_run()
+
+    first = shape_run_view(run, now=T0 + timedelta(milliseconds=1200))
+    later = shape_run_view(run, now=T0 + timedelta(milliseconds=3600), since=first["revision"])
+
+    assert [(s["step_type"], s["status"]) for s in later["steps"]] == [("search", "done"), ("graph", "done")]
+    assert later["graph_data"] is not None
@@ -0,0 +1,89 @@
+"""
+RunScheduler admission control, per-user caps and cancellation.
+"""
+import threading
+
+import pytest
+
+from app.services.run_scheduler import RunQueueFull, RunScheduler
+from tests.conftest import wait_for
+
+
+class Blocker:
+    """Run function that records its start and waits to be released."""
+
+    def __init__(self):
+        self.started = []
+        self.release = threading.Event()
+
+    def __call__(self, run_id, queue_wait_seconds):
+        self.started.append(run_id)
+        self.release.wait(timeout=10)
+
+
+@pytest.fixture
+def blocker():
+    blocker = Blocker()
+    yield blocker
+    blocker.release.set()
+
+
+def submit(scheduler, blocker, run_id, user_id):
+    position = scheduler.reserve(run_id, user_id)
+    scheduler.start(run_id, blocker, run_id=run_id)
+    return position
+
+
+def test_reserve_rejects_beyond_the_queue_capacity():
+    scheduler = RunScheduler(max_workers=1, max_queue=2, max_running_per_user=1, max_queued_per_user=5)
+
+    assert scheduler.reserve("a", 1) == 1
+    assert scheduler.reserve("b", 2) == 2
+    with pytest.raises(RunQueueFull) as error:
+        scheduler.reserve("c", 3)
+
+    assert error.value.queue_depth == 2
+    assert scheduler.stats()["rejected"] == 1
+
+
+def test_reserve_rejects_beyond_the_user_share():
+    scheduler = RunScheduler(max_workers=1, max_queue=10, max_running_per_user=1, max_queued_per_user=2)
+
+    scheduler.reserve("a", 1)
+    scheduler.reserve("b", 1)
+    with pytest.raises(RunQueueFull):
+        scheduler.reserve("c", 1)
+    assert scheduler.reserve("d", 2) == 3
+
+
+def test_user_running_cap_lets_other_users_go_first(blocker):
+    scheduler = RunScheduler(max_workers=2, max_queue=10, max_running_per_user=1, max_queued_per_user=5)
+
+    submit(scheduler, blocker, "alice-1", 1)
+    submit(scheduler, blocker, "alice-2", 1)
+    submit(scheduler, blocker, "bob-1", 2)
+
+    wait_for(lambda: len(blocker.started) == 2)
+    assert blocker.started == ["alice-1", "bob-1"]
+    assert scheduler.position("alice-2") == 1
+
+    blocker.release.set()
+    wait_for(lambda: scheduler.stats()["completed"] == 3)
+    assert blocker.started[-1] == "alice-2"
+
+
+def test_cancel_removes_a_waiting_run(blocker):
+    scheduler = RunScheduler(max_workers=1, max_queue=10, max_running_per_user=5, max_queued_per_user=5)
+
+    submit(scheduler, blocker, "running", 1)
+    wait_for(lambda: blocker.started == ["running"])
+    submit(scheduler, blocker, "waiting", 1)
+
+    assert scheduler.cancel("waiting")
+    assert scheduler.position("waiting") is None
+    # Running runs are not in the queue
+    assert not scheduler.cancel("running")
+
+    blocker.release.set()
+    wait_for(lambda: scheduler.stats()["running"] == 0)
+    assert blocker.started == ["running"]
@@ -0,0 +1,70 @@
+"""
+Run state on both backends: revisions, step times and snapshots.
+"""
+import pytest
+
+from app.services.state_backends import MemoryStateBackend, SQLiteStateBackend
+from app.services.state_manager import StateManager
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def state(request, tmp_path):
+    if request.param == "memory":
+        backend = MemoryStateBackend(max_runs=10, run_ttl=3600, max_cvs=10, cv_ttl=3600)
+    else:
+        backend = SQLiteStateBackend(str(tmp_path / "state.db"), max_runs=10, run_ttl=3600, max_cvs=10, cv_ttl=3600)
+    return StateManager(backend)
+
+
+def test_every_change_increments_the_revision(state):
+    state.create_run("run", "query")
+    state.add_run_step("run", "filters", "filters", "Extracting", status="in_progress")
+    state.add_run_step("run", "search", "search", "Searching", status="in_progress")
+    state.add_run_step("run", "filters", "filters", "Extracted")
+    state.set_run_graph("run", {"nodes": [], "edges": []})
+
+    run = state.get_run("run")
+
+    assert run["revision"] == 4
+    assert [(step["step_id"], step["revision"]) for step in run["steps"]] == [("filters", 3), ("search", 2)]
+    assert run["graph_revision"] == 4
+
+
+def test_step_keeps_its_first_start_and_finish(state):
+    state.create_run("run", "query")
+    state.add_run_step("run", "search", "search", "Searching", status="in_progress")
+    started_at = state.get_run("run")["steps"][0]["started_at"]
+
+    state.add_run_step("run", "search", "search", "Found papers")
+    finished_at = state.get_run("run")["steps"][0]["finished_at"]
+    state.add_run_step("run", "search", "search", "Found papers again")
+
+    step = state.get_run("run")["steps"][0]
+    assert step["started_at"] == started_at
+    assert step["finished_at"] == finished_at
+
+
+def test_snapshots_do_not_change_with_the_run(state):
+    state.create_run("run", "query")
+    state.add_run_step("run", "filters", "filters", "Extracting", status="in_progress")
+    snapshot = state.get_run("run")
+    listed = state.list_runs()["run"]
+
+    state.add_run_step("run", "search", "search", "Searching", status="in_progress")
+    state.update_run_status("run", "completed")
+
+    assert snapshot["status"] == "running" and len(snapshot["steps"]) == 1
+    assert listed["status"] == "running" and len(listed["steps"]) == 1
+
+
+def test_changes_are_announced_to_listeners(state):
+    events = []
+    state.add_run_listener(lambda run_id, event, data: events.append((run_id, event)))
+
+    state.create_run("run", "query")
+    state.add_run_step("run", "filters", "filters", "Extracting", status="in_progress")
+    state.update_run_status("run", "completed")
+    # Unknown runs are not announced
+    state.update_run_status("other", "completed")
+
+    assert events == [("run", "step"), ("run", "status")]
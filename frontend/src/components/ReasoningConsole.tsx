@@ -46,6 +46,10 @@ export const ReasoningConsole = ({ runId, onComplete, maxNodes }: ReasoningConso
                     setExpandedSteps(new Set());
                 }
 
+                if (response.status === "cancelled" || response.status === "failed") {
+                    if (pollingInterval.current) clearInterval(pollingInterval.current);
+                }
+
                 if (response.status === "completed" && response.graph_data) {
                     if (pollingInterval.current) clearInterval(pollingInterval.current);
                     // Small delay to let the user see the final step
@@ -80,7 +80,7 @@ export interface StepLog {
 
 export interface AgentStatusResponse {
     run_id: string;
-    status: "running" | "completed" | "failed";
+    status: "queued" | "running" | "completed" | "cancelled" | "failed";
     progress: number; // 0-100
     steps: StepLog[];
     graph_data?: GraphData; // Optional, present when completed